@@ -1,8 +1,13 @@
 # backend/api/admin.py 
 
+from functools import lru_cache
 from django.contrib import admin
-from django.utils.html import mark_safe
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.html import format_html
+from .ingest import ACTIVE_STATUSES, INGEST_KINDS, enqueue_ingest
 from .models import (
+    IngestJob,
     Project,
     Presentation,
     PosteCible,
@@ -13,27 +18,129 @@ from .models import (
 )
 
 
+@lru_cache(maxsize=1024)
+def _logo_url(name):
+    """
+    URL publique d'un logo, résolue une fois par fichier et par processus plutôt qu'à chaque ligne
+    de chaque affichage de la liste (un nom de fichier envoyé n'est jamais réutilisé pour un autre contenu).
+    """
+    return CompetenceTechnologique._meta.get_field('logo').storage.url(name)
+
+
+# Lignes par page des listes : un nombre fixe de requêtes et d'objets par page, quelle que soit la table.
+LIST_PER_PAGE = 50
+# Lignes affichées par les tableaux de la page d'un projet ; les autres sont dans la liste filtrée sur le projet.
+INLINE_MAX_ROWS = 20
+
+
+class LatestRowsInlineFormSet(BaseInlineFormSet):
+    """Formset limité aux `INLINE_MAX_ROWS` objets les plus récents : la page d'un projet reste de taille bornée."""
+
+    def get_queryset(self):
+        if not hasattr(self, '_latest_rows'):
+            self._latest_rows = super().get_queryset().order_by('-pk')[:INLINE_MAX_ROWS]
+        return self._latest_rows
+
+
 class WorkDoneInline(admin.TabularInline):
-    """Permet d'éditer les objets 'WorkDone' directement depuis la page d'un 'Project'."""
+    """Permet d'éditer les objets 'WorkDone' les plus récents directement depuis la page d'un 'Project'."""
     model = WorkDone
+    formset = LatestRowsInlineFormSet
     extra = 1
 
 
+class IngestJobInline(admin.TabularInline):
+    """Affiche l'état de l'ingestion de l'archive de code source sur la page d'un 'Project'."""
+    model = IngestJob
+    formset = LatestRowsInlineFormSet
+    extra = 0
+    max_num = 0
+    can_delete = False
+    fields = readonly_fields = ('kind', 'status', 'attempts', 'created_at', 'started_at', 'finished_at', 'error')
+    ordering = ('-id',)
+
+
 class ProjectAdmin(admin.ModelAdmin):
     """Personnalise l'interface d'administration pour le modèle Project."""
-    inlines = [WorkDoneInline]
-    filter_horizontal = ('technologies',)
+    inlines = [WorkDoneInline, IngestJobInline]
+    # Les technologies sont cherchées à la saisie : la page ne charge jamais la liste complète.
+    autocomplete_fields = ('technologies',)
+    list_display = ('title', 'updated_at')
+    # Recherche par préfixe (`^`, soit `istartswith`) : index adapté créé par la migration 0016.
+    search_fields = ('^title',)
+    ordering = ('title',)
+    list_per_page = LIST_PER_PAGE
+    readonly_fields = ('related_lists',)
+
+    def related_lists(self, obj):
+        """Liens vers les listes complètes des tâches et des travaux d'ingestion du projet."""
+        if obj.pk is None:
+            return "-"
+        return format_html(
+            '<a href="{}?project__id__exact={}">Toutes les tâches ({})</a> · '
+            '<a href="{}?project__id__exact={}">Tous les travaux d\'ingestion ({})</a>',
+            reverse('admin:api_workdone_changelist'), obj.pk, obj.work_done.count(),
+            reverse('admin:api_ingestjob_changelist'), obj.pk, obj.ingest_jobs.count(),
+        )
+    related_lists.short_description = 'Listes complètes'
+
+
+class WorkDoneAdmin(admin.ModelAdmin):
+    """Liste des tâches : le projet (affiché par `__str__`) est chargé par jointure, pas une requête par ligne."""
+    list_display = ('subtitle', 'project')
+    list_select_related = ('project',)
+    autocomplete_fields = ('project',)
+    # Une seule colonne : un OU avec le titre du projet (autre table) empêcherait l'usage de l'index.
+    search_fields = ('^subtitle',)
+    list_per_page = LIST_PER_PAGE
+    # Pas de COUNT(*) sur toute la table à chaque recherche.
+    show_full_result_count = False
+
+
+class IngestJobAdmin(admin.ModelAdmin):
+    """Suivi de la file d'ingestion des archives (traitée par `python manage.py ingest_worker`)."""
+    list_display = ('project', 'kind', 'status', 'attempts', 'created_at', 'started_at', 'finished_at')
+    list_filter = ('status', 'kind')
+    list_select_related = ('project',)
+    readonly_fields = ('project', 'kind', 'status', 'attempts', 'error', 'created_at', 'started_at', 'finished_at')
+    list_per_page = LIST_PER_PAGE
+    actions = ['retry_jobs']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Relancer l'ingestion des projets sélectionnés")
+    def retry_jobs(self, request, queryset):
+        """Remet en file, pour chaque projet, la première étape sélectionnée et toutes celles qui en dépendent."""
+        first_step = {}
+        for job in queryset.exclude(status__in=ACTIVE_STATUSES).select_related('project'):
+            step = INGEST_KINDS.index(job.kind)
+            first_step[job.project] = min(step, first_step.get(job.project, step))
+        created = sum(len(enqueue_ingest(project, INGEST_KINDS[step:])) for project, step in first_step.items())
+        self.message_user(request, f"{created} travaux remis en file.")
 
 
 class CompetenceTechnologiqueAdmin(admin.ModelAdmin):
     """Personnalise l'affichage en liste du modèle CompetenceTechnologique."""
     list_display = ('nom', 'display_logo_preview')
-    
+    # Utilisé par les champs d'autocomplétion des projets.
+    search_fields = ('^nom',)
+    ordering = ('nom',)
+    list_per_page = LIST_PER_PAGE
+
     def display_logo_preview(self, obj):
-        """Affiche un petit aperçu du logo dans la liste de l'interface d'administration."""
-        if obj.logo:
-            return mark_safe(f'<img src="{obj.logo.url}" alt="{obj.nom}" height="40" />')
-        return "Aucun logo"
+        """
+        Affiche un petit aperçu du logo dans la liste de l'interface d'administration.
+
+        La plus petite variante WebP générée est préférée à l'original, et chargée à l'affichage.
+        """
+        if not obj.logo:
+            return "Aucun logo"
+        variants = (obj.logo_variants or {}).get('webp')
+        name = variants[0]['name'] if variants else obj.logo.name
+        return format_html(
+            '<img src="{}" alt="{}" height="40" loading="lazy" />', _logo_url(name), obj.nom,
+        )
     display_logo_preview.short_description = 'Aperçu du Logo'
 
 
@@ -41,9 +148,10 @@ class CompetenceTechnologiqueAdmin(admin.ModelAdmin):
 # Rend les modèles accessibles et gérables depuis l'URL /admin/.
 
 admin.site.register(Project, ProjectAdmin)
+admin.site.register(IngestJob, IngestJobAdmin)
 admin.site.register(Presentation)
 admin.site.register(PosteCible)
 admin.site.register(Diplome)
 admin.site.register(CompetenceTechnologique, CompetenceTechnologiqueAdmin)
 admin.site.register(Parcours)
-admin.site.register(WorkDone)
\ No newline at end of file
+admin.site.register(WorkDone, WorkDoneAdmin)
\ No newline at end of file
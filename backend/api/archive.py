@@ -0,0 +1,205 @@
+# backend/api/archive.py
+
+import struct
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict, namedtuple
+from django.conf import settings
+from .archive_cache import materialize_archive
+
+# Entrée du répertoire central : tout ce qu'il faut pour relire un membre sans rouvrir l'index.
+ArchiveEntry = namedtuple(
+    'ArchiveEntry',
+    ['path', 'name', 'header_offset', 'compress_type', 'compress_size', 'file_size', 'crc', 'flag_bits'],
+)
+
+# En-tête local d'un membre ZIP (cf. APPNOTE.TXT, section 4.3.7).
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+_FH_FILENAME_LENGTH = 10
+_FH_EXTRA_FIELD_LENGTH = 11
+_CHUNK_SIZE = 64 * 1024
+
+
+def _needs_zipfile(entry):
+    """Vrai pour les méthodes rares (bzip2, lzma, chiffrement) que seul le module zipfile sait lire."""
+    return entry.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED) or entry.flag_bits & 0x1
+
+
+def normalize_member_path(name):
+    """Normalise un chemin de membre ZIP comme le ferait `extractall` (sans '..', '.', ni racine)."""
+    parts = [part for part in name.replace('\\', '/').split('/') if part not in ('', '.', '..')]
+    return '/'.join(parts)
+
+
+class ArchiveIndex:
+    """Index en mémoire des membres d'une archive ZIP (chemin → position, tailles, CRC)."""
+
+    def __init__(self, opener, entries):
+        self._opener = opener
+        self.entries = entries
+
+    @classmethod
+    def build(cls, opener):
+        """Lit uniquement le répertoire central de l'archive pour construire l'index."""
+        entries = {}
+        try:
+            with opener() as fp, zipfile.ZipFile(fp, 'r') as zip_ref:
+                for info in zip_ref.infolist():
+                    path = normalize_member_path(info.filename)
+                    if info.is_dir() or not path or '.DS_Store' in path:
+                        continue
+                    entries[path] = ArchiveEntry(
+                        path=path,
+                        name=info.filename,
+                        header_offset=info.header_offset,
+                        compress_type=info.compress_type,
+                        compress_size=info.compress_size,
+                        file_size=info.file_size,
+                        crc=info.CRC,
+                        flag_bits=info.flag_bits,
+                    )
+        except (zipfile.BadZipFile, OSError) as e:
+            raise IOError(f"Échec de la lecture du fichier zip : {str(e)}")
+        return cls(opener, entries)
+
+    def __contains__(self, path):
+        return path in self.entries
+
+    def iter_member(self, path, chunk_size=_CHUNK_SIZE):
+        """Décompresse à la volée un seul membre de l'archive, par blocs, en vérifiant son CRC."""
+        entry = self.entries[path]
+        if _needs_zipfile(entry):
+            # Méthodes rares (bzip2, lzma, chiffrement) : on délègue au module zipfile.
+            yield from self._iter_with_zipfile(entry, chunk_size)
+            return
+
+        with self._opener() as fp:
+            yield from self._iter_entry(fp, entry, chunk_size)
+
+    def _iter_entry(self, fp, entry, chunk_size=_CHUNK_SIZE):
+        fp.seek(entry.header_offset)
+        header = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+        if header[0] != _LOCAL_HEADER_SIGNATURE:
+            raise IOError(f"En-tête local invalide pour '{entry.name}'.")
+        # Saute le nom de fichier et le champ « extra » de l'en-tête local.
+        fp.seek(header[_FH_FILENAME_LENGTH] + header[_FH_EXTRA_FIELD_LENGTH], 1)
+
+        decompressor = zlib.decompressobj(-15) if entry.compress_type == zipfile.ZIP_DEFLATED else None
+        remaining = entry.compress_size
+        crc = 0
+        while remaining > 0:
+            raw = fp.read(min(chunk_size, remaining))
+            if not raw:
+                raise IOError(f"Archive tronquée pour '{entry.name}'.")
+            remaining -= len(raw)
+            data = decompressor.decompress(raw) if decompressor else raw
+            if data:
+                crc = zlib.crc32(data, crc)
+                yield data
+        if decompressor:
+            data = decompressor.flush()
+            if data:
+                crc = zlib.crc32(data, crc)
+                yield data
+        if crc != entry.crc:
+            raise IOError(f"CRC invalide pour '{entry.name}'.")
+
+    def _iter_with_zipfile(self, entry, chunk_size):
+        with self._opener() as fp, zipfile.ZipFile(fp, 'r') as zip_ref, zip_ref.open(entry.name) as member:
+            while True:
+                data = member.read(chunk_size)
+                if not data:
+                    break
+                yield data
+
+    def read(self, path):
+        """Retourne le contenu décompressé d'un membre de l'archive."""
+        return b''.join(self.iter_member(path))
+
+    def read_many(self, paths):
+        """Lit plusieurs membres avec un seul descripteur, dans l'ordre de l'archive ; produit (chemin, contenu)."""
+        entries = sorted((self.entries[path] for path in paths), key=lambda entry: entry.header_offset)
+        with self._opener() as fp:
+            for entry in entries:
+                if _needs_zipfile(entry):
+                    yield entry.path, b''.join(self._iter_with_zipfile(entry, _CHUNK_SIZE))
+                else:
+                    yield entry.path, b''.join(self._iter_entry(fp, entry))
+
+    def tree(self):
+        """Construit l'arborescence (dossiers d'abord, puis fichiers, par nom) des membres de l'archive."""
+        root = {}
+        for path in sorted(self.entries):
+            parts = path.split('/')
+            current_level = root
+            for part in parts[:-1]:
+                current_level = current_level.setdefault(part, {})
+            current_level[parts[-1]] = parts[-1]
+
+        def build_tree(d, path_prefix=''):
+            """Fonction pour convertir le dictionnaire en une liste."""
+            result = []
+            for k, v in d.items():
+                current_path = f"{path_prefix}{k}"
+                node = {'name': k, 'path': current_path}
+                if isinstance(v, dict):
+                    node['type'] = 'directory'
+                    node['children'] = build_tree(v, f"{current_path}/")
+                else:
+                    node['type'] = 'file'
+                result.append(node)
+            return sorted(result, key=lambda x: (x['type'] == 'file', x['name']))
+
+        return build_tree(root)
+
+
+# --- Cache des index, partagé par tous les threads du processus ---
+
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_archive_index(field_file, sha256=None):
+    """
+    Retourne l'index (mis en cache dans le processus) de l'archive référencée par un FileField.
+
+    Quand l'empreinte de l'archive est connue, l'index est associé à cette version et les membres
+    sont relus depuis une copie locale (cf. `archive_cache.materialize_archive`).
+    """
+    storage, name = field_file.storage, field_file.name
+    key = sha256 or (name, storage.size(name))
+
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    if sha256:
+        local_path = materialize_archive(field_file, sha256)
+
+        def opener():
+            try:
+                return open(local_path, 'rb')
+            except FileNotFoundError:
+                # La copie a été évincée du cache entre-temps : on la recrée.
+                return open(materialize_archive(field_file, sha256), 'rb')
+    else:
+        opener = lambda: storage.open(name, 'rb')
+    # Construit l'index hors du verrou : la lecture du répertoire central peut être lente.
+    index = ArchiveIndex.build(opener)
+
+    with _index_cache_lock:
+        _index_cache[key] = index
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > getattr(settings, 'SOURCE_ARCHIVE_INDEX_CACHE_SIZE', 32):
+            _index_cache.popitem(last=False)
+    return index
+
+
+def clear_archive_index_cache():
+    """Vide le cache des index d'archives du processus courant."""
+    with _index_cache_lock:
+        _index_cache.clear()
@@ -0,0 +1,200 @@
+# backend/api/archive_cache.py
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def get_cache_root(create=True):
+    """Retourne (et crée si besoin) le répertoire de cache des archives de code source."""
+    root = Path(getattr(settings, 'SOURCE_CACHE_ROOT', None) or Path(settings.MEDIA_ROOT) / 'zip_cache')
+    if create:
+        root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+@contextmanager
+def file_lock(lock_path):
+    """Verrou exclusif inter-processus (workers gunicorn) reposant sur un fichier de verrouillage."""
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def local_storage_path(field_file):
+    """Chemin local du fichier si le stockage en fournit un (FileSystemStorage), sinon None."""
+    try:
+        return Path(field_file.storage.path(field_file.name))
+    except NotImplementedError:
+        return None
+
+
+def get_max_bytes():
+    """Quota en octets du cache d'archives (`SOURCE_CACHE_MAX_BYTES`)."""
+    return int(getattr(settings, 'SOURCE_CACHE_MAX_BYTES', 1024 ** 3))
+
+
+def _lock_path(root, name):
+    # Verrous répartis sur 256 fichiers au plus, jamais supprimés (supprimer un verrou en attente casserait l'exclusion).
+    locks = root / '.locks'
+    locks.mkdir(exist_ok=True)
+    return locks / f'{name}.lock'
+
+
+def get_lock_path(name):
+    """Fichier de verrou partagé par les workers pour la ressource `name`."""
+    return _lock_path(get_cache_root(), name)
+
+
+def _entries(root):
+    """
+    Fichiers en cache (copies d'archives et index de recherche), du moins récemment utilisé au plus
+    récent : [(chemin, taille, dernier accès)]. Le nom de chaque fichier est l'empreinte de l'archive.
+    """
+    entries = []
+    for path in [*root.glob('*.zip'), *root.glob('search/*.sqlite3')]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((path, stat.st_size, stat.st_mtime))
+    return sorted(entries, key=lambda entry: entry[2])
+
+
+def record_stats(**increments):
+    """Incrémente les compteurs persistants (hits, misses, evictions) partagés par tous les workers."""
+    root = get_cache_root()
+    stats_path = root / 'stats.json'
+    with file_lock(_lock_path(root, 'stats')):
+        try:
+            stats = json.loads(stats_path.read_text())
+        except (FileNotFoundError, ValueError):
+            stats = {}
+        for key, value in increments.items():
+            stats[key] = stats.get(key, 0) + value
+        stats_path.write_text(json.dumps(stats))
+
+
+def get_stats():
+    """Retourne l'état du cache : compteurs, nombre de fichiers, octets utilisés et quota."""
+    root = get_cache_root()
+    try:
+        stats = json.loads((root / 'stats.json').read_text())
+    except (FileNotFoundError, ValueError):
+        stats = {}
+    entries = _entries(root)
+    return {
+        'hits': stats.get('hits', 0),
+        'misses': stats.get('misses', 0),
+        'evictions': stats.get('evictions', 0),
+        'entries': len(entries),
+        'bytes': sum(size for _, size, _ in entries),
+        'max_bytes': get_max_bytes(),
+    }
+
+
+def touch(sha256):
+    """Marque l'archive en cache comme récemment utilisée (date de modification = dernier accès)."""
+    touch_path(get_cache_root(create=False) / f'{sha256}.zip')
+
+
+def touch_path(path):
+    """Met à jour la date de dernier accès d'un fichier du cache, s'il existe."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def trim(max_bytes=None, keep=()):
+    """Évince les archives les moins récemment utilisées jusqu'à respecter le quota ; retourne les octets libérés."""
+    root = get_cache_root()
+    max_bytes = get_max_bytes() if max_bytes is None else max_bytes
+    freed = evicted = 0
+    with file_lock(_lock_path(root, 'trim')):
+        entries = _entries(root)
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= max_bytes:
+                break
+            if path.stem in keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            total -= size
+            freed += size
+            evicted += 1
+    if evicted:
+        record_stats(evictions=evicted)
+    return freed
+
+
+def materialize_archive(field_file, sha256):
+    """
+    Retourne un chemin local vers l'archive dont l'empreinte est `sha256`.
+
+    Avec un stockage distant (Cloudinary), l'archive est copiée une seule fois par version dans
+    `zip_cache/<sha256>.zip` : la copie est écrite dans un fichier temporaire, vérifiée, puis
+    renommée atomiquement sous un verrou inter-processus. Une archive remplacée change d'empreinte
+    et donc de fichier de cache : l'ancienne version n'est jamais resservie. Le cache est ensuite
+    ramené sous son quota en évinçant les archives les moins récemment utilisées.
+    """
+    path = local_storage_path(field_file)
+    if path is not None:
+        return path
+
+    root = get_cache_root()
+    target = root / f'{sha256}.zip'
+    if target.exists():
+        touch(sha256)
+        record_stats(hits=1)
+        return target
+
+    with file_lock(_lock_path(root, sha256[:2])):
+        # Un autre worker a pu terminer la copie pendant l'attente du verrou.
+        if target.exists():
+            touch(sha256)
+            record_stats(hits=1)
+            return target
+
+        fd, tmp_name = tempfile.mkstemp(dir=root, prefix=f'.{sha256}-', suffix='.tmp')
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as tmp, field_file.storage.open(field_file.name, 'rb') as source:
+                for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            if digest.hexdigest() != sha256:
+                raise IOError("L'archive stockée ne correspond pas à l'empreinte enregistrée.")
+            os.replace(tmp_name, target)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+    record_stats(misses=1)
+    trim(keep={sha256})
+    return target
@@ -0,0 +1,157 @@
+# backend/api/async_views.py
+
+import asyncio
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import StreamingHttpResponse
+from .models import Project
+from .views import ProjectViewSet
+
+_executor = None
+_executor_lock = threading.Lock()
+# Sémaphores par (boucle d'événements, archive) et nombre de requêtes qui les utilisent.
+_archive_slots = {}
+_archive_users = defaultdict(int)
+
+
+def get_executor():
+    """Pool de threads borné (`SOURCE_IO_MAX_WORKERS`) réservé aux lectures d'archives."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.SOURCE_IO_MAX_WORKERS, thread_name_prefix='source-io')
+    return _executor
+
+
+async def acquire_archive_slot(key):
+    """
+    Réserve l'une des `SOURCE_IO_MAX_PER_ARCHIVE` places d'extraction simultanée d'une archive ;
+    retourne la fonction (idempotente, à appeler dans la boucle d'événements) qui la libère.
+
+    Les requêtes au-delà attendent sans occuper de thread ; le sémaphore est oublié dès que plus
+    aucune requête ne porte sur l'archive.
+    """
+    slot_key = (asyncio.get_running_loop(), key)
+    semaphore = _archive_slots.get(slot_key)
+    if semaphore is None:
+        semaphore = _archive_slots[slot_key] = asyncio.Semaphore(settings.SOURCE_IO_MAX_PER_ARCHIVE)
+    _archive_users[slot_key] += 1
+    acquired = False
+
+    def release():
+        nonlocal acquired
+        if acquired is None:
+            return
+        if acquired:
+            semaphore.release()
+        acquired = None
+        _archive_users[slot_key] -= 1
+        if not _archive_users[slot_key]:
+            del _archive_users[slot_key], _archive_slots[slot_key]
+
+    try:
+        await semaphore.acquire()
+    except BaseException:
+        release()
+        raise
+    acquired = True
+    return release
+
+
+@asynccontextmanager
+async def archive_slot(key):
+    """Place d'extraction d'une archive réservée pour la durée du bloc (voir `acquire_archive_slot`)."""
+    release = await acquire_archive_slot(key)
+    try:
+        yield
+    finally:
+        release()
+
+
+def _call_with_connections(func, *args):
+    """Exécute `func` dans un thread du pool en y gérant les connexions à la base comme le ferait une requête."""
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+async def run_blocking(func, *args):
+    """Exécute une fonction bloquante dans le pool des lectures d'archives."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), _call_with_connections, func, *args)
+
+
+async def _stream_in_executor(iterator, release):
+    """
+    Lit chaque bloc d'un flux synchrone (décompression d'un membre) dans le pool, sans bloquer la boucle.
+
+    La place réservée sur l'archive est libérée à la fin du flux (ou à sa fermeture).
+    """
+    sentinel = object()
+    try:
+        while (chunk := await run_blocking(next, iterator, sentinel)) is not sentinel:
+            yield chunk
+    finally:
+        release()
+
+
+def _archive_key(pk):
+    """Clé de la limite par archive : l'empreinte de l'archive du projet (deux projets peuvent la partager)."""
+    try:
+        sha256 = Project.objects.filter(pk=pk).values_list('source_code_sha256', flat=True).first()
+    except (ValueError, TypeError):
+        sha256 = None
+    # Archive pas encore ingérée ou projet inconnu : la vue répond aussitôt, sans extraction.
+    return sha256 or f'project:{pk}'
+
+
+def _render(view, request, pk):
+    response = view(request, pk=pk)
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+async def _source_code_action(view, request, pk):
+    release = await acquire_archive_slot(await run_blocking(_archive_key, pk))
+    try:
+        response = await run_blocking(_render, view, request, pk)
+    except BaseException:
+        release()
+        raise
+    if not isinstance(response, StreamingHttpResponse) or response.is_async:
+        release()
+        return response
+
+    # Sous ASGI, Django consommerait un flux synchrone d'un bloc (et en mémoire) : on le lit par le pool.
+    # La décompression se fait pendant la diffusion : la place sur l'archive reste réservée jusqu'à
+    # la fin du flux, ou jusqu'à la fermeture de la réponse (client déconnecté avant la fin).
+    response.streaming_content = _stream_in_executor(iter(response.streaming_content), release)
+    loop = asyncio.get_running_loop()
+    response._resource_closers.append(lambda: loop.call_soon_threadsafe(release))
+    return response
+
+
+_tree_view = ProjectViewSet.as_view({'get': 'source_code_tree'}, detail=True, basename='project')
+_file_view = ProjectViewSet.as_view({'get': 'source_code_file'}, detail=True, basename='project')
+
+
+async def source_code_tree(request, pk):
+    """
+    Version asynchrone de `ProjectViewSet.source_code_tree` (déploiement ASGI, `SOURCE_ASYNC_VIEWS`).
+
+    Sous ASGI, Django exécute toutes les vues synchrones dans un même thread : une archive lente à
+    extraire y bloquerait les autres points d'accès. Ici, l'action s'exécute dans un pool dédié et borné.
+    """
+    return await _source_code_action(_tree_view, request, pk)
+
+
+async def source_code_file(request, pk):
+    """Version asynchrone de `ProjectViewSet.source_code_file` ; le contenu brut est diffusé par le pool."""
+    return await _source_code_action(_file_view, request, pk)
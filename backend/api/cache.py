@@ -0,0 +1,103 @@
+# backend/api/cache.py
+
+import time
+from django.conf import settings
+from django.core.cache import caches
+from .metrics import registry
+
+CONTENT_VERSION_KEY = 'api:content-version'
+
+
+def _initial_version():
+    # Valeur initiale horodatée : si la clé de version est évincée, elle ne retombe jamais sur une ancienne valeur.
+    return time.time_ns()
+
+
+def _bump_version(backend, key):
+    """
+    Remplace une version par une valeur nouvelle, toujours supérieure à la précédente.
+
+    Une valeur horodatée écrite d'un bloc plutôt qu'un `incr` : sur les backends partagés sans
+    incrément atomique (fichiers, base de données), deux invalidations simultanées de workers
+    différents ne peuvent pas aboutir à la même version et en perdre une.
+    """
+    current = backend.get(key) or 0
+    backend.set(key, max(_initial_version(), current + 1), timeout=None)
+
+
+def get_content_version():
+    """
+    Version courante du contenu du portfolio, renouvelée à chaque modification en administration.
+
+    Stockée dans le cache des réponses (`API_RESPONSE_CACHE`), partagé par tous les workers.
+    """
+    response_cache = get_response_cache()
+    version = response_cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        response_cache.add(CONTENT_VERSION_KEY, _initial_version(), timeout=None)
+        version = response_cache.get(CONTENT_VERSION_KEY, _initial_version())
+    return version
+
+
+def bump_content_version():
+    """Invalide toutes les réponses mises en cache qui dépendent du contenu."""
+    _bump_version(get_response_cache(), CONTENT_VERSION_KEY)
+
+
+# --- Cache des réponses des ViewSets en lecture seule ---
+
+# Compteurs de `metrics.registry` : propres à chaque processus, exposés par `/api/_metrics`.
+RESPONSE_STATS_COUNTERS = {'hits': 'api_response_cache_hits_total', 'misses': 'api_response_cache_misses_total'}
+
+
+def get_response_cache():
+    """Backend de cache des réponses de l'API (alias `API_RESPONSE_CACHE`)."""
+    return caches[settings.API_RESPONSE_CACHE]
+
+
+def _model_version_key(model):
+    return f'api:model-version:{model._meta.label_lower}'
+
+
+def get_model_versions(models):
+    """
+    Versions courantes des modèles dont dépend une réponse.
+
+    Les versions sont stockées dans le cache des réponses lui-même, partagé par tous les workers et
+    les commandes de gestion ;
+    une version absente (évincée) est réinitialisée à une valeur horodatée, jamais réutilisée.
+    """
+    response_cache = get_response_cache()
+    keys = [_model_version_key(model) for model in models]
+    versions = response_cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            response_cache.add(key, _initial_version(), timeout=None)
+            versions[key] = response_cache.get(key, _initial_version())
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    """Invalide les réponses mises en cache qui dépendent de `model`."""
+    _bump_version(get_response_cache(), _model_version_key(model))
+
+
+def record_response_cache(hit):
+    """
+    Incrémente le compteur de hits ou de misses du cache des réponses.
+
+    Les compteurs restent en mémoire : un `incr` sur le cache partagé coûterait une lecture et une
+    écriture (non atomiques) à chaque requête.
+    """
+    registry.increment(RESPONSE_STATS_COUNTERS['hits' if hit else 'misses'])
+
+
+def get_response_cache_stats():
+    """Compteurs du cache des réponses pour ce processus : {'hits': …, 'misses': …}."""
+    values = registry.get_counters(RESPONSE_STATS_COUNTERS.values())
+    return {name: values[counter] for name, counter in RESPONSE_STATS_COUNTERS.items()}
+
+
+def reset_response_cache_stats():
+    """Remet à zéro les compteurs du cache des réponses de ce processus."""
+    registry.reset_counters(RESPONSE_STATS_COUNTERS.values())
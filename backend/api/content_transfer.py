@@ -0,0 +1,172 @@
+# backend/api/content_transfer.py
+
+import json
+from itertools import groupby
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import CompetenceTechnologique, Diplome, Parcours, PosteCible, Presentation, Project, WorkDone
+
+# Contenus du portfolio, dans l'ordre d'import (les cibles des clés étrangères d'abord). Manifestes,
+# dossiers et travaux d'ingestion sont dérivés des archives : ils ne sont pas exportés.
+CONTENT_MODELS = (CompetenceTechnologique, Project, WorkDone, Presentation, PosteCible, Diplome, Parcours)
+MODELS_BY_LABEL = {model._meta.label_lower: model for model in CONTENT_MODELS}
+# Clé des technologies d'un projet, désignées par leur nom.
+TECHNOLOGIES_KEY = 'technologies'
+DEFAULT_BATCH_SIZE = 1000
+
+
+class ContentImportError(Exception):
+    """Ligne d'import invalide (modèle ou champ inconnu, technologie introuvable…)."""
+
+
+def exported_fields(model):
+    """Colonnes exportées : toutes les colonnes concrètes sauf la clé primaire et les dates `auto_now`."""
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if not field.primary_key and not getattr(field, 'auto_now', False)
+    ]
+
+
+def timestamp_fields(model):
+    """Dates `auto_now` : non exportées, mais renouvelées sur chaque objet importé (ETag, validateurs)."""
+    return [field.attname for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+
+
+def _project_technologies(chunk_size):
+    """Noms des technologies par projet, en flux trié par projet (une seule requête sur la table de liaison)."""
+    links = (
+        Project.technologies.through.objects.order_by('project_id', 'competencetechnologique__nom')
+        .values_list('project_id', 'competencetechnologique__nom').iterator(chunk_size=chunk_size)
+    )
+    for project_id, group in groupby(links, key=lambda link: link[0]):
+        yield project_id, [name for _, name in group]
+
+
+def export_lines(chunk_size=DEFAULT_BATCH_SIZE):
+    """
+    Produit le contenu du portfolio en JSON Lines, une ligne `{"model", "pk", "fields"}` par objet.
+
+    Les lignes sont lues par blocs avec `iterator()` : la mémoire reste constante quel que soit le
+    volume. Les technologies des projets sont jointes par fusion de deux flux triés par projet.
+    """
+    for model in CONTENT_MODELS:
+        label = model._meta.label_lower
+        fields = exported_fields(model)
+        rows = model.objects.order_by('pk').values('pk', *fields).iterator(chunk_size=chunk_size)
+        technologies = _project_technologies(chunk_size) if model is Project else iter(())
+        pending = next(technologies, None)
+        for row in rows:
+            pk = row.pop('pk')
+            if model is Project:
+                while pending is not None and pending[0] < pk:
+                    pending = next(technologies, None)
+                row[TECHNOLOGIES_KEY] = pending[1] if pending is not None and pending[0] == pk else []
+            yield json.dumps({'model': label, 'pk': pk, 'fields': row}, ensure_ascii=False)
+
+
+class _Batch:
+    """Objets en attente d'écriture pour un modèle, avec les technologies des projets."""
+
+    def __init__(self, model):
+        self.model = model
+        self.fields = exported_fields(model)
+        self.timestamps = timestamp_fields(model)
+        self.objects = []
+        self.technologies = {}
+
+
+def import_lines(lines, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Importe des lignes produites par `export_lines` ; retourne le nombre d'objets importés par modèle.
+
+    Les objets gardent leur clé primaire : ceux qui existent déjà sont mis à jour, les autres créés,
+    par lots de `batch_size` (`bulk_create` avec mise à jour en conflit, ou `bulk_update` sur les bases
+    qui ne la gèrent pas), le tout dans une seule transaction.
+    Les technologies sont résolues par leur nom avec une seule table de correspondance, construite
+    au premier projet (les technologies du fichier sont importées avant les projets). Les signaux
+    d'enregistrement ne sont pas émis : les caches sont invalidés par l'appelant.
+    """
+    counts = {}
+    now = timezone.now()
+    technology_ids = None
+    batch = None
+
+    def flush():
+        if batch is None or not batch.objects:
+            return
+        _write_batch(batch)
+        batch.objects.clear()
+        batch.technologies.clear()
+
+    with transaction.atomic():
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                model = MODELS_BY_LABEL[record['model']]
+                pk, fields = record['pk'], dict(record['fields'])
+            except (ValueError, KeyError, TypeError) as e:
+                raise ContentImportError(f"Ligne {number} : enregistrement invalide ({type(e).__name__}: {e}).") from e
+
+            if batch is None or batch.model is not model:
+                flush()
+                batch = _Batch(model)
+            technologies = fields.pop(TECHNOLOGIES_KEY, None) if model is Project else None
+            unknown = set(fields) - set(batch.fields)
+            if unknown:
+                raise ContentImportError(f"Ligne {number} : champ(s) inconnu(s) pour {record['model']} : {', '.join(sorted(unknown))}.")
+
+            if technologies is not None:
+                if technology_ids is None:
+                    technology_ids = dict(CompetenceTechnologique.objects.values_list('nom', 'pk'))
+                missing = [name for name in technologies if name not in technology_ids]
+                if missing:
+                    raise ContentImportError(f"Ligne {number} : technologie(s) inconnue(s) : {', '.join(missing)}.")
+                batch.technologies[pk] = {technology_ids[name] for name in technologies}
+
+            # Les objets mis à jour (et les projets dont les technologies sont réécrites) changent de
+            # date : `updated_at` entre dans les validateurs des réponses (ETag, Last-Modified).
+            batch.objects.append(model(pk=pk, **fields, **dict.fromkeys(batch.timestamps, now)))
+            counts[model] = counts.get(model, 0) + 1
+            if model is CompetenceTechnologique and technology_ids is not None:
+                # Technologie placée après un projet dans le fichier : reportée dans la table.
+                technology_ids[fields.get('nom')] = pk
+            if len(batch.objects) >= batch_size:
+                flush()
+        flush()
+        _reset_sequences(counts)
+    return counts
+
+
+def _write_batch(batch):
+    model = batch.model
+    update_fields = batch.fields + batch.timestamps
+    if connection.features.supports_update_conflicts_with_target and update_fields:
+        # Un seul INSERT … ON CONFLICT DO UPDATE par lot : bien plus rapide que `bulk_update` (CASE … WHEN).
+        model.objects.bulk_create(batch.objects, update_conflicts=True, unique_fields=['pk'], update_fields=update_fields)
+    else:
+        existing = set(model.objects.filter(pk__in=[obj.pk for obj in batch.objects]).values_list('pk', flat=True))
+        updated = [obj for obj in batch.objects if obj.pk in existing]
+        if updated and update_fields:
+            model.objects.bulk_update(updated, update_fields)
+        model.objects.bulk_create([obj for obj in batch.objects if obj.pk not in existing])
+
+    if batch.technologies:
+        through = Project.technologies.through
+        through.objects.filter(project_id__in=list(batch.technologies)).delete()
+        through.objects.bulk_create([
+            through(project_id=project_id, competencetechnologique_id=technology_id)
+            for project_id, technology_ids in batch.technologies.items()
+            for technology_id in technology_ids
+        ])
+
+
+def _reset_sequences(models):
+    """Après des insertions à clé primaire explicite, les séquences (PostgreSQL…) repartent du maximum."""
+    statements = connection.ops.sequence_reset_sql(no_style(), list(models))
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
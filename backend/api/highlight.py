@@ -0,0 +1,62 @@
+# backend/api/highlight.py
+
+import hashlib
+from functools import lru_cache
+from django.conf import settings
+from django.core.cache import caches
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import TextLexer, get_lexer_for_filename
+from pygments.styles import get_all_styles
+from pygments.util import ClassNotFound
+from .manifest import BINARY_SNIFF_SIZE
+
+DEFAULT_STYLE = 'monokai'
+CSS_CLASS = 'highlight'
+
+
+def is_known_style(style):
+    """Vrai si `style` est un style Pygments installé."""
+    return style in _all_styles()
+
+
+@lru_cache(maxsize=1)
+def _all_styles():
+    return frozenset(get_all_styles())
+
+
+@lru_cache(maxsize=64)
+def style_css(style):
+    """Feuille de style d'un thème Pygments, limitée au conteneur `.highlight`."""
+    return HtmlFormatter(style=style, cssclass=CSS_CLASS).get_style_defs(f'.{CSS_CLASS}')
+
+
+def _cache_key(sha256, path, style):
+    # Le chemin est haché pour rester dans les limites de clé des backends (memcached : 250 caractères).
+    return f"highlight:{sha256}:{hashlib.sha1(path.encode()).hexdigest()}:{style}"
+
+
+def highlight_member(sha256, path, style, read):
+    """
+    Retourne le HTML coloré d'un fichier source, calculé au plus une fois par version d'archive.
+
+    Le rendu est mémorisé dans le cache `SOURCE_HIGHLIGHT_CACHE` (clé : empreinte de l'archive,
+    chemin et style) ; l'éviction est celle du backend de cache configuré. `read` n'est appelé
+    qu'en cas d'absence dans le cache. Lève ValueError pour un fichier binaire.
+    """
+    cache = caches[settings.SOURCE_HIGHLIGHT_CACHE]
+    key = _cache_key(sha256, path, style)
+    rendered = cache.get(key)
+    if rendered is None:
+        try:
+            lexer = get_lexer_for_filename(path, stripnl=False)
+        except ClassNotFound:
+            lexer = TextLexer(stripnl=False)
+        content = read()
+        if b'\x00' in content[:BINARY_SNIFF_SIZE]:
+            raise ValueError("Fichier binaire : coloration syntaxique impossible.")
+        code = content.decode('utf-8', errors='ignore')
+        html = highlight(code, lexer, HtmlFormatter(style=style, cssclass=CSS_CLASS, linenos='table'))
+        rendered = {'html': html, 'language': lexer.name}
+        cache.set(key, rendered, timeout=None)
+    return rendered
@@ -0,0 +1,100 @@
+# backend/api/images.py
+
+import io
+import posixpath
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+from .models import CompetenceTechnologique, Presentation
+
+# Formats des variantes, du plus compact au plus compatible (les navigateurs prennent la première source connue).
+VARIANT_FORMATS = {
+    'avif': {'format': 'AVIF', 'feature': 'avif', 'options': {'quality': 60}},
+    'webp': {'format': 'WEBP', 'feature': 'webp', 'options': {'quality': 80, 'method': 6}},
+}
+# Formats vectoriels servis tels quels : aucune variante matricielle.
+PASSTHROUGH_EXTENSIONS = {'svg'}
+# Images dont les variantes sont générées à l'envoi : modèle → (champ, clé de `IMAGE_VARIANT_WIDTHS`).
+IMAGE_FIELDS = {
+    CompetenceTechnologique: ('logo', 'logo'),
+    Presentation: ('photo', 'photo'),
+}
+
+
+def available_formats():
+    """Formats de variantes que la version installée de Pillow sait encoder."""
+    return [name for name, spec in VARIANT_FORMATS.items() if features.check(spec['feature'])]
+
+
+def variant_name(name, width, extension):
+    """Nom d'une variante, à côté de l'original : `competences_logos/python.png` → `competences_logos/python_96w.webp`."""
+    stem, _ = posixpath.splitext(name)
+    return f"{stem}_{width}w.{extension}"
+
+
+def generate_variants(field_file, widths):
+    """
+    Génère les variantes redimensionnées (AVIF, WebP) d'une image et les enregistre dans son stockage.
+
+    Les largeurs supérieures à celle de l'original ne sont pas produites (jamais d'agrandissement) ;
+    une image plus petite que toutes les largeurs est seulement réencodée. Retourne
+    `{format: [{'width': …, 'name': …}, …]}`, vide pour un SVG ou un fichier illisible.
+    """
+    extension = posixpath.splitext(field_file.name)[1].lstrip('.').lower()
+    if extension in PASSTHROUGH_EXTENSIONS:
+        return {}
+
+    storage = field_file.storage
+    try:
+        with storage.open(field_file.name, 'rb') as fp:
+            image = Image.open(fp)
+            image.load()
+    except (UnidentifiedImageError, OSError):
+        return {}
+    # Applique l'orientation EXIF (photos prises au téléphone) avant de redimensionner.
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+
+    targets = sorted({width for width in widths if width < image.width}) or [image.width]
+    if image.width not in targets and len(targets) < len(widths):
+        targets.append(image.width)
+
+    variants = {}
+    for name in available_formats():
+        spec = VARIANT_FORMATS[name]
+        entries = []
+        for width in targets:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, spec['format'], **spec['options'])
+            saved = storage.save(variant_name(field_file.name, width, name), ContentFile(buffer.getvalue()))
+            entries.append({'width': width, 'name': saved})
+        variants[name] = entries
+    return variants
+
+
+def delete_variants(storage, variants):
+    """Supprime du stockage les fichiers de variantes d'une image remplacée ou retirée."""
+    for entries in (variants or {}).values():
+        for entry in entries:
+            storage.delete(entry['name'])
+
+
+def refresh_variants(instance):
+    """
+    Remplace les variantes de l'image d'un objet par celles de son fichier actuel ; retourne la nouvelle correspondance.
+
+    La correspondance est écrite par `update()` (sans signal `post_save`), avec la date de modification.
+    """
+    model = type(instance)
+    field_name, kind = IMAGE_FIELDS[model]
+    variants_field = f'{field_name}_variants'
+    image = getattr(instance, field_name)
+    delete_variants(image.storage, getattr(instance, variants_field))
+    variants = generate_variants(image, settings.IMAGE_VARIANT_WIDTHS[kind]) if image else {}
+    setattr(instance, variants_field, variants)
+    model.objects.filter(pk=instance.pk).update(**{variants_field: variants, 'updated_at': timezone.now()})
+    return variants
@@ -0,0 +1,166 @@
+# backend/api/ingest.py
+
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef, Q, Subquery
+from django.utils import timezone
+from .archive_cache import materialize_archive
+from .manifest import get_source_manifest, refresh_source_manifest
+from .models import IngestJob, Project, SourceManifest
+from .search import build_search_index
+from .snapshot import schedule_snapshot_export
+
+logger = logging.getLogger(__name__)
+
+# Étapes d'ingestion d'une archive, dans leur ordre d'exécution (les suivantes ont besoin de l'empreinte).
+INGEST_KINDS = (IngestJob.Kind.MANIFEST, IngestJob.Kind.ARCHIVE, IngestJob.Kind.SEARCH)
+ACTIVE_STATUSES = (IngestJob.Status.PENDING, IngestJob.Status.RUNNING)
+# Étapes qu'une requête publique peut redemander : seul l'index de recherche est évincé du cache disque.
+REQUESTABLE_KINDS = (IngestJob.Kind.SEARCH,)
+
+
+def _ingest_manifest(project):
+    """Calcule l'empreinte de l'archive et construit son manifeste ; l'archive devient alors consultable."""
+    refresh_source_manifest(project)
+    Project.objects.filter(pk=project.pk).update(source_code_sha256=project.source_code_sha256)
+    if settings.API_SNAPSHOT_ON_SAVE:
+        schedule_snapshot_export()
+
+
+def _ingest_archive(project):
+    """Copie locale de l'archive (stockage distant), pour que les lectures de membres restent locales."""
+    get_source_manifest(project)
+    materialize_archive(project.source_code_zip, project.source_code_sha256)
+
+
+def _ingest_search(project):
+    """Index trigramme de recherche des fichiers texte."""
+    build_search_index(project, get_source_manifest(project))
+
+
+INGEST_STEPS = {
+    IngestJob.Kind.MANIFEST: _ingest_manifest,
+    IngestJob.Kind.ARCHIVE: _ingest_archive,
+    IngestJob.Kind.SEARCH: _ingest_search,
+}
+
+
+def enqueue_ingest(project, kinds=INGEST_KINDS):
+    """
+    Met en file les étapes d'ingestion de l'archive d'un projet ; retourne les travaux créés.
+
+    Une étape déjà en attente pour ce projet n'est pas dupliquée (elle traitera l'archive actuelle).
+    Avec `SOURCE_INGEST_EAGER`, les travaux sont exécutés aussitôt dans le processus courant
+    (développement, tests) ; sinon, par la commande `ingest_worker`.
+    """
+    pending = set(
+        IngestJob.objects.filter(project=project, status=IngestJob.Status.PENDING, kind__in=kinds)
+        .values_list('kind', flat=True)
+    )
+    jobs = IngestJob.objects.bulk_create([IngestJob(project=project, kind=kind) for kind in kinds if kind not in pending])
+    if settings.SOURCE_INGEST_EAGER:
+        for job in jobs:
+            if claim_job(job.pk):
+                run_job(job.pk, project=project)
+    return jobs
+
+
+def request_ingest(project, kinds=REQUESTABLE_KINDS):
+    """
+    Redemande depuis une requête publique un index de recherche évincé, sans jamais l'exécuter.
+
+    Seules les étapes de `REQUESTABLE_KINDS` peuvent l'être, et seulement une fois le manifeste de
+    l'archive construit : une archive sans manifeste (antérieure à la file) est reprise en entier par
+    `enqueue_missing`, qu'`ingest_worker` appelle périodiquement. Rien n'est ajouté si une ingestion
+    est en attente ou en cours pour ce projet, ni pour une étape dont la dernière tentative a échoué
+    (archive invalide) : la relance passe par l'administration.
+    """
+    kinds = [kind for kind in kinds if kind in REQUESTABLE_KINDS]
+    if (
+        not kinds or not project.source_code_sha256
+        or not SourceManifest.objects.filter(sha256=project.source_code_sha256).exists()
+        or IngestJob.objects.filter(project=project, status__in=ACTIVE_STATUSES).exists()
+    ):
+        return []
+    kinds = [
+        kind for kind in kinds
+        if IngestJob.objects.filter(project=project, kind=kind).order_by('-pk').values_list('status', flat=True).first()
+        != IngestJob.Status.FAILED
+    ]
+    return IngestJob.objects.bulk_create([IngestJob(project=project, kind=kind) for kind in kinds])
+
+
+def enqueue_missing():
+    """
+    Met en file les archives sans manifeste et sans ingestion active (archives antérieures à la file).
+
+    Une archive dont le dernier manifeste a échoué n'est pas reprise : appelée périodiquement par
+    `ingest_worker`, la fonction relancerait sinon sans fin une archive invalide.
+    """
+    latest_manifest_status = (
+        IngestJob.objects.filter(project=OuterRef('pk'), kind=IngestJob.Kind.MANIFEST).order_by('-pk').values('status')[:1]
+    )
+    projects = (
+        Project.objects.exclude(source_code_zip='').exclude(source_code_zip=None)
+        .exclude(Exists(SourceManifest.objects.filter(sha256=OuterRef('source_code_sha256'))))
+        .exclude(Exists(IngestJob.objects.filter(project=OuterRef('pk'), status__in=ACTIVE_STATUSES)))
+        .annotate(latest_manifest_status=Subquery(latest_manifest_status))
+        .filter(Q(latest_manifest_status=None) | ~Q(latest_manifest_status=IngestJob.Status.FAILED))
+    )
+    return sum(len(enqueue_ingest(project)) for project in projects)
+
+
+def requeue_stale(timeout=None):
+    """Remet en attente les travaux « en cours » depuis plus de `SOURCE_INGEST_JOB_TIMEOUT` (worker interrompu)."""
+    timeout = settings.SOURCE_INGEST_JOB_TIMEOUT if timeout is None else timeout
+    return IngestJob.objects.filter(
+        status=IngestJob.Status.RUNNING, started_at__lt=timezone.now() - timedelta(seconds=timeout),
+    ).update(status=IngestJob.Status.PENDING)
+
+
+def claimable_jobs():
+    """Travaux en attente dont aucune étape antérieure du même projet n'est en attente ou en cours."""
+    earlier = IngestJob.objects.filter(project=OuterRef('project'), pk__lt=OuterRef('pk'), status__in=ACTIVE_STATUSES)
+    return IngestJob.objects.filter(status=IngestJob.Status.PENDING).exclude(Exists(earlier)).order_by('pk')
+
+
+def claim_job(job_id):
+    """Réserve un travail en attente ; l'UPDATE conditionnel garantit qu'un seul worker l'obtient."""
+    return IngestJob.objects.filter(pk=job_id, status=IngestJob.Status.PENDING).update(
+        status=IngestJob.Status.RUNNING, started_at=timezone.now(), finished_at=None,
+        attempts=F('attempts') + 1, error='',
+    ) == 1
+
+
+def claim_next_job():
+    """Réserve le plus ancien travail exécutable ; retourne son identifiant, ou None si la file est vide."""
+    for job_id in claimable_jobs().values_list('pk', flat=True)[:20]:
+        if claim_job(job_id):
+            return job_id
+    return None
+
+
+def run_job(job_id, project=None):
+    """
+    Exécute un travail réservé par `claim_job` et enregistre son résultat ; retourne le statut final.
+
+    Appelée dans un processus du pool de `ingest_worker` : toute erreur est consignée sur le travail
+    (visible dans l'administration) plutôt que propagée.
+    """
+    job = IngestJob.objects.get(pk=job_id)
+    project = project or Project.objects.get(pk=job.project_id)
+    try:
+        if job.kind == IngestJob.Kind.MANIFEST or project.source_code_zip:
+            INGEST_STEPS[job.kind](project)
+        status, error = IngestJob.Status.DONE, ''
+    except Exception as e:
+        logger.exception("Échec de l'ingestion %s du projet %s", job.kind, job.project_id)
+        status, error = IngestJob.Status.FAILED, f"{type(e).__name__}: {e}"
+    IngestJob.objects.filter(pk=job_id).update(status=status, error=error, finished_at=timezone.now())
+    if status == IngestJob.Status.FAILED:
+        # Les étapes suivantes de ce projet dépendent de celle-ci : elles échouent sans être tentées.
+        IngestJob.objects.filter(project_id=job.project_id, pk__gt=job_id, status=IngestJob.Status.PENDING).update(
+            status=status, error="Étape précédente en échec.", finished_at=timezone.now(),
+        )
+    return status
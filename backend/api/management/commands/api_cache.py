@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from api.cache import get_response_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Vide le cache des réponses de l'API. Les compteurs de hits et de misses sont propres à chaque "
+        "processus serveur : ils sont exposés par /api/_metrics."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clear', action='store_true', help="Vide le cache des réponses.")
+
+    def handle(self, *args, **options):
+        if not options['clear']:
+            self.stdout.write("Rien à faire : --clear vide le cache ; les compteurs sont exposés par /api/_metrics.")
+            return
+        get_response_cache().clear()
+        self.stdout.write(self.style.SUCCESS("Cache des réponses vidé."))
@@ -0,0 +1,25 @@
+from django.core.exceptions import DisallowedHost
+from django.core.management.base import BaseCommand, CommandError
+from api import snapshot
+
+
+class Command(BaseCommand):
+    help = "Exporte toutes les réponses publiques de l'API en fichiers JSON précompressés (gzip, brotli)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=None,
+            help="Dossier de sortie pour un hébergeur statique (par défaut : export versionné dans API_SNAPSHOT_ROOT).",
+        )
+        parser.add_argument(
+            '--base-url', default=None,
+            help="Schéma et hôte des URL absolues des médias (par défaut : API_SNAPSHOT_BASE_URL).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            count = snapshot.export_snapshot(output=options['output'], base_url=options['base_url'])
+        except (DisallowedHost, ValueError) as e:
+            raise CommandError(str(e))
+        destination = options['output'] or snapshot.current_snapshot_dir()
+        self.stdout.write(self.style.SUCCESS(f"{count} réponses exportées dans {destination}."))
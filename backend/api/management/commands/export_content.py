@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from api.content_transfer import DEFAULT_BATCH_SIZE, export_lines
+
+
+class Command(BaseCommand):
+    help = "Exporte le contenu du portfolio (projets, technologies, parcours…) en JSON Lines, en flux."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='-', help="Fichier de sortie (par défaut : sortie standard).")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Lignes lues par requête.")
+
+    def handle(self, *args, **options):
+        lines = export_lines(chunk_size=options['batch_size'])
+        count = 0
+        if options['output'] == '-':
+            # `OutputWrapper.write` ajoute la fin de ligne.
+            for line in lines:
+                self.stdout.write(line)
+                count += 1
+            self.stderr.write(f"{count} objets exportés.")
+            return
+        with open(options['output'], 'w', encoding='utf-8') as fp:
+            for line in lines:
+                fp.write(line + '\n')
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f"{count} objets exportés dans {options['output']}."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from api.images import IMAGE_FIELDS, refresh_variants
+from api.signals import content_changed
+
+
+class Command(BaseCommand):
+    help = "Génère les variantes AVIF/WebP des logos et de la photo déjà envoyés (images antérieures au pipeline)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Régénère aussi les images qui ont déjà des variantes.")
+
+    def handle(self, *args, **options):
+        for model, (field_name, _) in IMAGE_FIELDS.items():
+            count = 0
+            for instance in model.objects.exclude(**{field_name: ''}).exclude(**{field_name: None}).iterator():
+                if getattr(instance, f'{field_name}_variants') and not options['force']:
+                    continue
+                refresh_variants(instance)
+                count += 1
+            if count:
+                content_changed(model)
+            self.stdout.write(f"{model._meta.verbose_name_plural} : {count} image(s) traitée(s).")
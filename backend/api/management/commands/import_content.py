@@ -0,0 +1,34 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from api import ingest
+from api.content_transfer import DEFAULT_BATCH_SIZE, ContentImportError, import_lines
+from api.models import Project
+from api.signals import content_changed
+
+
+class Command(BaseCommand):
+    help = "Importe un export JSON Lines du contenu du portfolio par lots, dans une seule transaction."
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="Fichier produit par `export_content` ('-' pour l'entrée standard).")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Objets écrits par requête.")
+
+    def handle(self, *args, **options):
+        try:
+            if options['input'] == '-':
+                counts = import_lines(sys.stdin, batch_size=options['batch_size'])
+            else:
+                with open(options['input'], encoding='utf-8') as fp:
+                    counts = import_lines(fp, batch_size=options['batch_size'])
+        except (OSError, ContentImportError, DatabaseError) as e:
+            raise CommandError(f"Import annulé : {e}")
+
+        # Les écritures par lots n'émettent pas les signaux : caches et ingestion sont mis à jour ici.
+        for model in counts:
+            content_changed(model)
+        if Project in counts:
+            ingest.enqueue_missing()
+        for model, count in counts.items():
+            self.stdout.write(f"{model._meta.verbose_name_plural} : {count} objet(s) importé(s).")
+        self.stdout.write(self.style.SUCCESS(f"{sum(counts.values())} objets importés."))
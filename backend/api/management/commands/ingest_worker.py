@@ -0,0 +1,115 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.db import connections
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from api import ingest
+from api.models import IngestJob
+
+
+def _init_process():
+    """Initialise Django dans un processus du pool (nécessaire sans `fork`) sans reprendre les connexions du parent."""
+    import django
+
+    django.setup()
+    connections.close_all()
+
+
+def _run_job(job_id):
+    try:
+        return ingest.run_job(job_id)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Traite la file d'ingestion des archives de code source avec un pool de processus."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=settings.SOURCE_INGEST_PROCESSES,
+            help="Taille du pool (par défaut SOURCE_INGEST_PROCESSES ; 0 exécute les travaux dans ce processus).",
+        )
+        parser.add_argument('--once', action='store_true', help="S'arrête quand la file est vide.")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Attente (s) quand la file est vide.")
+        parser.add_argument(
+            '--rescan-interval', type=float, default=60.0,
+            help="Intervalle (s) entre deux recherches de travaux interrompus et d'archives sans manifeste.",
+        )
+
+    def handle(self, *args, **options):
+        self.next_rescan = 0
+        self.rescan(options)
+        if options['processes'] < 1:
+            done = self.run_inline(options)
+        else:
+            done = self.run_pool(options)
+        self.stdout.write(self.style.SUCCESS(f"{done} travaux traités."))
+
+    def rescan(self, options):
+        """
+        Reprend les travaux interrompus et met en file les archives sans manifeste, au plus une fois par
+        `--rescan-interval` : une archive antérieure à la file n'attend pas le redémarrage du worker.
+        Retourne le nombre de travaux repris ou ajoutés.
+        """
+        if time.monotonic() < self.next_rescan:
+            return 0
+        self.next_rescan = time.monotonic() + options['rescan_interval']
+        requeued = ingest.requeue_stale()
+        queued = ingest.enqueue_missing()
+        if requeued or queued:
+            self.stdout.write(f"{requeued} travaux interrompus repris, {queued} travaux ajoutés pour les archives sans manifeste.")
+        return requeued + queued
+
+    def report(self, job_id, status):
+        job = IngestJob.objects.select_related('project').get(pk=job_id)
+        line = f"[{job.get_status_display()}] {job}"
+        self.stdout.write(self.style.SUCCESS(line) if status == IngestJob.Status.DONE else self.style.ERROR(f"{line} : {job.error}"))
+
+    def run_inline(self, options):
+        done = 0
+        while True:
+            job_id = ingest.claim_next_job()
+            if job_id is None:
+                if self.rescan(options):
+                    continue
+                if options['once']:
+                    return done
+                time.sleep(options['poll_interval'])
+                continue
+            self.report(job_id, ingest.run_job(job_id))
+            done += 1
+
+    def run_pool(self, options):
+        processes = options['processes']
+        done = 0
+        # Les connexions ouvertes ne doivent pas être partagées avec les processus du pool.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_process) as pool:
+            running = {}
+            while True:
+                while len(running) < processes and (job_id := ingest.claim_next_job()) is not None:
+                    running[pool.submit(_run_job, job_id)] = job_id
+                if not running:
+                    if self.rescan(options):
+                        continue
+                    if options['once']:
+                        return done
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job_id = running.pop(future)
+                    try:
+                        status = future.result()
+                    except BrokenProcessPool as e:
+                        # Processus tué (mémoire, signal) : le pool est perdu, ses travaux sont consignés en échec.
+                        IngestJob.objects.filter(pk__in=[job_id, *running.values()]).update(
+                            status=IngestJob.Status.FAILED, error=f"{type(e).__name__}: {e}", finished_at=timezone.now(),
+                        )
+                        raise CommandError("Un processus du pool s'est arrêté brutalement.") from e
+                    self.report(job_id, status)
+                    done += 1
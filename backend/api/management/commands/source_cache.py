@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from api import archive_cache
+
+
+class Command(BaseCommand):
+    help = "Affiche les statistiques du cache d'archives de code source et peut le réduire hors ligne."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--trim', action='store_true', help="Évince les archives les moins récemment utilisées.")
+        parser.add_argument(
+            '--max-bytes', type=int, default=None,
+            help="Quota à appliquer avec --trim (par défaut SOURCE_CACHE_MAX_BYTES ; 0 vide le cache).",
+        )
+
+    def handle(self, *args, **options):
+        if options['trim']:
+            freed = archive_cache.trim(max_bytes=options['max_bytes'])
+            self.stdout.write(self.style.SUCCESS(f"{freed} octets libérés."))
+
+        stats = archive_cache.get_stats()
+        requests = stats['hits'] + stats['misses']
+        hit_rate = f"{100 * stats['hits'] / requests:.1f} %" if requests else "n/a"
+        self.stdout.write(f"Répertoire : {archive_cache.get_cache_root()}")
+        self.stdout.write(f"Fichiers en cache : {stats['entries']} ({stats['bytes']} / {stats['max_bytes']} octets)")
+        self.stdout.write(f"Hits : {stats['hits']}  Misses : {stats['misses']}  Taux de hit : {hit_rate}")
+        self.stdout.write(f"Évictions : {stats['evictions']}")
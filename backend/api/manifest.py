@@ -0,0 +1,177 @@
+# backend/api/manifest.py
+
+import hashlib
+from pathlib import PurePosixPath
+from django.db import transaction
+from django.db.models import Q
+from .archive import get_archive_index
+from .models import IngestJob, SourceDirectory, SourceManifest
+
+# Langage détecté à partir de l'extension (noms compatibles avec les coloriseurs Prism/Pygments).
+LANGUAGES_BY_EXTENSION = {
+    'py': 'python', 'js': 'javascript', 'jsx': 'jsx', 'mjs': 'javascript', 'cjs': 'javascript',
+    'ts': 'typescript', 'tsx': 'tsx', 'html': 'html', 'htm': 'html', 'css': 'css', 'scss': 'scss',
+    'sass': 'sass', 'less': 'less', 'json': 'json', 'md': 'markdown', 'yml': 'yaml', 'yaml': 'yaml',
+    'toml': 'toml', 'ini': 'ini', 'cfg': 'ini', 'xml': 'xml', 'svg': 'xml', 'sh': 'bash', 'bash': 'bash',
+    'sql': 'sql', 'java': 'java', 'kt': 'kotlin', 'c': 'c', 'h': 'c', 'cpp': 'cpp', 'hpp': 'cpp',
+    'cs': 'csharp', 'go': 'go', 'rs': 'rust', 'rb': 'ruby', 'php': 'php', 'swift': 'swift',
+    'vue': 'markup', 'txt': 'text',
+}
+LANGUAGES_BY_FILENAME = {
+    'Dockerfile': 'docker', 'Makefile': 'makefile', '.gitignore': 'text', '.env': 'bash',
+}
+# Taille de l'échantillon inspecté pour décider si un fichier est binaire.
+BINARY_SNIFF_SIZE = 8192
+
+
+class SourceNotReady(Exception):
+    """L'archive d'un projet n'a pas encore été ingérée (`ingest_worker`) ; `kinds` : étapes manquantes."""
+
+    def __init__(self, kinds=tuple(IngestJob.Kind)):
+        super().__init__("Le code source est en cours de traitement.")
+        self.kinds = kinds
+
+
+def hash_archive(field_file):
+    """Calcule l'empreinte SHA-256 du contenu de l'archive référencée par un FileField."""
+    digest = hashlib.sha256()
+    with field_file.storage.open(field_file.name, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detect_language(path):
+    """Devine le langage d'un fichier d'après son nom ou son extension."""
+    name = PurePosixPath(path).name
+    if name in LANGUAGES_BY_FILENAME:
+        return LANGUAGES_BY_FILENAME[name]
+    return LANGUAGES_BY_EXTENSION.get(name.rsplit('.', 1)[-1].lower() if '.' in name else '', 'text')
+
+
+def describe_member(index, path):
+    """Calcule la taille, le nombre de lignes et le caractère binaire d'un membre, en un seul passage."""
+    lines = 0
+    binary = False
+    last = b''
+    for i, chunk in enumerate(index.iter_member(path)):
+        if i == 0 and b'\x00' in chunk[:BINARY_SNIFF_SIZE]:
+            binary = True
+        lines += chunk.count(b'\n')
+        last = chunk
+    if last and not last.endswith(b'\n'):
+        lines += 1
+    return {
+        'size': index.entries[path].file_size,
+        'lines': 0 if binary else lines,
+        'language': None if binary else detect_language(path),
+        'binary': binary,
+    }
+
+
+def build_manifest(index):
+    """Construit l'arborescence et les métadonnées par fichier d'une archive indexée."""
+    files = {path: describe_member(index, path) for path in index.entries}
+    tree = index.tree()
+
+    def annotate(nodes):
+        for node in nodes:
+            if node['type'] == 'directory':
+                node['child_count'] = len(node['children'])
+                annotate(node['children'])
+            else:
+                node.update(files[node['path']])
+
+    annotate(tree)
+    return tree, files
+
+
+def directory_rows(tree):
+    """Aplatit l'arborescence en un enregistrement par dossier : (chemin, profondeur, enfants directs)."""
+    rows = []
+
+    def walk(path, depth, nodes):
+        rows.append((path, depth, [
+            {key: value for key, value in node.items() if key != 'children'} for node in nodes
+        ]))
+        for node in nodes:
+            if node['type'] == 'directory':
+                walk(node['path'], depth + 1, node['children'])
+
+    walk('', 0, tree)
+    return rows
+
+
+def list_directory(project, path='', depth=1):
+    """
+    Retourne le contenu d'un dossier de l'archive sur `depth` niveaux, ou None si le dossier n'existe pas.
+
+    Seuls les enregistrements des dossiers concernés sont lus (index sur le chemin et la profondeur) :
+    l'arborescence complète n'est jamais chargée. Lève SourceNotReady si le manifeste de l'archive
+    n'est pas (ou plus) en base : une archive ingérée a toujours un enregistrement pour sa racine.
+    """
+    if not project.source_code_sha256:
+        get_source_manifest(project)
+    path = path.strip('/')
+    base_depth = path.count('/') + 1 if path else 0
+    rows = SourceDirectory.objects.filter(
+        manifest__sha256=project.source_code_sha256,
+        depth__lt=base_depth + depth,
+    )
+    if path:
+        rows = rows.filter(Q(path=path) | Q(path__startswith=f"{path}/"))
+    entries_by_path = dict(rows.values_list('path', 'entries'))
+    if path not in entries_by_path:
+        if not path or not SourceDirectory.objects.filter(manifest__sha256=project.source_code_sha256, depth=0).exists():
+            raise SourceNotReady()
+        return None
+
+    def expand(dir_path):
+        nodes = entries_by_path[dir_path]
+        for node in nodes:
+            if node['type'] == 'directory' and node['path'] in entries_by_path:
+                node['children'] = expand(node['path'])
+        return nodes
+
+    return expand(path)
+
+
+def refresh_source_manifest(project):
+    """(Re)calcule l'empreinte de l'archive d'un projet et construit son manifeste s'il n'existe pas encore."""
+    if not project.source_code_zip:
+        project.source_code_sha256 = ''
+        return None
+
+    sha256 = hash_archive(project.source_code_zip)
+    project.source_code_sha256 = sha256
+    manifest = SourceManifest.objects.filter(sha256=sha256).first()
+    if manifest is None:
+        tree, files = build_manifest(get_archive_index(project.source_code_zip, sha256))
+        with transaction.atomic():
+            manifest, created = SourceManifest.objects.get_or_create(sha256=sha256, defaults={'tree': tree, 'files': files})
+            if created:
+                SourceDirectory.objects.bulk_create([
+                    SourceDirectory(manifest=manifest, path=path, depth=depth, entries=entries)
+                    for path, depth, entries in directory_rows(tree)
+                ], batch_size=1000)
+    return manifest
+
+
+def get_source_manifest(project, fields=None):
+    """
+    Retourne le manifeste précalculé de l'archive d'un projet.
+
+    `fields` restreint les colonnes chargées (`only`) : l'arborescence et l'index des fichiers sont
+    deux documents JSON volumineux, souvent utiles séparément. Le manifeste n'est jamais construit
+    ici : il l'est par la file d'ingestion (`api.ingest`). Lève SourceNotReady tant que l'archive
+    envoyée n'a pas été traitée.
+    """
+    manifest = None
+    if project.source_code_sha256:
+        manifests = SourceManifest.objects.filter(sha256=project.source_code_sha256)
+        if fields is not None:
+            manifests = manifests.only(*fields)
+        manifest = manifests.first()
+    if manifest is None:
+        raise SourceNotReady()
+    return manifest
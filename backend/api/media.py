@@ -0,0 +1,144 @@
+# backend/api/media.py
+
+import mimetypes
+import os
+import re
+from django.conf import settings
+from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured, SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_http_methods
+from .archive_cache import get_cache_root
+
+# Taille des blocs lus pour une réponse partielle : la mémoire utilisée ne dépend pas de la taille du fichier.
+CHUNK_SIZE = 256 * 1024
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header, size):
+    """
+    Interprète un en-tête `Range` portant sur un seul intervalle ; retourne (début, fin incluse).
+
+    Retourne None si l'en-tête est absent, invalide ou multiple (le fichier entier est alors servi,
+    comme le permet la RFC 9110) ; lève ValueError si l'intervalle est hors du fichier (416).
+    """
+    match = _RANGE_RE.match(header.replace(' ', '')) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if start == '':
+        # Suffixe : les N derniers octets.
+        length = int(end)
+        if length == 0 or size == 0:
+            raise ValueError
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        raise ValueError
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    """`If-Range` : la réponse partielle n'est valable que si la version du fichier n'a pas changé."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _is_private(full_path):
+    """
+    Fichiers jamais servis : fichiers et dossiers cachés (`.env`, `.locks`…) et cache des archives
+    de code source (copies d'archives, index de recherche, statistiques), même s'il est sous MEDIA_ROOT.
+    """
+    try:
+        relative = Path(full_path).relative_to(Path(settings.MEDIA_ROOT).resolve())
+    except ValueError:
+        # Lien symbolique qui sort de MEDIA_ROOT.
+        return True
+    if any(part.startswith('.') for part in relative.parts):
+        return True
+    return Path(full_path).is_relative_to(get_cache_root(create=False).resolve())
+
+
+def _iter_range(path, start, length):
+    with open(path, 'rb') as fp:
+        fp.seek(start)
+        while length > 0:
+            chunk = fp.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+@require_http_methods(['GET', 'HEAD'])
+def serve_media(request, path):
+    """
+    Sert un fichier de MEDIA_ROOT avec prise en charge des requêtes partielles et conditionnelles.
+
+    `Range: bytes=…` donne une réponse 206 (lecture vidéo et déplacement immédiats), `If-None-Match` /
+    `If-Modified-Since` une réponse 304. Le fichier est diffusé par blocs, jamais chargé en mémoire.
+    """
+    if not settings.MEDIA_ROOT:
+        # `safe_join('', …)` résoudrait les chemins depuis le répertoire courant (code, base SQLite…).
+        raise ImproperlyConfigured("MEDIA_ROOT doit être défini pour servir les médias.")
+    try:
+        full_path = os.path.realpath(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404("Fichier introuvable.")
+    if _is_private(full_path):
+        raise Http404("Fichier introuvable.")
+    try:
+        stat = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("Fichier introuvable.")
+    if not os.path.isfile(full_path):
+        raise Http404("Fichier introuvable.")
+
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    try:
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range is not None and not _if_range_matches(request, etag, last_modified):
+        byte_range = None
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+    elif byte_range is None:
+        # Fichier entier : FileResponse profite de `wsgi.file_wrapper` (sendfile) quand le serveur le fournit.
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_iter_range(full_path, start, end - start + 1), status=206, content_type=content_type)
+
+    if byte_range is not None:
+        start, end = byte_range
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    else:
+        response['Content-Length'] = size
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
@@ -0,0 +1,165 @@
+# backend/api/metrics.py
+
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from django.conf import settings
+
+# Composantes mesurées, dans l'ordre de l'en-tête Server-Timing.
+COMPONENTS = ('db', 'serialize', 'render', 'view', 'total')
+# Libellé des requêtes qui ne correspondent à aucune URL (limite la cardinalité des séries).
+UNMATCHED_ENDPOINT = '<unmatched>'
+# Compteurs simples exposés par `render_prometheus`, avec leur description.
+COUNTERS = {
+    'api_response_cache_hits_total': "Réponses servies depuis le cache des réponses.",
+    'api_response_cache_misses_total': "Réponses calculées puis mises en cache.",
+}
+
+
+class RequestMetrics:
+    """Mesures d'une requête : temps cumulé par composante (secondes) et nombre de requêtes SQL."""
+
+    def __init__(self):
+        self.timings = defaultdict(float)
+        self.db_queries = 0
+        self.view_start = None
+        self._depth = defaultdict(int)
+
+    def record_query(self, execute, sql, params, many, context):
+        """`execute_wrapper` de connexion : compte et chronomètre chaque requête SQL."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.timings['db'] += time.perf_counter() - start
+            self.db_queries += 1
+
+    def server_timing(self):
+        """Valeur de l'en-tête Server-Timing (durées en millisecondes)."""
+        metrics = []
+        for name in COMPONENTS:
+            if name in self.timings:
+                metric = f"{name};dur={self.timings[name] * 1000:.1f}"
+                if name == 'db':
+                    metric += f';desc="{self.db_queries} requêtes"'
+                metrics.append(metric)
+        return ', '.join(metrics)
+
+
+def get_request_metrics(request):
+    """Mesures de la requête en cours (HttpRequest ou Request DRF), ou None hors `PerformanceMiddleware`."""
+    request = getattr(request, '_request', request)
+    return getattr(request, '_metrics', None)
+
+
+@contextmanager
+def timer(request, name):
+    """
+    Ajoute la durée du bloc à la composante `name` de la requête.
+
+    Les blocs imbriqués de même nom (sérialiseurs imbriqués) ne sont comptés qu'une fois.
+    """
+    metrics = get_request_metrics(request) if request is not None else None
+    if metrics is None or metrics._depth[name]:
+        yield
+        return
+    metrics._depth[name] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] += time.perf_counter() - start
+        metrics._depth[name] -= 1
+
+
+class MetricsRegistry:
+    """Histogrammes de latence, compteurs SQL par point d'accès et compteurs simples, agrégés dans le processus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._counters = dict.fromkeys(COUNTERS, 0)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._counters = dict.fromkeys(COUNTERS, 0)
+
+    def increment(self, name):
+        """Incrémente un compteur de `COUNTERS` (sans accès au cache ni à la base)."""
+        with self._lock:
+            self._counters[name] += 1
+
+    def get_counters(self, names):
+        with self._lock:
+            return {name: self._counters[name] for name in names}
+
+    def reset_counters(self, names):
+        with self._lock:
+            self._counters.update(dict.fromkeys(names, 0))
+
+    def observe(self, endpoint, method, status, metrics):
+        buckets = settings.PERF_HISTOGRAM_BUCKETS
+        total = metrics.timings['total']
+        labels = (endpoint, method, f"{status // 100}xx")
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {
+                    'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0, 'db_queries': 0, 'db_seconds': 0.0,
+                }
+            index = bisect_left(buckets, total)
+            if index < len(buckets):
+                series['buckets'][index] += 1
+            series['sum'] += total
+            series['count'] += 1
+            series['db_queries'] += metrics.db_queries
+            series['db_seconds'] += metrics.timings.get('db', 0.0)
+
+    def render_prometheus(self):
+        """Exposition au format texte de Prometheus (version 0.0.4)."""
+        buckets = settings.PERF_HISTOGRAM_BUCKETS
+        with self._lock:
+            series = {labels: {**values, 'buckets': list(values['buckets'])} for labels, values in self._series.items()}
+            counters = dict(self._counters)
+
+        lines = [
+            '# HELP api_request_duration_seconds Durée de traitement des requêtes par point d\'accès.',
+            '# TYPE api_request_duration_seconds histogram',
+        ]
+        for labels, values in sorted(series.items()):
+            label_text = _labels(labels)
+            cumulative = 0
+            for bound, count in zip(buckets, values['buckets']):
+                cumulative += count
+                lines.append(f'api_request_duration_seconds_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'api_request_duration_seconds_bucket{{{label_text},le="+Inf"}} {values["count"]}')
+            lines.append(f'api_request_duration_seconds_sum{{{label_text}}} {values["sum"]:.6f}')
+            lines.append(f'api_request_duration_seconds_count{{{label_text}}} {values["count"]}')
+        for name, key, help_text, fmt in (
+            ('api_db_queries_total', 'db_queries', "Requêtes SQL exécutées.", '{}'),
+            ('api_db_duration_seconds_total', 'db_seconds', "Temps passé dans les requêtes SQL.", '{:.6f}'),
+        ):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for labels, values in sorted(series.items()):
+                lines.append(f'{name}{{{_labels(labels)}}} {fmt.format(values[key])}')
+        for name, help_text in COUNTERS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name} {counters[name]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    endpoint, method, status = labels
+    return f'endpoint="{_escape(endpoint)}",method="{_escape(method)}",status="{status}"'
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,96 @@
+# backend/api/middleware.py
+
+import logging
+import os
+import time
+from contextlib import ExitStack
+from django.conf import settings as django_settings
+from django.db import connections
+from whitenoise.base import scantree
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.string_utils import ensure_leading_trailing_slash
+from .metrics import UNMATCHED_ENDPOINT, RequestMetrics, registry
+from .snapshot import current_snapshot_dir
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, complété par l'export statique de l'API (`export_api_snapshot`) sous `API_SNAPSHOT_URL`.
+
+    WhiteNoise n'indexe ses fichiers qu'au démarrage ; l'export, lui, est republié à chaque
+    modification du contenu. La version publiée (fichier `CURRENT`) est donc relue à chaque requête
+    vers le préfixe de l'export, et l'index des fichiers reconstruit quand elle change. Les
+    variantes `.gz` / `.br` sont servies selon l'en-tête Accept-Encoding du client.
+    """
+
+    def __init__(self, get_response=None, settings=django_settings):
+        super().__init__(get_response, settings)
+        self.snapshot_prefix = ensure_leading_trailing_slash(settings.API_SNAPSHOT_URL)
+        self.snapshot_dir = None
+        self.snapshot_files = {}
+
+    def __call__(self, request):
+        if request.path_info.startswith(self.snapshot_prefix):
+            static_file = self.get_snapshot_files().get(request.path_info)
+            if static_file is not None:
+                return self.serve(static_file, request)
+        return super().__call__(request)
+
+    def get_snapshot_files(self):
+        directory = current_snapshot_dir()
+        if directory != self.snapshot_dir:
+            files = {}
+            if directory is not None and directory.is_dir():
+                root = f'{directory}{os.sep}'
+                stat_cache = dict(scantree(root))
+                for path in stat_cache:
+                    if self.is_compressed_variant(path, stat_cache=stat_cache):
+                        continue
+                    url = self.snapshot_prefix + path[len(root):].replace('\\', '/')
+                    files[url] = self.get_static_file(path, url, stat_cache=stat_cache)
+            # L'ancienne version reste sur disque : une requête concurrente peut encore la servir.
+            self.snapshot_files, self.snapshot_dir = files, directory
+        return self.snapshot_files
+
+
+class PerformanceMiddleware:
+    """
+    Mesure chaque requête : requêtes SQL (nombre et durée), vue, sérialisation, rendu et durée totale.
+
+    Les mesures alimentent les histogrammes par point d'accès exposés sur `/api/_metrics` et, si
+    `PERF_SERVER_TIMING` est activé, l'en-tête `Server-Timing` (onglet Réseau des navigateurs). Une
+    requête plus lente que `PERF_SLOW_REQUEST_MS` est journalisée avec le détail de son temps. La durée
+    d'une réponse diffusée en flux s'arrête à son premier octet.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._metrics = metrics = RequestMetrics()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics.record_query))
+            response = self.get_response(request)
+        end = time.perf_counter()
+        metrics.timings['total'] = end - start
+        if metrics.view_start is not None:
+            metrics.timings['view'] = end - metrics.view_start
+
+        match = request.resolver_match
+        endpoint = match.view_name if match is not None else UNMATCHED_ENDPOINT
+        registry.observe(endpoint, request.method, response.status_code, metrics)
+        if django_settings.PERF_SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing()
+        if metrics.timings['total'] * 1000 >= django_settings.PERF_SLOW_REQUEST_MS:
+            logger.warning(
+                "Requête lente : %s %s (%s) %s", request.method, request.get_full_path(), response.status_code,
+                metrics.server_timing(),
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics.view_start = time.perf_counter()
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_delete_contactmessage_presentation_email_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceManifest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('tree', models.JSONField()),
+                ('files', models.JSONField(help_text='Taille, nombre de lignes, langage et indicateur binaire par fichier.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Manifeste de code source',
+                'verbose_name_plural': 'Manifestes de code source',
+            },
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='source_code_sha256',
+            field=models.CharField(blank=True, editable=False, help_text="Empreinte SHA-256 de l'archive du code source.", max_length=64),
+        ),
+    ]
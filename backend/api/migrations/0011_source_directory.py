@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_existing_manifests(apps, schema_editor):
+    """Ajoute `child_count` aux dossiers des manifestes existants et crée leur index par dossier."""
+    SourceManifest = apps.get_model('api', 'SourceManifest')
+    SourceDirectory = apps.get_model('api', 'SourceDirectory')
+
+    for manifest in SourceManifest.objects.all():
+        rows = []
+
+        def walk(path, depth, nodes):
+            for node in nodes:
+                if node['type'] == 'directory':
+                    node['child_count'] = len(node['children'])
+            rows.append(SourceDirectory(manifest=manifest, path=path, depth=depth, entries=[
+                {key: value for key, value in node.items() if key != 'children'} for node in nodes
+            ]))
+            for node in nodes:
+                if node['type'] == 'directory':
+                    walk(node['path'], depth + 1, node['children'])
+
+        walk('', 0, manifest.tree)
+        manifest.save(update_fields=['tree'])
+        SourceDirectory.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_source_manifest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceDirectory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text="Chemin du dossier ('' pour la racine).", max_length=1024)),
+                ('depth', models.PositiveIntegerField()),
+                ('entries', models.JSONField()),
+                ('manifest', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='directories', to='api.sourcemanifest')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['manifest', 'depth'], name='api_sourced_manifes_8e0cf3_idx')],
+                'constraints': [models.UniqueConstraint(fields=('manifest', 'path'), name='unique_source_directory_path')],
+            },
+        ),
+        migrations.RunPython(index_existing_manifests, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_content_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competencetechnologique',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Variantes redimensionnées du logo (AVIF/WebP), par format.'),
+        ),
+        migrations.AddField(
+            model_name='presentation',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Variantes redimensionnées de la photo (AVIF/WebP), par format.'),
+        ),
+    ]
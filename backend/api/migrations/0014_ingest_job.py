@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('manifest', 'Empreinte et manifeste'), ('archive', "Copie locale de l'archive"), ('search', 'Index de recherche')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('done', 'Terminé'), ('failed', 'Échec')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ingest_jobs', to='api.project')),
+            ],
+            options={
+                'verbose_name': "Travail d'ingestion",
+                'verbose_name_plural': "Travaux d'ingestion",
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='api_ingestj_status_e25ada_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_ingest_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='competencetechnologique',
+            name='nom',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='title',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='workdone',
+            name='subtitle',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+    ]
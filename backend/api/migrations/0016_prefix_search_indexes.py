@@ -0,0 +1,52 @@
+from django.db import migrations
+
+# Colonnes cherchées par préfixe dans l'administration (`search_fields = ('^…',)`, soit `istartswith`).
+PREFIX_SEARCH_COLUMNS = [
+    ('api_competencetechnologique', 'nom'),
+    ('api_project', 'title'),
+    ('api_workdone', 'subtitle'),
+]
+
+
+def _index_name(table, column):
+    return f'{table}_{column}_prefix_idx'
+
+
+def create_prefix_indexes(apps, schema_editor):
+    """
+    Index utilisables par `istartswith`, dont la forme SQL dépend du moteur :
+
+    - PostgreSQL : `UPPER("col"::text) LIKE UPPER('x%')`, couvert par un index d'expression en
+      `text_pattern_ops` (indépendant de la collation de la base) ;
+    - SQLite : `"col" LIKE 'x%'` (insensible à la casse), qui n'utilise qu'un index en NOCASE.
+
+    Les autres moteurs gardent les index simples de la migration 0015.
+    """
+    vendor = schema_editor.connection.vendor
+    quote = schema_editor.quote_name
+    for table, column in PREFIX_SEARCH_COLUMNS:
+        if vendor == 'postgresql':
+            expression = f'(UPPER({quote(column)}::text) text_pattern_ops)'
+        elif vendor == 'sqlite':
+            expression = f'({quote(column)} COLLATE NOCASE)'
+        else:
+            continue
+        schema_editor.execute(f'CREATE INDEX {quote(_index_name(table, column))} ON {quote(table)} {expression}')
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    for table, column in PREFIX_SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(_index_name(table, column))}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='parcours',
+            index=models.Index(fields=['periode', 'id'], name='api_parcours_periode_id_idx'),
+        ),
+    ]
@@ -3,13 +3,15 @@ from django.core.validators import FileExtensionValidator
 
 class CompetenceTechnologique(models.Model):
     """Représente une compétence technologique (ex: Python, React) avec son logo."""
-    nom = models.CharField(max_length=100)
+    nom = models.CharField(max_length=100, db_index=True)
     logo = models.FileField(
         upload_to='competences_logos/',
         null=True,
         blank=True,
         validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'webp', 'svg'])]
     )
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Variantes redimensionnées du logo (AVIF/WebP), par format.")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Compétence Technologique"
@@ -21,24 +23,89 @@ class CompetenceTechnologique(models.Model):
 class WorkDone(models.Model):
     """Détaille une tâche ou une réalisation spécifique au sein d'un projet."""
     project = models.ForeignKey('Project', related_name='work_done', on_delete=models.CASCADE)
-    subtitle = models.CharField(max_length=200)
+    subtitle = models.CharField(max_length=200, db_index=True)
     description = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.project.title} - {self.subtitle}"
 
 class Project(models.Model):
     """Modèle central représentant un projet réalisé dans le portfolio."""
-    title = models.CharField(max_length=200)
+    title = models.CharField(max_length=200, db_index=True)
     video = models.FileField(upload_to='project_videos/', null=True, blank=True)
     description = models.TextField()
     tasks_effectuees = models.TextField(help_text="Décrivez les tâches générales effectuées.")
     technologies = models.ManyToManyField(CompetenceTechnologique, related_name="projects")
     source_code_zip = models.FileField(upload_to='project_sources/', null=True, blank=True, help_text="Archive ZIP du code source.")
+    source_code_sha256 = models.CharField(max_length=64, blank=True, editable=False, help_text="Empreinte SHA-256 de l'archive du code source.")
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
 
+class SourceManifest(models.Model):
+    """Arborescence et métadonnées précalculées d'une archive de code source, indexées par son empreinte."""
+    sha256 = models.CharField(max_length=64, unique=True)
+    tree = models.JSONField()
+    files = models.JSONField(help_text="Taille, nombre de lignes, langage et indicateur binaire par fichier.")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Manifeste de code source"
+        verbose_name_plural = "Manifestes de code source"
+
+    def __str__(self):
+        return self.sha256
+
+class SourceDirectory(models.Model):
+    """Contenu d'un dossier d'une archive (enfants directs), pour lister un dossier sans charger tout l'arbre."""
+    manifest = models.ForeignKey(SourceManifest, related_name='directories', on_delete=models.CASCADE)
+    path = models.CharField(max_length=1024, help_text="Chemin du dossier ('' pour la racine).")
+    depth = models.PositiveIntegerField()
+    entries = models.JSONField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['manifest', 'path'], name='unique_source_directory_path'),
+        ]
+        indexes = [models.Index(fields=['manifest', 'depth'])]
+
+    def __str__(self):
+        return self.path or '/'
+
+class IngestJob(models.Model):
+    """Étape d'ingestion d'une archive de code source, exécutée hors requête par la commande `ingest_worker`."""
+
+    class Kind(models.TextChoices):
+        MANIFEST = 'manifest', "Empreinte et manifeste"
+        ARCHIVE = 'archive', "Copie locale de l'archive"
+        SEARCH = 'search', "Index de recherche"
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', "En attente"
+        RUNNING = 'running', "En cours"
+        DONE = 'done', "Terminé"
+        FAILED = 'failed', "Échec"
+
+    project = models.ForeignKey(Project, related_name='ingest_jobs', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [models.Index(fields=['status', 'id'])]
+        verbose_name = "Travail d'ingestion"
+        verbose_name_plural = "Travaux d'ingestion"
+
+    def __str__(self):
+        return f"{self.project} - {self.get_kind_display()}"
+
 class Presentation(models.Model):
     """Contient les informations générales de présentation (bio, photo, contact)."""
     texte = models.TextField()
@@ -51,6 +118,8 @@ class Presentation(models.Model):
         blank=True,
         validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'webp'])]
     )
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Variantes redimensionnées de la photo (AVIF/WebP), par format.")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Texte de Présentation"
@@ -62,6 +131,7 @@ class Presentation(models.Model):
 class PosteCible(models.Model):
     """Définit un type de poste visé par le professionnel (ex: Développeur Backend)."""
     nom = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Poste Ciblé"
@@ -74,6 +144,7 @@ class Diplome(models.Model):
     """Représente un diplôme ou une certification obtenue."""
     titre = models.CharField(max_length=200)
     institution = models.CharField(max_length=200)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.titre
@@ -83,10 +154,13 @@ class Parcours(models.Model):
     poste = models.CharField(max_length=200)
     description = models.CharField(max_length=200)
     periode = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         # Trie les expériences de la plus récente à la plus ancienne par défaut.
         ordering = ['-periode']
+        # Ordre de la pagination par curseur (`-periode`, `-id`) : chaque page est une lecture d'index.
+        indexes = [models.Index(fields=['periode', 'id'], name='api_parcours_periode_id_idx')]
         verbose_name = "Parcours"
         verbose_name_plural = "Parcours"
 
@@ -0,0 +1,34 @@
+# backend/api/pagination.py
+
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Pagination par curseur sur un ordre stable et indexé (la clé primaire par défaut).
+
+    Le coût d'une page ne dépend pas de sa position (pas d'OFFSET) et la taille demandée via
+    `?page_size=` est plafonnée par `API_MAX_PAGE_SIZE`. Une vue peut imposer un autre ordre avec
+    l'attribut `cursor_ordering`. Tant que `API_PAGINATION_COMPAT` est actif, la pagination n'est
+    appliquée que si le client la demande (`?cursor=` ou `?page_size=`).
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        # Lu à chaque requête, pas à l'import du module : suit les changements de réglages.
+        return settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if settings.API_PAGINATION_COMPAT and self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', None)
+        if ordering is None:
+            return super().get_ordering(request, queryset, view)
+        return (ordering,) if isinstance(ordering, str) else tuple(ordering)
@@ -0,0 +1,50 @@
+# backend/api/renderers.py
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+from .metrics import timer
+
+try:
+    import orjson
+except ImportError:  # Repli sur le module json de la bibliothèque standard.
+    orjson = None
+
+# Types inconnus d'orjson (chaînes paresseuses, Decimal, QuerySet, UUID…) : même conversion que DRF.
+_default = encoders.JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Rendu JSON compact via orjson (encodage en C, directement en octets).
+
+    La sortie est équivalente à celle de `JSONRenderer` : UTF-8 non échappé, séparateurs compacts,
+    U+2028/U+2029 échappés. ReturnList/ReturnDict sont des sous-classes de list/dict, encodées
+    nativement. Sans orjson, ou pour une sortie indentée (API navigable, `; indent=N`), le rendu
+    standard de DRF est utilisé.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timer((renderer_context or {}).get('request'), 'render'):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        ret = orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    """Analyse les corps JSON avec orjson (repli sur le parseur standard de DRF)."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
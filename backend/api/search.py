@@ -0,0 +1,183 @@
+# backend/api/search.py
+
+import os
+import re
+import re._constants as re_constants
+import re._parser as re_parser
+import sqlite3
+import tempfile
+import time
+import regex as regex_engine
+from django.conf import settings
+from . import archive_cache
+from .archive import get_archive_index
+from .manifest import SourceNotReady
+from .models import IngestJob
+
+# Longueur minimale d'un littéral exploitable par l'index (le tokenizer FTS5 « trigram » découpe en 3 caractères).
+MIN_LITERAL_LENGTH = 3
+SNIPPET_LENGTH = 200
+
+
+def get_search_index_path(sha256):
+    """Chemin de l'index de recherche d'une version d'archive (`zip_cache/search/<sha256>.sqlite3`)."""
+    return archive_cache.get_cache_root() / 'search' / f'{sha256}.sqlite3'
+
+
+def build_search_index(project, manifest):
+    """
+    Construit l'index trigramme (SQLite FTS5) des fichiers texte d'une version d'archive.
+
+    L'index est écrit dans un fichier temporaire puis renommé atomiquement, sous le même type de
+    verrou inter-processus que les copies d'archives : chaque version n'est indexée qu'une fois.
+    """
+    sha256 = project.source_code_sha256
+    target = get_search_index_path(sha256)
+    target.parent.mkdir(exist_ok=True)
+    if target.exists():
+        return target
+
+    with archive_cache.file_lock(archive_cache.get_lock_path(f'search-{sha256[:2]}')):
+        if target.exists():
+            return target
+
+        paths = [
+            path for path, meta in manifest.files.items()
+            if not meta['binary'] and meta['size'] <= settings.SOURCE_SEARCH_MAX_FILE_SIZE
+        ]
+        index = get_archive_index(project.source_code_zip, sha256)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f'.{sha256}-', suffix='.tmp')
+        os.close(fd)
+        try:
+            with sqlite3.connect(tmp_name) as connection:
+                connection.execute("CREATE VIRTUAL TABLE files USING fts5(path UNINDEXED, content, tokenize='trigram')")
+                # Les membres sont lus et insérés au fil de l'eau, dans l'ordre de l'archive.
+                connection.executemany(
+                    "INSERT INTO files (path, content) VALUES (?, ?)",
+                    ((path, content.decode('utf-8', errors='ignore')) for path, content in index.read_many(paths)),
+                )
+                connection.execute("INSERT INTO files (files) VALUES ('optimize')")
+            connection.close()
+            os.replace(tmp_name, target)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+    return target
+
+
+def required_literals(pattern):
+    """
+    Extrait d'une expression régulière des littéraux présents dans toute correspondance.
+
+    L'expression est analysée par le parseur du module `re` (classes, drapeaux en ligne comme `(?x)`
+    et échappements sont donc interprétés comme à la compilation). L'analyse reste prudente : seuls
+    les caractères littéraux consécutifs forment un littéral, un groupe ou une répétition au moins
+    une fois n'est obligatoire que s'il est hors de toute alternative, et les répétitions
+    facultatives sont ignorées. Une liste vide signifie « aucun filtre possible ».
+    """
+    try:
+        parsed = re_parser.parse(pattern)
+    except (re.error, OverflowError, RecursionError):
+        return []
+    runs = []
+
+    def walk(items):
+        current = ''
+        for op, value in items:
+            if op is re_constants.LITERAL:
+                current += chr(value)
+                continue
+            if current:
+                runs.append(current)
+            current = ''
+            if op is re_constants.SUBPATTERN:
+                walk(value[-1])
+            elif op is re_constants.ATOMIC_GROUP:
+                walk(value)
+            elif op in (re_constants.MAX_REPEAT, re_constants.MIN_REPEAT, re_constants.POSSESSIVE_REPEAT):
+                minimum, _, body = value
+                if minimum >= 1:
+                    walk(body)
+            # Alternatives, classes, `.`, ancres, assertions, références… : aucun littéral sûr.
+        if current:
+            runs.append(current)
+
+    walk(parsed)
+    return [run for run in runs if len(run) >= MIN_LITERAL_LENGTH]
+
+
+def _match_expression(literals):
+    """Requête FTS5 : conjonction de phrases, chacune découpée en trigrammes par le tokenizer."""
+    return ' AND '.join('"{}"'.format(literal.replace('"', '""')) for literal in literals)
+
+
+def _remaining(deadline):
+    """Temps restant avant `deadline`, passé comme `timeout` au moteur (0 : échec immédiat)."""
+    return max(deadline - time.monotonic(), 0)
+
+
+def search_source(project, query, regex=False, case_sensitive=False, limit=100):
+    """
+    Recherche `query` dans le code source d'un projet ; retourne (résultats, tronqué).
+
+    Les fichiers candidats sont sélectionnés par l'index trigramme ; seuls ceux-ci sont vérifiés
+    ligne par ligne. Une expression régulière doit donc contenir un littéral obligatoire d'au moins
+    `MIN_LITERAL_LENGTH` caractères, et la vérification s'arrête (résultat tronqué) au-delà de
+    `SOURCE_SEARCH_MAX_SCAN_BYTES` octets ou de `SOURCE_SEARCH_TIMEOUT` secondes. Le délai est
+    transmis au moteur `regex`, qui interrompt aussi une correspondance en cours : une expression
+    fournie par un visiteur ne peut pas occuper un worker indéfiniment. Lève ValueError si la requête
+    n'est pas exploitable, SourceNotReady si l'index n'est pas encore construit.
+    """
+    flags = 0 if case_sensitive else regex_engine.IGNORECASE
+    if regex:
+        try:
+            matcher = regex_engine.compile(query, flags)
+        except regex_engine.error as e:
+            raise ValueError(f"Expression régulière invalide : {e}")
+        literals = required_literals(query)
+        if not literals:
+            raise ValueError(
+                f"L'expression régulière doit contenir un texte fixe d'au moins {MIN_LITERAL_LENGTH} caractères "
+                "(hors alternatives, classes et caractères optionnels)."
+            )
+    else:
+        if len(query) < MIN_LITERAL_LENGTH:
+            raise ValueError(f"La recherche doit contenir au moins {MIN_LITERAL_LENGTH} caractères.")
+        matcher = regex_engine.compile(regex_engine.escape(query), flags)
+        literals = [query]
+
+    if not project.source_code_sha256:
+        raise SourceNotReady()
+    index_path = get_search_index_path(project.source_code_sha256)
+    if not index_path.exists():
+        # Index pas encore construit, ou évincé du cache : il est reconstruit par la file d'ingestion.
+        raise SourceNotReady([IngestJob.Kind.SEARCH])
+    archive_cache.touch_path(index_path)
+
+    connection = sqlite3.connect(f'file:{index_path}?mode=ro', uri=True)
+    try:
+        rows = connection.execute(
+            "SELECT path, content FROM files WHERE files MATCH ? ORDER BY rowid", (_match_expression(literals),),
+        )
+        deadline = time.monotonic() + settings.SOURCE_SEARCH_TIMEOUT
+        budget = settings.SOURCE_SEARCH_MAX_SCAN_BYTES
+        results = []
+        try:
+            for path, content in rows:
+                budget -= len(content)
+                if budget < 0 or time.monotonic() > deadline:
+                    return results, True
+                # Les trigrammes ne sont qu'un filtre : un candidat peut ne pas contenir la chaîne exacte.
+                if not matcher.search(content, timeout=_remaining(deadline)):
+                    continue
+                for line_number, line in enumerate(content.splitlines(), start=1):
+                    if matcher.search(line, timeout=_remaining(deadline)):
+                        if len(results) == limit:
+                            return results, True
+                        results.append({'path': path, 'line': line_number, 'snippet': line.strip()[:SNIPPET_LENGTH]})
+        except TimeoutError:
+            # Le moteur `regex` interrompt une correspondance en cours (retour arrière catastrophique).
+            return results, True
+        return results, False
+    finally:
+        connection.close()
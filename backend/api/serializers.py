@@ -1,5 +1,8 @@
 # backend\api\serializers.py
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
 from rest_framework import serializers
+from .metrics import timer
 from .models import (
     Project,
     Presentation,
@@ -10,22 +13,127 @@ from .models import (
     WorkDone,
 )
 
-class CompetenceTechnologiqueSerializer(serializers.ModelSerializer):
+# Nombre de caractères de la description renvoyés dans la représentation compacte d'un projet.
+PROJECT_SUMMARY_LENGTH = 160
+
+
+class DynamicFieldsMixin:
+    """
+    Permet de restreindre les champs sérialisés (`fields`) et d'inclure des champs optionnels (`expand`).
+
+    Les champs listés dans `Meta.expandable_fields` ne sont sérialisés que s'ils sont demandés via
+    `expand`. Les vues passent ces options depuis `?fields=` et `?expand=` (cf. `SparseFieldsetMixin`).
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = set(expand or ())
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name not in expand:
+                self.fields.pop(name, None)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        # Temps de sérialisation de la requête (Server-Timing, /api/_metrics) ; imbrications comptées une fois.
+        with timer(self.context.get('request'), 'serialize'):
+            return super().to_representation(instance)
+
+
+def optimize_queryset(queryset, serializer, extra_columns=()):
+    """
+    Réduit un queryset à ce que le sérialiseur lit réellement.
+
+    Seules les colonnes des champs sérialisés sont chargées (`only`) ; les relations imbriquées sont
+    préchargées (`prefetch_related`) avec un queryset lui-même réduit au sérialiseur imbriqué, et les
+    relations omises ne sont pas préchargées du tout.
+    """
+    opts = queryset.model._meta
+    columns = {opts.pk.attname, *extra_columns}
+    prefetches = []
+    for field in serializer.fields.values():
+        try:
+            model_field = opts.get_field(field.source)
+        except FieldDoesNotExist:
+            # Champ calculé ou annoté : aucune colonne à charger.
+            continue
+        if not model_field.is_relation:
+            columns.add(model_field.attname)
+        elif model_field.many_to_many or model_field.one_to_many:
+            child = getattr(field, 'child', field)
+            related = model_field.related_model._default_manager.all()
+            if isinstance(child, serializers.BaseSerializer):
+                # Une relation inverse a besoin de sa clé étrangère pour rattacher les objets préchargés.
+                back_reference = (model_field.field.attname,) if model_field.one_to_many else ()
+                related = optimize_queryset(related, child, back_reference)
+            prefetches.append(Prefetch(field.source, queryset=related))
+        else:
+            columns.add(model_field.attname)
+    return queryset.only(*columns).prefetch_related(*prefetches)
+
+
+class CachedFileField(serializers.FileField):
+    """
+    FileField dont l'URL n'est construite qu'une fois par fichier et par réponse.
+
+    Une même compétence apparaît dans de nombreux projets : l'URL de son logo (calculée par le
+    stockage, Cloudinary compris) est mémorisée dans le contexte partagé par les sérialiseurs imbriqués.
+    """
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        urls = self.context.setdefault('_file_urls', {})
+        if value.name not in urls:
+            urls[value.name] = super().to_representation(value)
+        return urls[value.name]
+
+
+class SrcsetField(serializers.Field):
+    """
+    Expose les variantes d'une image sous forme d'attributs `srcset`, par format.
+
+    Exemple : `{"avif": "https://…/python_48w.avif 48w, https://…/python_96w.avif 96w", "webp": "…"}`.
+    Un objet vide (SVG, image absente) signifie que seule l'URL de l'original est disponible.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        # Champ de l'image d'origine : ses variantes sont dans le même stockage.
+        self.image_field = image_field
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, variants):
+        storage = self.parent.Meta.model._meta.get_field(self.image_field).storage
+        request = self.context.get('request')
+        srcset = {}
+        for name, entries in (variants or {}).items():
+            urls = []
+            for entry in entries:
+                url = storage.url(entry['name'])
+                urls.append(f"{request.build_absolute_uri(url) if request else url} {entry['width']}w")
+            srcset[name] = ', '.join(urls)
+        return srcset
+
+
+class CompetenceTechnologiqueSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Sérialiseur pour le modèle CompetenceTechnologique."""
     # S'assure que l'URL complète du fichier est retournée dans l'API.
-    logo = serializers.FileField(use_url=True)
+    logo = CachedFileField(use_url=True)
+    logo_srcset = SrcsetField('logo', source='logo_variants')
 
     class Meta:
         model = CompetenceTechnologique
-        fields = ['id', 'nom', 'logo']
+        fields = ['id', 'nom', 'logo', 'logo_srcset']
 
-class WorkDoneSerializer(serializers.ModelSerializer):
+class WorkDoneSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Sérialiseur pour les tâches effectuées au sein d'un projet."""
     class Meta:
         model = WorkDone
         fields = ['id', 'subtitle', 'description']
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Sérialiseur pour le modèle Project, incluant ses relations."""
     # Imbrique les données complètes des technologies associées.
     technologies = CompetenceTechnologiqueSerializer(many=True, read_only=True)
@@ -44,29 +152,48 @@ class ProjectSerializer(serializers.ModelSerializer):
             'work_done'
         ]
 
-class PresentationSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Représentation compacte d'un projet pour les listes (cartes) : ni textes complets ni tâches."""
+    # Début de la description, tronqué en SQL (annotation de la vue) : le texte complet n'est pas chargé.
+    summary = serializers.SerializerMethodField()
+    technologies = CompetenceTechnologiqueSerializer(many=True, read_only=True, fields=('id', 'nom'))
+    work_done = WorkDoneSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Project
+        fields = ['id', 'title', 'video', 'summary', 'technologies', 'work_done']
+        # Disponible sur demande avec `?expand=work_done`.
+        expandable_fields = ['work_done']
+
+    def get_summary(self, obj):
+        summary = getattr(obj, 'summary', None)
+        return summary if summary is not None else obj.description[:PROJECT_SUMMARY_LENGTH]
+
+class PresentationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Sérialiseur pour le modèle Presentation."""
     # S'assure que l'URL complète de la photo est retournée.
     photo = serializers.FileField(use_url=True)
+    photo_srcset = SrcsetField('photo', source='photo_variants')
 
     class Meta:
         model = Presentation
-        fields = '__all__'
+        # `updated_at` ne sert qu'aux validateurs HTTP (ETag) : il ne fait pas partie de la représentation.
+        exclude = ['photo_variants', 'updated_at']
 
-class PosteCibleSerializer(serializers.ModelSerializer):
+class PosteCibleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Sérialiseur pour le modèle PosteCible."""
     class Meta:
         model = PosteCible
-        fields = '__all__'
+        exclude = ['updated_at']
 
-class DiplomeSerializer(serializers.ModelSerializer):
+class DiplomeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Sérialiseur pour le modèle Diplome."""
     class Meta:
         model = Diplome
-        fields = '__all__'
+        exclude = ['updated_at']
 
-class ParcoursSerializer(serializers.ModelSerializer):
+class ParcoursSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Sérialiseur pour le modèle Parcours."""
     class Meta:
         model = Parcours
-        fields = '__all__'
\ No newline at end of file
+        exclude = ['updated_at']
\ No newline at end of file
@@ -0,0 +1,108 @@
+# backend/api/signals.py
+
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, pre_save, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from .cache import bump_content_version, bump_model_version
+from .images import IMAGE_FIELDS, refresh_variants
+from .ingest import enqueue_ingest
+from .snapshot import schedule_snapshot_export
+from .models import (
+    Project,
+    Presentation,
+    PosteCible,
+    Diplome,
+    CompetenceTechnologique,
+    Parcours,
+    WorkDone,
+)
+
+# Modèles dont le contenu est exposé par l'API publique.
+CONTENT_MODELS = (Project, Presentation, PosteCible, Diplome, CompetenceTechnologique, Parcours, WorkDone)
+
+
+@receiver(pre_save, sender=Project)
+def detect_source_code_change(sender, instance, raw=False, **kwargs):
+    """Repère un ajout ou un remplacement de l'archive avant que le fichier ne soit enregistré."""
+    if raw:
+        return
+    zip_file = instance.source_code_zip
+    previous = sender.objects.filter(pk=instance.pk).values_list('source_code_zip', flat=True).first() if instance.pk else None
+    instance._source_code_changed = (
+        (bool(zip_file) and not zip_file._committed)
+        or (zip_file.name or '') != (previous or '')
+    )
+    if instance._source_code_changed:
+        # L'ancienne version n'est plus servie ; la nouvelle l'est une fois son manifeste construit.
+        instance.source_code_sha256 = ''
+
+
+@receiver(post_save, sender=Project)
+def enqueue_source_ingest(sender, instance, raw=False, **kwargs):
+    """Met en file l'ingestion (empreinte, manifeste, copie locale, index de recherche) d'une archive envoyée ou remplacée."""
+    if raw or not getattr(instance, '_source_code_changed', False):
+        return
+    instance._source_code_changed = False
+    enqueue_ingest(instance)
+
+
+def detect_image_change(sender, instance, raw=False, **kwargs):
+    """Repère un ajout, un remplacement ou un retrait d'image avant l'enregistrement du fichier."""
+    if raw:
+        return
+    field_name, _ = IMAGE_FIELDS[sender]
+    image = getattr(instance, field_name)
+    previous = sender.objects.filter(pk=instance.pk).values_list(field_name, flat=True).first() if instance.pk else None
+    instance._image_changed = (bool(image) and not image._committed) or (image.name or '') != (previous or '')
+
+
+def refresh_image_variants(sender, instance, raw=False, **kwargs):
+    """(Re)génère les variantes d'une image envoyée ou remplacée et supprime celles de l'ancienne."""
+    if raw or not getattr(instance, '_image_changed', False):
+        return
+    instance._image_changed = False
+    refresh_variants(instance)
+
+
+# Connectés avant l'invalidation des caches : les variantes sont en base quand les réponses sont recalculées.
+for model in IMAGE_FIELDS:
+    pre_save.connect(detect_image_change, sender=model, dispatch_uid=f'detect_image_change_{model.__name__}')
+    post_save.connect(refresh_image_variants, sender=model, dispatch_uid=f'refresh_image_variants_{model.__name__}')
+
+
+def content_changed(model):
+    """Invalide les réponses mises en cache qui dépendent de `model` et, si demandé, régénère l'export statique."""
+    bump_content_version()
+    bump_model_version(model)
+    if settings.API_SNAPSHOT_ON_SAVE:
+        schedule_snapshot_export()
+
+
+def invalidate_content(sender, **kwargs):
+    """Invalide les réponses mises en cache dès qu'un contenu publié change."""
+    content_changed(sender)
+
+
+def invalidate_project_technologies(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Les technologies d'un projet font partie de sa représentation : seules les réponses projets sont
+    invalidées, et la date de modification des projets concernés est mise à jour (ETag / Last-Modified).
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        projects = Project.objects.filter(pk=instance.pk)
+    elif pk_set:
+        projects = Project.objects.filter(pk__in=pk_set)
+    else:
+        # `post_clear` depuis une compétence : les projets liés ne sont plus connus.
+        projects = Project.objects.all()
+    projects.update(updated_at=timezone.now())
+    content_changed(Project)
+
+
+for model in CONTENT_MODELS:
+    post_save.connect(invalidate_content, sender=model, dispatch_uid=f'invalidate_content_save_{model.__name__}')
+    post_delete.connect(invalidate_content, sender=model, dispatch_uid=f'invalidate_content_delete_{model.__name__}')
+m2m_changed.connect(invalidate_project_technologies, sender=Project.technologies.through, dispatch_uid='invalidate_content_m2m')
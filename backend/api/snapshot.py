@@ -0,0 +1,139 @@
+# backend/api/snapshot.py
+
+import gzip
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.db import transaction
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from . import archive_cache
+from .models import Project
+
+try:
+    import brotli
+except ImportError:  # Les variantes .br ne sont produites que si le module brotli est installé.
+    brotli = None
+
+# Fichier désignant la version publiée de l'export (lu par `SnapshotWhiteNoiseMiddleware`).
+CURRENT_MARKER = 'CURRENT'
+API_PREFIX = '/api/'
+
+
+def snapshot_urls():
+    """URL de l'API publique à exporter : listes et détails de chaque ViewSet, arbres de code source, bootstrap."""
+    from .urls import router
+
+    urls = [reverse('bootstrap')]
+    for _, viewset, basename in router.registry:
+        urls.append(reverse(f'{basename}-list'))
+        for pk in viewset.queryset.model._default_manager.order_by('pk').values_list('pk', flat=True):
+            urls.append(reverse(f'{basename}-detail', args=[pk]))
+    # Archives pas encore ingérées : leur arbre sera exporté à la fin de l'ingestion.
+    ingested = Project.objects.exclude(source_code_zip='').exclude(source_code_zip=None).exclude(source_code_sha256='')
+    for pk in ingested.values_list('pk', flat=True):
+        urls.append(reverse('project-source-code-tree', args=[pk]))
+    return urls
+
+
+def snapshot_path(url):
+    """Chemin relatif du fichier d'une URL : `/api/projects/3/` → `projects/3.json`."""
+    return url[len(API_PREFIX):].strip('/') + '.json'
+
+
+def render_url(url, base_url):
+    """Exécute la vue d'une URL de l'API en processus (sans passer par HTTP) et retourne le JSON rendu."""
+    parts = urlsplit(base_url)
+    request = RequestFactory().get(
+        url, HTTP_ACCEPT='application/json', HTTP_HOST=parts.netloc, secure=parts.scheme == 'https',
+    )
+    match = resolve(url)
+    view = async_to_sync(match.func) if iscoroutinefunction(match.func) else match.func
+    response = view(request, *match.args, **match.kwargs)
+    response.render()
+    if response.status_code != 200:
+        raise ValueError(f"{url} : réponse {response.status_code}.")
+    return response.content
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    # Variantes précompressées, servies telles quelles par WhiteNoise et la plupart des hébergeurs statiques.
+    path.with_name(path.name + '.gz').write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        path.with_name(path.name + '.br').write_bytes(brotli.compress(content))
+
+
+def export_snapshot(output=None, base_url=None):
+    """
+    Rend toutes les réponses publiques de l'API dans des fichiers JSON précompressés ; retourne le nombre de fichiers.
+
+    Sans `output`, l'export est écrit dans un nouveau dossier versionné de `API_SNAPSHOT_ROOT`, puis
+    publié atomiquement en réécrivant le fichier `CURRENT` : les lecteurs ne voient jamais un export
+    partiel. Seule la version précédente est conservée (requêtes en cours). Avec `output`, les fichiers
+    sont écrits directement dans ce dossier (déploiement sur un hébergeur statique).
+    """
+    base_url = base_url or settings.API_SNAPSHOT_BASE_URL
+    urls = snapshot_urls()
+
+    if output is not None:
+        for url in urls:
+            _write(Path(output) / snapshot_path(url), render_url(url, base_url))
+        return len(urls)
+
+    root = Path(settings.API_SNAPSHOT_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    with archive_cache.file_lock(root / '.lock'):
+        version = f'{time.time_ns()}'
+        target = root / version
+        try:
+            for url in urls:
+                _write(target / snapshot_path(url), render_url(url, base_url))
+        except Exception:
+            shutil.rmtree(target, ignore_errors=True)
+            raise
+
+        previous = current_snapshot_dir()
+        fd, tmp_name = tempfile.mkstemp(dir=root, prefix=f'.{CURRENT_MARKER}-')
+        with os.fdopen(fd, 'w') as tmp:
+            tmp.write(version)
+        os.replace(tmp_name, root / CURRENT_MARKER)
+
+        for path in root.iterdir():
+            if path.is_dir() and path not in (target, previous):
+                shutil.rmtree(path, ignore_errors=True)
+    return len(urls)
+
+
+def current_snapshot_dir():
+    """Dossier de l'export publié, ou None si aucun export n'a encore été fait."""
+    root = Path(settings.API_SNAPSHOT_ROOT)
+    try:
+        version = (root / CURRENT_MARKER).read_text().strip()
+    except FileNotFoundError:
+        return None
+    return root / version if version else None
+
+
+def _export_on_commit():
+    export_snapshot()
+
+
+def schedule_snapshot_export():
+    """
+    Programme un export à la validation de la transaction courante (`API_SNAPSHOT_ON_SAVE`).
+
+    Un enregistrement dans l'administration modifie souvent plusieurs objets (projet, tâches,
+    technologies) dans une même transaction : un seul export est alors lancé. Une erreur d'export
+    est journalisée sans faire échouer l'enregistrement.
+    """
+    connection = transaction.get_connection()
+    if any(func is _export_on_commit for _, func, _ in connection.run_on_commit):
+        return
+    transaction.on_commit(_export_on_commit, robust=True)
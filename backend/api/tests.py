@@ -1,11 +1,79 @@
+import asyncio
+import hashlib
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+import zipfile
+from unittest import mock, skipUnless
+from pathlib import Path
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.http import Http404
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from PIL import Image
+from pygments import highlight as pygments_highlight
 from rest_framework import status
-from rest_framework.test import APITestCase
-from .models import Project, ContactMessage
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+from . import async_views, ingest
+from .admin import INLINE_MAX_ROWS
+from .archive import clear_archive_index_cache
+from .archive_cache import get_stats, materialize_archive, trim
+from .cache import get_model_versions, get_response_cache, get_response_cache_stats, reset_response_cache_stats
+from .media import serve_media
+from .metrics import registry as metrics_registry
+from .models import CompetenceTechnologique, Diplome, IngestJob, Parcours, PosteCible, Presentation, Project, SourceManifest, WorkDone
+from .renderers import ORJSONParser, ORJSONRenderer
+from .search import get_search_index_path, required_literals
+from .snapshot import current_snapshot_dir
+from .serializers import ProjectSerializer
+
+
+# Les caches des réponses et de la coloration sont partagés sur disque par défaut : les tests utilisent
+# des caches en mémoire, pour ne jamais relire des entrées laissées par une exécution précédente.
+_test_caches = override_settings(CACHES={
+    **settings.CACHES,
+    settings.API_RESPONSE_CACHE: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-api-responses'},
+    settings.SOURCE_HIGHLIGHT_CACHE: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-highlight'},
+})
+
+
+def setUpModule():
+    _test_caches.enable()
+
+
+def tearDownModule():
+    _test_caches.disable()
+
 
 class ApiTests(APITestCase):
 
     def setUp(self):
+        # La migration 0004 insère des projets de démonstration.
+        Project.objects.all().delete()
         Project.objects.create(title="Test Project 1", description="A description.")
         Project.objects.create(title="Test Project 2", description="Another description.")
 
@@ -16,26 +84,1458 @@ class ApiTests(APITestCase):
         self.assertEqual(len(response.data), 2)
         self.assertEqual(response.data[0]['title'], 'Test Project 1')
 
-    def test_create_contact_message(self):
-        url = reverse('contact-list')
-        data = {
-            'name': 'Test User',
-            'email': 'test@example.com',
-            'message': 'This is a test message.'
+
+class ProjectQueryBudgetTests(APITestCase):
+
+    def setUp(self):
+        Project.objects.all().delete()
+
+    def create_projects(self, count, technologies, work_done):
+        competences = [CompetenceTechnologique.objects.create(nom=f"Techno {i}") for i in range(technologies)]
+        for i in range(count):
+            project = Project.objects.create(title=f"Projet {i}", description="Description.")
+            project.technologies.set(competences)
+            WorkDone.objects.bulk_create(
+                WorkDone(project=project, subtitle=f"Tâche {j}", description="Détail.") for j in range(work_done)
+            )
+        return project
+
+    def test_project_list_query_budget_is_flat(self):
+        # État des modèles (ETag), projets et technologies (M2M) : trois requêtes quel que soit le volume.
+        self.create_projects(2, technologies=1, work_done=1)
+        with self.assertNumQueries(3):
+            self.client.get(reverse('project-list'))
+
+        self.create_projects(20, technologies=5, work_done=4)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('project-list'))
+        self.assertEqual(len(response.data), 22)
+        self.assertEqual(len(response.data[-1]['technologies']), 5)
+
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('project-list'), {'expand': 'work_done'})
+        self.assertEqual(len(response.data[-1]['work_done']), 4)
+
+    def test_shared_logo_url_built_once_per_response(self):
+        self.create_projects(5, technologies=1, work_done=0)
+        CompetenceTechnologique.objects.update(logo='competences_logos/python.svg')
+        with mock.patch.object(FileSystemStorage, 'url', return_value='/media/python.svg') as url:
+            data = ProjectSerializer(Project.objects.prefetch_related('technologies'), many=True).data
+        self.assertEqual(url.call_count, 1)
+        self.assertEqual(data[0]['technologies'][0]['logo'], '/media/python.svg')
+
+    def test_project_detail_query_budget_is_flat(self):
+        project = self.create_projects(1, technologies=10, work_done=10)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('project-detail', args=[project.pk]))
+        self.assertEqual(len(response.data['technologies']), 10)
+
+
+class SparseFieldsetTests(APITestCase):
+
+    def setUp(self):
+        Project.objects.all().delete()
+        python = CompetenceTechnologique.objects.create(nom="Python", logo='competences_logos/python.svg')
+        self.project = Project.objects.create(title="Projet", description="D" * 500, tasks_effectuees="Tâches")
+        self.project.technologies.add(python)
+        WorkDone.objects.create(project=self.project, subtitle="Tâche", description="Détail.")
+
+    def test_project_list_is_compact(self):
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.data, [{
+            'id': self.project.pk, 'title': "Projet", 'video': None, 'summary': "D" * 160,
+            'technologies': [{'id': self.project.technologies.get().pk, 'nom': "Python"}],
+        }])
+
+    def test_project_detail_is_complete(self):
+        response = self.client.get(reverse('project-detail', args=[self.project.pk]))
+        self.assertEqual(response.data['description'], "D" * 500)
+        self.assertEqual(response.data['tasks_effectuees'], "Tâches")
+        self.assertEqual(len(response.data['work_done']), 1)
+
+    def test_fields_narrow_json_and_sql(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('project-detail', args=[self.project.pk]), {'fields': 'id,title'})
+        self.assertEqual(response.data, {'id': self.project.pk, 'title': "Projet"})
+        # La première requête est celle de l'état des modèles (ETag).
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('description', queries[1]['sql'])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('competence-list'), {'fields': 'nom'})
+        self.assertEqual(response.data, [{'nom': "Python"}])
+        self.assertNotIn('logo', queries[1]['sql'])
+
+    def test_expand_work_done_loads_only_serialized_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('project-list'), {'fields': 'id,work_done', 'expand': 'work_done'})
+        self.assertEqual(response.data, [{
+            'id': self.project.pk, 'work_done': [{'id': self.project.work_done.get().pk, 'subtitle': "Tâche", 'description': "Détail."}],
+        }])
+        self.assertEqual(len(queries), 3)
+
+
+class BootstrapTests(APITestCase):
+
+    def setUp(self):
+        get_response_cache().clear()
+        Project.objects.all().delete()
+        python = CompetenceTechnologique.objects.create(nom="Python")
+        for i in range(3):
+            project = Project.objects.create(title=f"Projet {i}", description="Description.")
+            project.technologies.add(python)
+            WorkDone.objects.create(project=project, subtitle="Tâche", description="Détail.")
+        Presentation.objects.create(texte="Bonjour")
+        Parcours.objects.create(poste="Développeur", description="Backend", periode="2024")
+
+    def test_bootstrap_returns_all_startup_data(self):
+        response = self.client.get(reverse('bootstrap'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(response.data),
+            ['competences', 'diplomes', 'parcours', 'postes', 'presentation', 'projects'],
+        )
+        self.assertEqual(response.data['presentation']['texte'], "Bonjour")
+        self.assertEqual(len(response.data['projects']), 3)
+        self.assertEqual(response.data['projects'][0]['technologies'][0]['nom'], "Python")
+
+    def test_bootstrap_query_count_is_constant_and_cached(self):
+        # Projets (+ technologies préchargées), parcours, présentation, postes, diplômes, compétences.
+        with self.assertNumQueries(7):
+            self.client.get(reverse('bootstrap'))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('bootstrap'))
+
+    def test_bootstrap_cache_invalidated_on_change(self):
+        self.client.get(reverse('bootstrap'))
+        Presentation.objects.update(texte="ignoré")  # Pas de signal : la réponse en cache reste servie.
+        self.assertEqual(self.client.get(reverse('bootstrap')).data['presentation']['texte'], "Bonjour")
+
+        presentation = Presentation.objects.get()
+        presentation.texte = "Nouveau texte"
+        presentation.save()
+        self.assertEqual(self.client.get(reverse('bootstrap')).data['presentation']['texte'], "Nouveau texte")
+
+        Project.objects.first().technologies.clear()
+        projects = self.client.get(reverse('bootstrap')).data['projects']
+        self.assertEqual(projects[0]['technologies'], [])
+
+
+class ResponseCacheTests(APITestCase):
+
+    def setUp(self):
+        get_response_cache().clear()
+        reset_response_cache_stats()
+        Project.objects.all().delete()
+        self.python = CompetenceTechnologique.objects.create(nom="Python")
+        self.project = Project.objects.create(title="Projet", description="Description.")
+        self.project.technologies.add(self.python)
+        self.work = WorkDone.objects.create(project=self.project, subtitle="Tâche", description="Détail.")
+        self.detail_url = reverse('project-detail', args=[self.project.pk])
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(reverse('project-list'))
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('project-list'))
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+        # Des paramètres différents donnent une autre entrée.
+        self.assertEqual(self.client.get(reverse('project-list'), {'fields': 'id'})['X-Cache'], 'MISS')
+        self.assertEqual(get_response_cache_stats(), {'hits': 1, 'misses': 2})
+
+    def test_invalidation_is_limited_to_dependent_models(self):
+        self.client.get(self.detail_url)
+        self.client.get(reverse('presentation-list'))
+
+        Presentation.objects.create(texte="Bonjour")
+        self.assertEqual(self.client.get(self.detail_url)['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(reverse('presentation-list'))['X-Cache'], 'MISS')
+
+        self.work.subtitle = "Nouvelle tâche"
+        self.work.save()
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['work_done'][0]['subtitle'], "Nouvelle tâche")
+
+    def test_m2m_and_delete_invalidate(self):
+        self.client.get(self.detail_url)
+        self.project.technologies.clear()
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['technologies'], [])
+
+        self.client.get(reverse('competence-list'))
+        self.python.delete()
+        response = self.client.get(reverse('competence-list'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data, [])
+
+    def test_errors_are_not_cached(self):
+        url = reverse('project-detail', args=[self.project.pk + 1])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(get_response_cache_stats()['hits'], 0)
+
+    def test_invalidation_reaches_other_processes(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}
+        with override_settings(CACHES={**settings.CACHES, settings.API_RESPONSE_CACHE: shared}):
+            before = get_model_versions([Diplome])
+            Diplome.objects.create(titre="Master", institution="Université")
+            # Un autre worker (ou une commande) relit le même répertoire avec son propre backend.
+            other = FileBasedCache(location, {})
+            self.assertNotEqual(other.get('api:model-version:api.diplome'), before[0])
+
+    def test_counters_are_kept_in_process_and_exposed_as_metrics(self):
+        self.client.get(reverse('project-list'))
+        self.client.get(reverse('project-list'))
+        self.assertEqual(get_response_cache_stats(), {'hits': 1, 'misses': 1})
+        # Les compteurs ne sont pas écrits dans le cache partagé.
+        self.assertIsNone(get_response_cache().get('api:response-cache:hits'))
+
+        staff = User.objects.create_user('staff', password='motdepasse', is_staff=True)
+        self.client.force_login(staff)
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('api_response_cache_hits_total 1\n', body)
+        self.assertIn('api_response_cache_misses_total 1\n', body)
+
+    def test_management_command_clears_the_cache(self):
+        self.client.get(reverse('project-list'))
+        call_command('api_cache', '--clear', stdout=io.StringIO())
+        self.assertEqual(self.client.get(reverse('project-list'))['X-Cache'], 'MISS')
+
+
+class ConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        get_response_cache().clear()
+        Project.objects.all().delete()
+        self.python = CompetenceTechnologique.objects.create(nom="Python")
+        self.project = Project.objects.create(title="Projet", description="Description.")
+        self.url = reverse('project-detail', args=[self.project.pk])
+
+    def test_responses_carry_validators(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+        # Une réponse servie depuis le cache garde les mêmes validateurs.
+        cached = self.client.get(self.url)
+        self.assertEqual(cached['X-Cache'], 'HIT')
+        self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertEqual(cached['Last-Modified'], response['Last-Modified'])
+
+    def test_not_modified_skips_serializer(self):
+        etag = self.client.get(self.url)['ETag']
+        get_response_cache().clear()
+        with mock.patch.object(ProjectSerializer, 'to_representation') as to_representation:
+            with self.assertNumQueries(1):
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        to_representation.assert_not_called()
+
+        last_modified = self.client.get(reverse('project-list'))['Last-Modified']
+        response = self.client.get(reverse('project-list'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_last_modified_moves_forward_on_delete(self):
+        url = reverse('diplome-list')
+        Diplome.objects.create(titre="Licence", institution="Université")
+        recent = Diplome.objects.create(titre="Master", institution="Université")
+        last_modified = self.client.get(url)['Last-Modified']
+        # La date maximale en base recule : Last-Modified, dérivé des versions, avance malgré tout.
+        with mock.patch('api.cache.time.time_ns', return_value=time.time_ns() + 2 * 10**9):
+            recent.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([diplome['titre'] for diplome in response.data], ["Licence"])
+
+    def test_updated_at_is_not_serialized(self):
+        Presentation.objects.create(texte="Bonjour")
+        PosteCible.objects.create(nom="Développeur")
+        Diplome.objects.create(titre="Master", institution="Université")
+        Parcours.objects.create(poste="Stagiaire", description="Stage.", periode="2024")
+        for name in ('presentation-list', 'poste-list', 'diplome-list', 'parcours-list'):
+            response = self.client.get(reverse(name))
+            rows = response.data['results'] if isinstance(response.data, dict) else response.data
+            self.assertTrue(rows, name)
+            self.assertNotIn('updated_at', rows[0], name)
+
+    def test_etag_changes_with_dependent_content(self):
+        etag = self.client.get(self.url)['ETag']
+        self.project.technologies.add(self.python)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        WorkDone.objects.create(project=self.project, subtitle="Tâche", description="Détail.")
+        self.assertNotEqual(self.client.get(self.url)['ETag'], etag)
+
+        # Les suppressions changent aussi l'ETag, même sans nouvelle date de modification.
+        etag = self.client.get(reverse('competence-list'))['ETag']
+        CompetenceTechnologique.objects.create(nom="Django").delete()
+        self.assertEqual(self.client.get(reverse('competence-list'))['ETag'], etag)
+        self.python.delete()
+        self.assertNotEqual(self.client.get(reverse('competence-list'))['ETag'], etag)
+
+
+class PaginationTests(APITestCase):
+
+    def setUp(self):
+        get_response_cache().clear()
+        Project.objects.all().delete()
+        self.projects = [Project.objects.create(title=f"Projet {i}", description="Description.") for i in range(5)]
+
+    def collect_pages(self, url, params):
+        titles, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            pages += 1
+            titles += [item.get('title') or item.get('poste') for item in response.data['results']]
+            if not response.data['next']:
+                return titles, pages
+            response = self.client.get(response.data['next'])
+
+    def test_list_is_unpaginated_without_parameters(self):
+        response = self.client.get(reverse('project-list'))
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+
+    def test_cursor_pages_follow_primary_key(self):
+        titles, pages = self.collect_pages(reverse('project-list'), {'page_size': 2})
+        self.assertEqual(titles, [f"Projet {i}" for i in range(5)])
+        self.assertEqual(pages, 3)
+
+        # Une suppression entre deux pages ne décale pas la page suivante (pas d'OFFSET).
+        first = self.client.get(reverse('project-list'), {'page_size': 2})
+        Project.objects.filter(pk=self.projects[0].pk).delete()
+        second = self.client.get(first.data['next'])
+        self.assertEqual([item['title'] for item in second.data['results']], ["Projet 2", "Projet 3"])
+
+    def test_page_size_is_capped(self):
+        CompetenceTechnologique.objects.bulk_create(CompetenceTechnologique(nom=f"Tech {i}") for i in range(110))
+        response = self.client.get(reverse('competence-list'), {'page_size': 1000})
+        self.assertEqual(len(response.data['results']), 100)
+        self.assertIsNotNone(response.data['next'])
+        with override_settings(API_MAX_PAGE_SIZE=3):
+            response = self.client.get(reverse('competence-list'), {'page_size': 999})
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_parcours_pages_keep_model_ordering(self):
+        for periode in ("2021", "2023", "2022"):
+            Parcours.objects.create(poste=periode, description="Poste", periode=periode)
+        # Périodes identiques : l'identifiant départage, sans doublon ni oubli d'une page à l'autre.
+        for poste in ("2022 b", "2022 c"):
+            Parcours.objects.create(poste=poste, description="Poste", periode="2022")
+        titles, _ = self.collect_pages(reverse('parcours-list'), {'page_size': 2})
+        self.assertEqual(titles, ["2023", "2022 c", "2022 b", "2022", "2021"])
+
+    @override_settings(API_PAGINATION_COMPAT=False)
+    def test_lists_are_paginated_without_compatibility(self):
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNone(response.data['next'])
+
+
+class RendererTests(APITestCase):
+
+    def test_orjson_output_matches_drf_renderer(self):
+        data = ReturnList([ReturnDict({
+            'nom': gettext_lazy("Compétence"), 'note': Decimal('4.50'), 'ligne': "a\u2028b", 1: None,
+        }, serializer=None)], serializer=None)
+        rendered = ORJSONRenderer().render(data)
+        self.assertEqual(rendered, JSONRenderer().render(data))
+        self.assertIn(b'\\u2028', rendered)
+
+        with mock.patch('api.renderers.orjson', None):
+            self.assertEqual(ORJSONRenderer().render(data), rendered)
+
+    def test_api_uses_orjson_renderer_and_parser(self):
+        response = self.client.get(reverse('project-list'))
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO('{"a": [1, "é"]}'.encode())), {'a': [1, "é"]},
+        )
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"a":'))
+
+
+class PerformanceMetricsTests(APITestCase):
+
+    def setUp(self):
+        Project.objects.all().delete()
+        technology = CompetenceTechnologique.objects.create(nom="Python")
+        for i in range(3):
+            project = Project.objects.create(title=f"Projet {i}", description="Description.")
+            project.technologies.add(technology)
+        get_response_cache().clear()
+        metrics_registry.reset()
+
+    @override_settings(PERF_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('project-list'))
+        timings = dict(part.split(';', 1) for part in response['Server-Timing'].split(', '))
+        self.assertEqual(list(timings), ['db', 'serialize', 'render', 'view', 'total'])
+        self.assertRegex(timings['db'], r'^dur=[\d.]+;desc="\d+ requêtes"$')
+
+        with override_settings(PERF_SERVER_TIMING=False):
+            self.assertFalse(self.client.get(reverse('project-list')).has_header('Server-Timing'))
+
+    def test_slow_requests_are_logged(self):
+        with override_settings(PERF_SLOW_REQUEST_MS=0), self.assertLogs('api.middleware', 'WARNING') as logs:
+            self.client.get(reverse('project-list'))
+        self.assertIn('GET /api/projects/ (200)', logs.output[0])
+
+    @override_settings(API_METRICS_TOKEN='secret')
+    def test_metrics_endpoint(self):
+        url = reverse('metrics')
+        self.client.get(reverse('project-list'))
+        self.client.get(reverse('project-list'))
+        self.client.get('/api/inexistant/')
+
+        self.assertIn(self.client.get(url).status_code, (401, 403))
+        self.assertIn(self.client.get(url, HTTP_AUTHORIZATION='Bearer faux').status_code, (401, 403))
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        labels = 'endpoint="project-list",method="GET",status="2xx"'
+        self.assertIn(f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', body)
+        self.assertIn(f'api_request_duration_seconds_count{{{labels}}} 2', body)
+        self.assertIn('endpoint="<unmatched>",method="GET",status="4xx"', body)
+        self.assertRegex(body, rf'api_db_queries_total{{{labels}}} [1-9]\d*')
+
+        staff = User.objects.create_user('staff', password='motdepasse', is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+
+class SnapshotTests(APITestCase):
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        override = override_settings(API_SNAPSHOT_ROOT=self.root, API_SNAPSHOT_BASE_URL='http://testserver')
+        override.enable()
+        self.addCleanup(override.disable)
+        Project.objects.all().delete()
+        self.project = Project.objects.create(title="Projet", description="Description. " * 100)
+        Parcours.objects.create(poste="Développeur", description="Backend", periode="2024")
+
+    def test_export_writes_every_public_response(self):
+        out = io.StringIO()
+        call_command('export_api_snapshot', stdout=out)
+        directory = current_snapshot_dir()
+        self.assertIn(str(directory), out.getvalue())
+
+        listing = (directory / 'projects.json').read_bytes()
+        self.assertEqual(json.loads(listing), self.client.get(reverse('project-list')).json())
+        self.assertEqual(gzip.decompress((directory / 'projects.json.gz').read_bytes()), listing)
+        detail = json.loads((directory / f'projects/{self.project.pk}.json').read_text())
+        self.assertEqual(detail['title'], "Projet")
+        self.assertTrue((directory / 'bootstrap.json').exists())
+        self.assertTrue((directory / 'parcours.json').exists())
+        # Sans archive, pas d'arbre de code source.
+        self.assertFalse((directory / f'projects/{self.project.pk}/source-code-tree.json').exists())
+
+    def test_snapshot_served_without_touching_django(self):
+        call_command('export_api_snapshot', stdout=io.StringIO())
+        url = f'/api-snapshot/projects/{self.project.pk}.json'
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # La variante compressée n'est servie que si elle est plus petite que l'original.
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(b''.join(response.streaming_content)))['title'], "Projet")
+
+        # Un nouvel export est publié sans redémarrage ; seule la version précédente est conservée.
+        first = current_snapshot_dir()
+        self.project.title = "Renommé"
+        self.project.save()
+        call_command('export_api_snapshot', stdout=io.StringIO())
+        call_command('export_api_snapshot', stdout=io.StringIO())
+        response = self.client.get('/api-snapshot/projects.json')
+        self.assertEqual(json.loads(b''.join(response.streaming_content))[0]['title'], "Renommé")
+        self.assertFalse(first.exists())
+        self.assertEqual(len([path for path in Path(self.root).iterdir() if path.is_dir()]), 2)
+
+    def test_export_on_save_runs_once_per_transaction(self):
+        with override_settings(API_SNAPSHOT_ON_SAVE=True):
+            with mock.patch('api.snapshot.export_snapshot') as export:
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.project.title = "Nouveau"
+                    self.project.save()
+                    WorkDone.objects.create(project=self.project, subtitle="Tâche", description="Détail.")
+        export.assert_called_once_with()
+
+
+def make_png(width, height, mode='RGBA'):
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), (200, 40, 40, 255)[:len(mode)]).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class ImageVariantTests(APITestCase):
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def create_competence(self, name, content):
+        competence = CompetenceTechnologique(nom="Python")
+        competence.logo.save(name, ContentFile(content), save=False)
+        competence.save()
+        return competence
+
+    def test_variants_generated_on_upload(self):
+        competence = self.create_competence('python.png', make_png(300, 150))
+        self.assertEqual(sorted(competence.logo_variants), ['avif', 'webp'])
+        webp = competence.logo_variants['webp']
+        self.assertEqual([entry['width'] for entry in webp], [48, 96, 192])
+        self.assertEqual(webp[0]['name'], 'competences_logos/python_48w.webp')
+        with Image.open(Path(self.media_root) / webp[1]['name']) as variant:
+            self.assertEqual((variant.format, variant.size), ('WEBP', (96, 48)))
+
+        data = self.client.get(reverse('competence-detail', args=[competence.pk])).data
+        self.assertEqual(data['logo_srcset']['webp'].split(', ')[0], 'http://testserver/media/competences_logos/python_48w.webp 48w')
+        self.assertIn('python_192w.avif 192w', data['logo_srcset']['avif'])
+
+    def test_svg_and_small_images(self):
+        svg = self.create_competence('react.svg', b'<svg xmlns="http://www.w3.org/2000/svg"/>')
+        self.assertEqual(svg.logo_variants, {})
+        self.assertEqual(self.client.get(reverse('competence-detail', args=[svg.pk])).data['logo_srcset'], {})
+
+        # Jamais d'agrandissement : une image plus petite que toutes les largeurs est seulement réencodée.
+        small = self.create_competence('tiny.png', make_png(30, 30, 'RGB'))
+        self.assertEqual([entry['width'] for entry in small.logo_variants['webp']], [30])
+
+    def test_replacing_image_replaces_variants(self):
+        competence = self.create_competence('python.png', make_png(300, 150))
+        old = [entry['name'] for entries in competence.logo_variants.values() for entry in entries]
+        competence.logo.save('python2.png', ContentFile(make_png(120, 120)), save=True)
+        competence.refresh_from_db()
+        self.assertEqual([entry['width'] for entry in competence.logo_variants['webp']], [48, 96, 120])
+        self.assertFalse(any((Path(self.media_root) / name).exists() for name in old))
+
+        # Un enregistrement sans changement d'image ne régénère rien.
+        with mock.patch('api.images.generate_variants') as generate:
+            competence.nom = "Python 3"
+            competence.save()
+        generate.assert_not_called()
+
+    def test_presentation_photo_srcset_and_backfill(self):
+        presentation = Presentation.objects.create(texte="Bonjour")
+        Presentation.objects.filter(pk=presentation.pk).update(photo='photos/moi.png')
+        (Path(self.media_root) / 'photos').mkdir()
+        (Path(self.media_root) / 'photos' / 'moi.png').write_bytes(make_png(800, 800, 'RGB'))
+
+        out = io.StringIO()
+        call_command('generate_image_variants', stdout=out)
+        self.assertIn("1 image(s)", out.getvalue())
+        data = self.client.get(reverse('presentation-detail', args=[presentation.pk])).data
+        self.assertNotIn('photo_variants', data)
+        self.assertIn('moi_400w.webp 400w', data['photo_srcset']['webp'])
+
+
+class MediaRangeTests(APITestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.content = bytes(range(256)) * 4000  # ~1 Mo
+        (Path(self.media_root) / 'project_videos').mkdir()
+        (Path(self.media_root) / 'project_videos' / 'demo.mp4').write_bytes(self.content)
+        self.factory = RequestFactory()
+
+    def get(self, path='project_videos/demo.mp4', method='get', **headers):
+        return serve_media(getattr(self.factory, method)(f'/media/{path}', **headers), path)
+
+    def test_private_files_are_not_served(self):
+        root = Path(self.media_root)
+        (root / '.env').write_text("SECRET_KEY=x")
+        (root / 'zip_cache' / '.locks').mkdir(parents=True)
+        (root / 'zip_cache' / 'stats.json').write_text("{}")
+        for path in ('.env', 'zip_cache/stats.json', 'zip_cache/.locks', '../core/settings.py'):
+            with self.subTest(path=path), self.assertRaises(Http404):
+                self.get(path)
+
+    def test_empty_media_root_is_refused(self):
+        with override_settings(MEDIA_ROOT=''), self.assertRaises(ImproperlyConfigured):
+            self.get('core/settings.py')
+
+    def test_full_file(self):
+        response = self.get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertEqual(int(response['Content-Length']), len(self.content))
+
+    def test_partial_content(self):
+        size = len(self.content)
+        for header, (start, end) in [
+            ('bytes=100-199', (100, 199)),
+            ('bytes=1000000-', (1000000, size - 1)),
+            ('bytes=-500', (size - 500, size - 1)),
+            ('bytes=10-99999999', (10, size - 1)),
+        ]:
+            response = self.get(HTTP_RANGE=header)
+            self.assertEqual(response.status_code, 206, header)
+            self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/{size}')
+            self.assertEqual(b''.join(response.streaming_content), self.content[start:end + 1])
+
+        response = self.get(HTTP_RANGE=f'bytes={size}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{size}')
+        # Plusieurs intervalles : le fichier entier est servi.
+        self.assertEqual(self.get(HTTP_RANGE='bytes=0-1,5-6').status_code, status.HTTP_200_OK)
+
+    def test_conditional_requests(self):
+        response = self.get(method='head')
+        self.assertEqual(response.content, b'')
+        etag = response['ETag']
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.get(HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+        # If-Range périmé : le fichier entier plutôt qu'un morceau d'une autre version.
+        self.assertEqual(self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag).status_code, 206)
+        self.assertEqual(self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"ancien"').status_code, 200)
+
+    def test_paths_outside_media_root_are_refused(self):
+        for path in ('../secret.txt', 'project_videos', 'absent.mp4'):
+            with self.assertRaises(Http404):
+                self.get(path)
+
+
+def make_zip(files, compression=zipfile.ZIP_DEFLATED):
+    """Construit une archive ZIP en mémoire à partir d'un dictionnaire {chemin: contenu}."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression) as zip_ref:
+        for name, content in files.items():
+            zip_ref.writestr(name, content)
+    return buffer.getvalue()
+
+
+class SourceCodeTests(APITestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root, SOURCE_INGEST_EAGER=True, CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+            'source_highlight': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'highlight'},
+            'api_responses': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'responses'},
+        })
+        override.enable()
+        self.addCleanup(override.disable)
+        clear_archive_index_cache()
+        # Le cache en mémoire survit d'un test à l'autre : chaque test part d'un cache vide.
+        caches[settings.SOURCE_HIGHLIGHT_CACHE].clear()
+
+        self.project = Project.objects.create(title="Projet", description="Code.")
+        self.project.source_code_zip.save('source.zip', ContentFile(make_zip({
+            'README.md': '# Projet\n',
+            'src/main.py': 'print("bonjour")\n' * 50,
+            'src/utils/helpers.py': 'def aide():\n    return 42\n',
+            'src/.DS_Store': b'\x00\x01',
+        })))
+
+    def test_source_code_tree(self):
+        url = reverse('project-source-code-tree', args=[self.project.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([node['name'] for node in response.data], ['src', 'README.md'])
+        src = response.data[0]
+        self.assertEqual([node['path'] for node in src['children']], ['src/utils', 'src/main.py'])
+        self.assertEqual(src['children'][0]['children'][0]['path'], 'src/utils/helpers.py')
+
+    def test_source_code_file(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        response = self.client.get(url, {'path': 'src/main.py'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['content'], 'print("bonjour")\n' * 50)
+
+    def test_source_code_file_is_not_extracted(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        self.client.get(url, {'path': 'README.md'})
+        # Seuls l'index de recherche (construit à l'ingestion) et les verrous sont dans le cache.
+        cache_root = Path(self.media_root) / 'zip_cache'
+        self.assertEqual(sorted(path.name for path in cache_root.iterdir()), ['.locks', 'search'])
+
+    def test_source_code_file_stored_member(self):
+        self.project.source_code_zip.save('stored.zip', ContentFile(make_zip(
+            {'a.txt': 'contenu brut'}, compression=zipfile.ZIP_STORED,
+        )))
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        response = self.client.get(url, {'path': 'a.txt'})
+        self.assertEqual(response.data['content'], 'contenu brut')
+
+    def test_source_code_file_rejects_unknown_paths(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        for path in ('../settings.py', 'src/absent.py', 'src/.DS_Store'):
+            response = self.client.get(url, {'path': path})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_source_code_file_requires_path(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_source_code_file_raw_streams_bytes(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        response = self.client.get(url, {'path': 'src/main.py', 'raw': '1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        self.assertEqual(response['Content-Length'], '850')
+        self.assertEqual(b''.join(response.streaming_content), b'print("bonjour")\n' * 50)
+
+    def test_source_code_file_raw_binary_content_type(self):
+        self.project.source_code_zip.save('images.zip', ContentFile(make_zip({
+            'logo.png': b'\x89PNG\x00\x00data', 'page.svg': '<svg/>', 'data.bin': b'\x00\x01',
+        })))
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        content_types = {
+            path: self.client.get(url, {'path': path, 'raw': '1'})['Content-Type']
+            for path in ('logo.png', 'page.svg', 'data.bin')
         }
-        response = self.client.post(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(ContactMessage.objects.count(), 1)
-        self.assertEqual(ContactMessage.objects.get().name, 'Test User')
+        self.assertEqual(content_types, {
+            'logo.png': 'image/png', 'page.svg': 'text/plain; charset=utf-8', 'data.bin': 'application/octet-stream',
+        })
+
+    def test_source_code_file_etag_not_modified(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        for params in ({'path': 'README.md'}, {'path': 'README.md', 'raw': '1'}):
+            response = self.client.get(url, params)
+            etag = response['ETag']
+            with mock.patch('api.views.get_archive_index') as get_index:
+                cached = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+            get_index.assert_not_called()
+            self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(cached['ETag'], etag)
+
+    def test_source_code_file_etag_changes_with_archive_and_mode(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        json_etag = self.client.get(url, {'path': 'README.md'})['ETag']
+        raw_etag = self.client.get(url, {'path': 'README.md', 'raw': '1'})['ETag']
+        self.assertNotEqual(json_etag, raw_etag)
+
+        self.project.source_code_zip.save('v2.zip', ContentFile(make_zip({'README.md': '# v2\n'})))
+        response = self.client.get(url, {'path': 'README.md', 'raw': '1'}, HTTP_IF_NONE_MATCH=raw_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], raw_etag)
+
+    def test_source_code_files_batch(self):
+        url = reverse('project-source-code-files', args=[self.project.pk])
+        response = self.client.get(url, {'path': ['README.md', 'src/utils/helpers.py', 'absent.py']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        payload = json.loads(response.content)
+        self.assertEqual(payload['files'], {
+            'README.md': '# Projet\n', 'src/utils/helpers.py': 'def aide():\n    return 42\n',
+        })
+        self.assertEqual(payload['missing'], ['absent.py'])
+        self.assertFalse(payload['truncated'])
+
+    def test_source_code_files_bundle_is_gzipped(self):
+        url = reverse('project-source-code-files', args=[self.project.pk])
+        response = self.client.get(url, {'bundle': '1', 'prefix': 'src/'}, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        payload = json.loads(gzip.decompress(response.content))
+        self.assertEqual(sorted(payload['files']), ['src/main.py', 'src/utils/helpers.py'])
+
+        cached = self.client.get(url, {'bundle': '1', 'prefix': 'src/'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_source_code_files_bundle_respects_size_limits(self):
+        url = reverse('project-source-code-files', args=[self.project.pk])
+        payload = json.loads(self.client.get(url, {'bundle': '1', 'max_size': '100'}).content)
+        self.assertEqual(sorted(payload['files']), ['README.md', 'src/utils/helpers.py'])
+
+        with override_settings(SOURCE_BUNDLE_MAX_BYTES=855):
+            payload = json.loads(self.client.get(url, {'bundle': '1'}).content)
+        self.assertEqual(sorted(payload['files']), ['README.md'])
+        self.assertTrue(payload['truncated'])
+
+    def test_source_code_files_requires_paths(self):
+        url = reverse('project-source-code-files', args=[self.project.pk])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        with override_settings(SOURCE_BATCH_MAX_FILES=1):
+            response = self.client.get(url, {'path': ['README.md', 'src/main.py']})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_source_code_tree_directories_have_child_counts(self):
+        url = reverse('project-source-code-tree', args=[self.project.pk])
+        src = self.client.get(url).data[0]
+        self.assertEqual(src['child_count'], 2)
+        self.assertEqual(src['children'][0]['child_count'], 1)
+
+    def test_source_code_tree_does_not_load_the_file_index(self):
+        url = reverse('project-source-code-tree', args=[self.project.pk])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        manifest_queries = [query['sql'] for query in queries if 'api_sourcemanifest' in query['sql']]
+        self.assertEqual(len(manifest_queries), 1)
+        self.assertNotIn('"files"', manifest_queries[0])
+
+    def test_source_code_tree_lazy_listing(self):
+        url = reverse('project-source-code-tree', args=[self.project.pk])
+        response = self.client.get(url, {'depth': '1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0], {'name': 'src', 'path': 'src', 'type': 'directory', 'child_count': 2})
+
+        response = self.client.get(url, {'path': 'src', 'depth': '1'})
+        self.assertEqual([node['path'] for node in response.data], ['src/utils', 'src/main.py'])
+        self.assertNotIn('children', response.data[0])
+
+        response = self.client.get(url, {'path': 'src/', 'depth': '2'})
+        self.assertEqual(response.data[0]['children'][0]['path'], 'src/utils/helpers.py')
+
+    def test_source_code_tree_lazy_listing_errors(self):
+        url = reverse('project-source-code-tree', args=[self.project.pk])
+        self.assertEqual(self.client.get(url, {'path': 'sr'}).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(url, {'depth': '0'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'depth': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_source_code_tree_lazy_listing_without_manifest_is_not_ready(self):
+        url = reverse('project-source-code-tree', args=[self.project.pk])
+        self.client.get(url)
+        SourceManifest.objects.all().delete()
+        for path in ('', 'src'):
+            response = self.client.get(url, {'path': path, 'depth': '1'})
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE, path)
+
+    def test_source_code_tree_lazy_listing_reads_only_requested_directories(self):
+        url = reverse('project-source-code-tree', args=[self.project.pk])
+        self.client.get(url, {'path': 'src', 'depth': '1'})
+        # Une requête pour le projet, une pour les dossiers concernés.
+        with self.assertNumQueries(2):
+            self.client.get(url, {'path': 'src', 'depth': '1'})
+
+    def test_source_code_search_literal(self):
+        url = reverse('project-source-code-search', args=[self.project.pk])
+        response = self.client.get(url, {'q': 'RETURN 42'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {'path': 'src/utils/helpers.py', 'line': 2, 'snippet': 'return 42'},
+        ])
+        response = self.client.get(url, {'q': 'RETURN 42', 'case': '1'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_source_code_search_regex_and_limit(self):
+        url = reverse('project-source-code-search', args=[self.project.pk])
+        response = self.client.get(url, {'q': r'def \w+\(\)', 'regex': '1'})
+        self.assertEqual([result['path'] for result in response.data['results']], ['src/utils/helpers.py'])
+
+        response = self.client.get(url, {'q': 'bonjour', 'limit': '3'})
+        self.assertEqual([result['line'] for result in response.data['results']], [1, 2, 3])
+        self.assertTrue(response.data['truncated'])
+
+    def test_source_code_search_builds_index_once(self):
+        url = reverse('project-source-code-search', args=[self.project.pk])
+        self.client.get(url, {'q': 'bonjour'})
+        with mock.patch('api.search.get_archive_index') as get_index:
+            response = self.client.get(url, {'q': 'Projet'})
+        get_index.assert_not_called()
+        self.assertEqual(response.data['results'], [{'path': 'README.md', 'line': 1, 'snippet': '# Projet'}])
+
+    def test_source_code_search_rejects_invalid_queries(self):
+        url = reverse('project-source-code-search', args=[self.project.pk])
+        for params in ({}, {'q': 'ab'}, {'q': '(', 'regex': '1'}, {'q': 'abc', 'limit': 'x'}):
+            self.assertEqual(self.client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST)
+        # Sans littéral obligatoire, l'expression devrait être essayée sur tous les fichiers : refusée.
+        for pattern in (r'(a+)+$', r'foo|bar', r'[a-z]+\d', r'.*'):
+            response = self.client.get(url, {'q': pattern, 'regex': '1'})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, pattern)
+
+    def test_source_code_search_work_is_bounded(self):
+        url = reverse('project-source-code-search', args=[self.project.pk])
+        with override_settings(SOURCE_SEARCH_MAX_SCAN_BYTES=0):
+            response = self.client.get(url, {'q': 'bonjour'})
+        self.assertEqual(response.data, {'results': [], 'truncated': True})
+        with override_settings(SOURCE_SEARCH_TIMEOUT=0):
+            response = self.client.get(url, {'q': 'bonjour'})
+        self.assertEqual(response.data, {'results': [], 'truncated': True})
+
+    def test_source_code_search_interrupts_a_running_match(self):
+        url = reverse('project-source-code-search', args=[self.project.pk])
+        # Le délai restant est transmis au moteur, qui interrompt lui-même un retour arrière catastrophique.
+        with mock.patch('api.search.regex_engine.compile') as compile_pattern:
+            compile_pattern.return_value.search.side_effect = TimeoutError('regex timed out')
+            response = self.client.get(url, {'q': r'bonjour(\w|\w)+!', 'regex': '1'})
+        self.assertEqual(response.data, {'results': [], 'truncated': True})
+        timeout = compile_pattern.return_value.search.call_args.kwargs['timeout']
+        self.assertTrue(0 < timeout <= settings.SOURCE_SEARCH_TIMEOUT)
+
+    def test_required_literals(self):
+        self.assertEqual(required_literals(r'def \w+\(self'), ['def ', '(self'])
+        self.assertEqual(required_literals(r'colou?r_name'), ['colo', 'r_name'])
+        self.assertEqual(required_literals(r'import (os|sys)'), ['import '])
+        # Préfixe commun à toutes les alternatives : obligatoire.
+        self.assertEqual(required_literals(r'import os|import sys'), ['import '])
+        self.assertEqual(required_literals(r'import|export'), [])
+        self.assertEqual(required_literals(r'class [|]+ Foo'), ['class ', ' Foo'])
+        self.assertEqual(required_literals(r'[abc]+_handler\.py'), ['_handler.py'])
+        self.assertEqual(required_literals(r'fooo{2,3}bar'), ['foo', 'bar'])
+        self.assertEqual(required_literals(r'[]abc]xyz'), ['xyz'])
+        self.assertEqual(required_literals(r'(?x)foo bar'), ['foobar'])
+        self.assertEqual(required_literals(r'(hello)+ world'), ['hello', ' world'])
+        self.assertEqual(required_literals(r'(abc'), [])
+
+    def test_source_code_file_highlight(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        response = self.client.get(url, {'path': 'src/utils/helpers.py', 'highlight': '1', 'style': 'default'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['language'], 'Python')
+        self.assertIn('<span class="k">def</span>', response.data['html'])
+        self.assertIn('.highlight', response.data['css'])
+
+    def test_source_code_file_highlight_is_memoized(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        with mock.patch('api.highlight.highlight', wraps=pygments_highlight) as first_highlight:
+            first = self.client.get(url, {'path': 'src/main.py', 'highlight': '1'})
+        first_highlight.assert_called_once()
+        with mock.patch('api.highlight.highlight') as highlight:
+            second = self.client.get(url, {'path': 'src/main.py', 'highlight': '1'})
+        highlight.assert_not_called()
+        self.assertEqual(first.data['html'], second.data['html'])
+        other_style = self.client.get(url, {'path': 'src/main.py', 'highlight': '1', 'style': 'default'})
+        self.assertNotEqual(other_style['ETag'], first['ETag'])
+
+    def test_source_code_file_highlight_errors(self):
+        self.project.source_code_zip.save('binary.zip', ContentFile(make_zip({'a.bin': b'\x00\x01', 'a.py': 'x'})))
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        for params in ({'path': 'a.bin', 'highlight': '1'}, {'path': 'a.py', 'highlight': '1', 'style': 'inconnu'}):
+            self.assertEqual(self.client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST)
+        with override_settings(SOURCE_HIGHLIGHT_MAX_FILE_SIZE=0):
+            response = self.client.get(url, {'path': 'a.py', 'highlight': '1'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_manifest_built_on_upload(self):
+        self.project.refresh_from_db()
+        manifest = SourceManifest.objects.get(sha256=self.project.source_code_sha256)
+        self.assertEqual(manifest.files['src/main.py'], {'size': 850, 'lines': 50, 'language': 'python', 'binary': False})
+        self.assertEqual(manifest.files['README.md']['language'], 'markdown')
+        self.assertNotIn('src/.DS_Store', manifest.files)
+
+    def test_manifest_flags_binary_files(self):
+        self.project.source_code_zip.save('binary.zip', ContentFile(make_zip({'logo.png': b'\x89PNG\x00\x00data'})))
+        manifest = SourceManifest.objects.get(sha256=self.project.source_code_sha256)
+        self.assertEqual(manifest.files['logo.png'], {'size': 10, 'lines': 0, 'language': None, 'binary': True})
+
+    def test_manifest_rebuilt_when_archive_replaced(self):
+        self.project.refresh_from_db()
+        old_sha = self.project.source_code_sha256
+        self.project.source_code_zip.save('autre.zip', ContentFile(make_zip({'index.js': 'export {};'})))
+        self.project.refresh_from_db()
+        self.assertNotEqual(self.project.source_code_sha256, old_sha)
+
+        url = reverse('project-source-code-tree', args=[self.project.pk])
+        response = self.client.get(url)
+        self.assertEqual([node['path'] for node in response.data], ['index.js'])
+
+    def test_source_code_tree_serves_precomputed_manifest(self):
+        url = reverse('project-source-code-tree', args=[self.project.pk])
+        with mock.patch('api.manifest.get_archive_index') as get_index:
+            response = self.client.get(url)
+        get_index.assert_not_called()
+        readme = response.data[1]
+        self.assertEqual(readme, {
+            'name': 'README.md', 'path': 'README.md', 'type': 'file',
+            'size': 9, 'lines': 1, 'language': 'markdown', 'binary': False,
+        })
+
+    def test_snapshot_includes_source_code_tree(self):
+        output = Path(self.media_root) / 'snapshot'
+        call_command('export_api_snapshot', '--output', str(output), '--base-url', 'http://testserver', stdout=io.StringIO())
+        tree = json.loads((output / f'projects/{self.project.pk}/source-code-tree.json').read_text())
+        self.assertEqual(tree, SourceManifest.objects.get().tree)
+
+
+class IngestQueueTests(APITestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root, SOURCE_INGEST_EAGER=False)
+        override.enable()
+        self.addCleanup(override.disable)
+        clear_archive_index_cache()
+
+        self.project = Project.objects.create(title="Projet", description="Code.")
+        self.project.source_code_zip.save('source.zip', ContentFile(make_zip({'src/main.py': 'print("bonjour")\n'})))
+
+    def run_worker(self):
+        call_command('ingest_worker', '--once', '--processes', '0', stdout=io.StringIO())
+
+    def test_upload_enqueues_jobs_and_requests_never_ingest(self):
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.source_code_sha256, '')
+        self.assertEqual(
+            list(self.project.ingest_jobs.order_by('id').values_list('kind', 'status')),
+            [('manifest', 'pending'), ('archive', 'pending'), ('search', 'pending')],
+        )
+        # Les étapes suivantes attendent le manifeste.
+        self.assertEqual([job.kind for job in ingest.claimable_jobs()], ['manifest'])
+
+        with mock.patch('api.manifest.build_manifest') as build_manifest:
+            for name in ('project-source-code-tree', 'project-source-code-file', 'project-source-code-search'):
+                response = self.client.get(reverse(name, args=[self.project.pk]), {'path': 'src/main.py', 'q': 'bonjour'})
+                self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE, name)
+                self.assertIn('Retry-After', response)
+        build_manifest.assert_not_called()
+        self.assertEqual(self.project.ingest_jobs.count(), 3)
+
+        self.run_worker()
+        self.assertEqual(set(self.project.ingest_jobs.values_list('status', flat=True)), {'done'})
+        response = self.client.get(reverse('project-source-code-tree', args=[self.project.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(reverse('project-source-code-search', args=[self.project.pk]), {'q': 'bonjour'})
+        self.assertEqual(response.data['results'][0]['path'], 'src/main.py')
 
-    def test_create_contact_message_invalid_data(self):
-        url = reverse('contact-list')
+    def test_evicted_search_index_is_requeued(self):
+        self.run_worker()
+        self.project.refresh_from_db()
+        get_search_index_path(self.project.source_code_sha256).unlink()
+        url = reverse('project-source-code-search', args=[self.project.pk])
+        self.assertEqual(self.client.get(url, {'q': 'bonjour'}).status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(self.project.ingest_jobs.filter(status='pending').get().kind, 'search')
+        self.run_worker()
+        self.assertEqual(self.client.get(url, {'q': 'bonjour'}).status_code, status.HTTP_200_OK)
+
+    def test_archive_uploaded_before_the_queue_is_ingested_by_the_worker(self):
+        IngestJob.objects.all().delete()
+        url = reverse('project-source-code-search', args=[self.project.pk])
+        # Sans manifeste, une requête ne met pas en file un index de recherche qui échouerait forcément.
+        self.assertEqual(self.client.get(url, {'q': 'bonjour'}).status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(self.project.ingest_jobs.exists())
+
+        with mock.patch.object(ingest, 'enqueue_missing', wraps=ingest.enqueue_missing) as enqueue_missing:
+            call_command('ingest_worker', '--once', '--processes', '0', '--rescan-interval', '0', stdout=io.StringIO())
+        # Au démarrage, puis à chaque fois que la file se vide.
+        self.assertEqual(enqueue_missing.call_count, 2)
+        self.assertEqual(set(self.project.ingest_jobs.values_list('status', flat=True)), {'done'})
+        self.assertEqual(self.client.get(url, {'q': 'bonjour'}).status_code, status.HTTP_200_OK)
+
+    def test_failures_are_recorded_and_can_be_retried(self):
+        self.project.source_code_zip.save('corrompu.zip', ContentFile(b'pas une archive'))
+        self.run_worker()
+        manifest_job = self.project.ingest_jobs.filter(kind='manifest').first()
+        self.assertEqual(manifest_job.status, 'failed')
+        self.assertIn('zip', manifest_job.error)
+        self.assertEqual(self.project.ingest_jobs.filter(kind='search').first().error, "Étape précédente en échec.")
+        jobs = self.project.ingest_jobs.count()
+        self.assertEqual(ingest.enqueue_missing(), 0)
+
+        # Les requêtes publiques ne relancent pas une archive en échec : la file ne grossit pas.
+        for name in ('project-source-code-tree', 'project-source-code-search'):
+            for _ in range(3):
+                response = self.client.get(reverse(name, args=[self.project.pk]), {'q': 'bonjour'})
+                self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(self.project.ingest_jobs.count(), jobs)
+
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'motdepasse')
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse('admin:api_project_change', args=[self.project.pk]))
+        self.assertContains(response, 'Échec')
+        self.client.post(reverse('admin:api_ingestjob_changelist'), {
+            'action': 'retry_jobs', '_selected_action': [manifest_job.pk],
+        })
+        self.assertEqual(
+            sorted(self.project.ingest_jobs.filter(status='pending').values_list('kind', flat=True)),
+            ['archive', 'manifest', 'search'],
+        )
+
+    def test_stale_running_jobs_are_requeued(self):
+        job_id = ingest.claim_next_job()
+        IngestJob.objects.filter(pk=job_id).update(started_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(ingest.requeue_stale(timeout=3600), 1)
+        self.assertEqual(IngestJob.objects.get(pk=job_id).status, 'pending')
+        self.assertTrue(ingest.claim_job(job_id))
+        self.assertFalse(ingest.claim_job(job_id))
+
+
+class AsyncSourceCodeTests(APITransactionTestCase):
+    # Les actions s'exécutent dans les threads du pool : les données doivent être validées en base.
+    serialized_rollback = True
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root, SOURCE_INGEST_EAGER=True, CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+            'source_highlight': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'highlight'},
+            'api_responses': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'responses'},
+        })
+        override.enable()
+        self.addCleanup(override.disable)
+        clear_archive_index_cache()
+
+        self.project = Project.objects.create(title="Projet", description="Code.")
+        self.project.source_code_zip.save('source.zip', ContentFile(make_zip({
+            'README.md': '# Projet\n',
+            'src/main.py': 'print("bonjour")\n' * 50,
+        })))
+        self.factory = AsyncRequestFactory()
+
+    async def test_async_actions_match_sync_actions(self):
+        url = reverse('project-source-code-tree', args=[self.project.pk])
+        response = await async_views.source_code_tree(self.factory.get(url), pk=self.project.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([node['name'] for node in response.data], ['src', 'README.md'])
+
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        response = await async_views.source_code_file(self.factory.get(url, {'path': 'src/main.py'}), pk=self.project.pk)
+        self.assertEqual(response.data['content'], 'print("bonjour")\n' * 50)
+        self.assertTrue(response.has_header('ETag'))
+
+        response = await async_views.source_code_file(self.factory.get(url, {'path': 'absent.py'}), pk=self.project.pk)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_raw_file_is_streamed_through_the_pool(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        request = self.factory.get(url, {'path': 'src/main.py', 'raw': '1'})
+        response = await async_views.source_code_file(request, pk=self.project.pk)
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(content, b'print("bonjour")\n' * 50)
+
+    @override_settings(SOURCE_IO_MAX_PER_ARCHIVE=2)
+    async def test_concurrent_extractions_are_limited_per_archive(self):
+        running = {'a': 0, 'b': 0}
+        peak = {'a': 0, 'b': 0}
+
+        async def extract(key):
+            async with async_views.archive_slot(key):
+                running[key] += 1
+                peak[key] = max(peak[key], running[key])
+                await asyncio.sleep(0.01)
+                running[key] -= 1
+
+        await asyncio.gather(*(extract('a') for _ in range(6)), *(extract('b') for _ in range(2)))
+        self.assertEqual(peak, {'a': 2, 'b': 2})
+        # Les sémaphores des archives inactives sont oubliés.
+        self.assertEqual(async_views._archive_slots, {})
+
+    @override_settings(SOURCE_IO_MAX_PER_ARCHIVE=1)
+    async def test_raw_stream_holds_the_archive_slot_until_consumed(self):
+        url = reverse('project-source-code-file', args=[self.project.pk])
+        response = await async_views.source_code_file(
+            self.factory.get(url, {'path': 'src/main.py', 'raw': '1'}), pk=self.project.pk,
+        )
+        sha256 = (await Project.objects.aget(pk=self.project.pk)).source_code_sha256
+        # La limite porte sur l'empreinte de l'archive, et la place reste prise pendant la diffusion.
+        (slot_key, semaphore), = async_views._archive_slots.items()
+        self.assertEqual(slot_key[1], sha256)
+        self.assertTrue(semaphore.locked())
+        b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(async_views._archive_slots, {})
+
+
+class RemoteStorage(FileSystemStorage):
+    """Stockage sans chemin local, comme Cloudinary ; compte les ouvertures de fichiers."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened = 0
+
+    def path(self, name):
+        raise NotImplementedError
+
+    def open(self, name, mode='rb'):
+        self.opened += 1
+        return open(Path(self.location) / name, mode)
+
+
+class ArchiveCacheTests(APITestCase):
+
+    def setUp(self):
+        self.storage_root = tempfile.mkdtemp()
+        self.cache_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.storage_root, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.cache_root, ignore_errors=True)
+        override = override_settings(SOURCE_CACHE_ROOT=self.cache_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.content = make_zip({'a.py': 'x = 1\n'})
+        self.sha256 = hashlib.sha256(self.content).hexdigest()
+        (Path(self.storage_root) / 'a.zip').write_bytes(self.content)
+        self.storage = RemoteStorage(location=self.storage_root)
+        self.field_file = SimpleNamespace(storage=self.storage, name='a.zip')
+
+    def test_local_storage_is_used_in_place(self):
+        storage = FileSystemStorage(location=self.storage_root)
+        field_file = SimpleNamespace(storage=storage, name=self.field_file.name)
+        self.assertEqual(materialize_archive(field_file, self.sha256), Path(storage.path(self.field_file.name)))
+        self.assertEqual(list(Path(self.cache_root).iterdir()), [])
+
+    def test_remote_archive_copied_once_under_concurrency(self):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(materialize_archive(self.field_file, self.sha256)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        target = Path(self.cache_root) / f'{self.sha256}.zip'
+        self.assertEqual(set(results), {target})
+        self.assertEqual(target.read_bytes(), self.content)
+        self.assertEqual(self.storage.opened, 1)
+        self.assertEqual(list(Path(self.cache_root).glob('*.tmp')), [])
+
+    def test_hash_mismatch_is_not_published(self):
+        with self.assertRaises(IOError):
+            materialize_archive(self.field_file, '0' * 64)
+        self.assertEqual(list(Path(self.cache_root).glob('*.zip')), [])
+        self.assertEqual(list(Path(self.cache_root).glob('*.tmp')), [])
+
+    def _add_remote_archive(self, name, files):
+        content = make_zip(files)
+        (Path(self.storage_root) / name).write_bytes(content)
+        sha256 = hashlib.sha256(content).hexdigest()
+        return sha256, materialize_archive(SimpleNamespace(storage=self.storage, name=name), sha256)
+
+    def test_least_recently_used_archive_is_evicted(self):
+        first_sha, first = self._add_remote_archive('1.zip', {'a.txt': 'a' * 100})
+        second_sha, second = self._add_remote_archive('2.zip', {'b.txt': 'b' * 100})
+        os.utime(first, (2000, 2000))
+        os.utime(second, (1000, 1000))
+
+        with override_settings(SOURCE_CACHE_MAX_BYTES=first.stat().st_size * 2 + 10):
+            _, third = self._add_remote_archive('3.zip', {'c.txt': 'c' * 100})
+
+        self.assertTrue(first.exists())
+        self.assertFalse(second.exists())
+        self.assertTrue(third.exists())
+        self.assertEqual(get_stats()['evictions'], 1)
+
+    def test_hits_and_misses_are_counted(self):
+        materialize_archive(self.field_file, self.sha256)
+        materialize_archive(self.field_file, self.sha256)
+        stats = get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_management_command_trims_cache(self):
+        materialize_archive(self.field_file, self.sha256)
+        out = io.StringIO()
+        call_command('source_cache', '--trim', '--max-bytes', '0', stdout=out)
+        self.assertIn('Évictions : 1', out.getvalue())
+        self.assertEqual(get_stats()['entries'], 0)
+        self.assertEqual(trim(max_bytes=0), 0)
+
+
+class AdminScalabilityTests(APITestCase):
+    """Listes et formulaires d'administration pour des projets aux nombreuses technologies et tâches."""
+
+    def setUp(self):
+        Project.objects.all().delete()
+        CompetenceTechnologique.objects.all().delete()
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'motdepasse')
+        self.client.force_login(self.admin)
+        self.project = Project.objects.create(title="Portfolio", description="Description.", tasks_effectuees="Tâches.")
+        self.technologies = CompetenceTechnologique.objects.bulk_create(
+            CompetenceTechnologique(nom=f"Techno {i:03d}") for i in range(120)
+        )
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_workdone_changelist_query_count_does_not_grow_with_rows(self):
+        url = reverse('admin:api_workdone_changelist')
+        WorkDone.objects.bulk_create(WorkDone(project=self.project, subtitle=f"Tâche {i}", description="…") for i in range(5))
+        few = self.changelist_queries(url)
+        other = Project.objects.create(title="Autre", description="Description.", tasks_effectuees="Tâches.")
+        WorkDone.objects.bulk_create(WorkDone(project=other, subtitle=f"Tâche {i}", description="…") for i in range(60))
+        self.assertEqual(self.changelist_queries(url), few)
+
+    def test_project_form_uses_autocomplete_for_technologies(self):
+        self.project.technologies.add(self.technologies[0])
+        response = self.client.get(reverse('admin:api_project_change', args=[self.project.pk]))
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn('admin-autocomplete', content)
+        # Seules les technologies sélectionnées sont rendues, pas tout le catalogue.
+        self.assertIn("Techno 000", content)
+        self.assertNotIn("Techno 119", content)
+
+    def test_project_page_shows_only_latest_inline_rows(self):
+        WorkDone.objects.bulk_create(WorkDone(project=self.project, subtitle=f"Tâche {i:03d}", description="…") for i in range(60))
+        IngestJob.objects.bulk_create(IngestJob(project=self.project, kind=IngestJob.Kind.SEARCH) for _ in range(60))
+        response = self.client.get(reverse('admin:api_project_change', args=[self.project.pk]))
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn("Tâche 059", content)
+        self.assertNotIn("Tâche 039", content)
+        self.assertEqual(len(response.context['inline_admin_formsets'][1].formset.forms), INLINE_MAX_ROWS)
+        self.assertIn("Toutes les tâches (60)", content)
+
+        # Les lignes non affichées restent accessibles par les listes filtrées sur le projet.
+        for name in ('admin:api_workdone_changelist', 'admin:api_ingestjob_changelist'):
+            response = self.client.get(reverse(name), {'project__id__exact': self.project.pk})
+            self.assertEqual(response.status_code, 200, name)
+
+    def test_saving_a_project_keeps_rows_not_shown_inline(self):
+        WorkDone.objects.bulk_create(WorkDone(project=self.project, subtitle=f"Tâche {i:03d}", description="…") for i in range(30))
+        shown = WorkDone.objects.order_by('-pk')[:INLINE_MAX_ROWS]
         data = {
-            'name': 'Test User',
-            'email': 'not-an-email',
-            'message': ''
+            'title': "Portfolio modifié", 'description': "Description.", 'tasks_effectuees': "Tâches.",
+            'technologies': [self.technologies[0].pk],
+            'work_done-TOTAL_FORMS': len(shown), 'work_done-INITIAL_FORMS': len(shown),
+            'ingest_jobs-TOTAL_FORMS': 0, 'ingest_jobs-INITIAL_FORMS': 0,
         }
-        response = self.client.post(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('email', response.data)
-        self.assertIn('message', response.data)
+        for i, work in enumerate(shown):
+            data.update({
+                f'work_done-{i}-id': work.pk, f'work_done-{i}-project': self.project.pk,
+                f'work_done-{i}-subtitle': work.subtitle, f'work_done-{i}-description': work.description,
+            })
+        response = self.client.post(reverse('admin:api_project_change', args=[self.project.pk]), data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Project.objects.get(pk=self.project.pk).title, "Portfolio modifié")
+        self.assertEqual(self.project.work_done.count(), 30)
+
+    def test_technology_autocomplete_searches_by_prefix(self):
+        response = self.client.get(reverse('admin:autocomplete'), {
+            # Entre guillemets, le terme est un seul préfixe (sinon chaque mot en est un).
+            'term': '"Techno 11"', 'app_label': 'api', 'model_name': 'project', 'field_name': 'technologies',
+        })
+        self.assertEqual(response.status_code, 200)
+        names = [result['text'] for result in response.json()['results']]
+        self.assertEqual(names, [f"Techno {i}" for i in range(110, 120)])
+
+    @skipUnless(connection.vendor == 'sqlite', "Plan d'exécution propre à SQLite.")
+    def test_prefix_search_uses_index(self):
+        for model, lookup, index in (
+            (Project, 'title__istartswith', 'api_project_title_prefix_idx'),
+            (WorkDone, 'subtitle__istartswith', 'api_workdone_subtitle_prefix_idx'),
+            (CompetenceTechnologique, 'nom__istartswith', 'api_competencetechnologique_nom_prefix_idx'),
+        ):
+            plan = model.objects.filter(**{lookup: 'Tech'}).explain()
+            self.assertIn(f'SEARCH {model._meta.db_table} USING', plan)
+            self.assertIn(index, plan)
+
+    def test_logo_preview_prefers_smallest_variant(self):
+        competence = self.technologies[0]
+        competence.logo.name = 'competences_logos/python.png'
+        competence.logo_variants = {'webp': [{'name': 'competences_logos/variants/python-48w.webp', 'width': 48}]}
+        model_admin = admin.site._registry[CompetenceTechnologique]
+        storage = CompetenceTechnologique._meta.get_field('logo').storage
+        with mock.patch.object(storage, 'url', wraps=storage.url) as url:
+            preview = model_admin.display_logo_preview(competence)
+            model_admin.display_logo_preview(competence)
+        self.assertIn('python-48w.webp', preview)
+        self.assertIn('loading="lazy"', preview)
+        # L'URL d'un fichier n'est résolue qu'une fois, pas à chaque affichage de la liste.
+        self.assertEqual(url.call_count, 1)
+
+
+@override_settings(API_SNAPSHOT_ON_SAVE=False)
+class ContentTransferTests(APITestCase):
+    """Export et import en flux JSON Lines du contenu du portfolio."""
+
+    def setUp(self):
+        Project.objects.all().delete()
+        CompetenceTechnologique.objects.all().delete()
+        self.python = CompetenceTechnologique.objects.create(nom="Python")
+        self.django = CompetenceTechnologique.objects.create(nom="Django")
+        self.project = Project.objects.create(title="Portfolio", description="Description.", tasks_effectuees="Tâches.")
+        self.project.technologies.set([self.python, self.django])
+        WorkDone.objects.create(project=self.project, subtitle="API", description="Réalisée.")
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def export(self):
+        path = self.tmp / 'contenu.jsonl'
+        call_command('export_content', '--output', str(path), stdout=io.StringIO())
+        return path
+
+    def test_export_streams_one_line_per_object_with_technology_names(self):
+        records = [json.loads(line) for line in self.export().read_text(encoding='utf-8').splitlines()]
+        projects = [r for r in records if r['model'] == 'api.project']
+        self.assertEqual(len(projects), 1)
+        self.assertEqual(projects[0]['pk'], self.project.pk)
+        self.assertEqual(projects[0]['fields']['technologies'], ['Django', 'Python'])
+        self.assertNotIn('updated_at', projects[0]['fields'])
+        self.assertEqual(
+            [r['fields']['project_id'] for r in records if r['model'] == 'api.workdone'], [self.project.pk],
+        )
+
+    def test_round_trip_restores_content_and_links(self):
+        path = self.export()
+        Project.objects.all().delete()
+        CompetenceTechnologique.objects.all().delete()
+        out = io.StringIO()
+        call_command('import_content', str(path), stdout=out)
+        self.assertIn('objets importés', out.getvalue())
+        project = Project.objects.get(pk=self.project.pk)
+        self.assertEqual(project.title, "Portfolio")
+        self.assertEqual(sorted(project.technologies.values_list('nom', flat=True)), ['Django', 'Python'])
+        self.assertEqual(project.work_done.get().subtitle, "API")
+
+    def test_import_updates_existing_rows_and_replaces_links(self):
+        line = json.dumps({'model': 'api.project', 'pk': self.project.pk, 'fields': {
+            'title': "Renommé", 'description': "D.", 'tasks_effectuees': "T.", 'technologies': ['Python'],
+        }})
+        path = self.tmp / 'maj.jsonl'
+        path.write_text(line + '\n', encoding='utf-8')
+        call_command('import_content', str(path), stdout=io.StringIO())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.title, "Renommé")
+        self.assertEqual(list(self.project.technologies.values_list('nom', flat=True)), ['Python'])
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_import_writes_in_batches(self):
+        path = self.tmp / 'lot.jsonl'
+        with open(path, 'w', encoding='utf-8') as fp:
+            for i in range(250):
+                fp.write(json.dumps({'model': 'api.workdone', 'pk': 10_000 + i, 'fields': {
+                    'project_id': self.project.pk, 'subtitle': f"Tâche {i}", 'description': "…",
+                }}) + '\n')
+        with CaptureQueriesContext(connection) as queries:
+            call_command('import_content', str(path), '--batch-size', '100', stdout=io.StringIO())
+        self.assertEqual(WorkDone.objects.count(), 251)
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "api_workdone"')]
+        self.assertEqual(len(inserts), 3)
+
+    def test_unknown_technology_rolls_back_whole_import(self):
+        path = self.tmp / 'invalide.jsonl'
+        path.write_text('\n'.join([
+            json.dumps({'model': 'api.diplome', 'pk': 500, 'fields': {'titre': "Master", 'institution': "Université"}}),
+            json.dumps({'model': 'api.project', 'pk': 900, 'fields': {
+                'title': "Autre", 'description': "D.", 'tasks_effectuees': "T.", 'technologies': ['Cobol'],
+            }}),
+        ]), encoding='utf-8')
+        with self.assertRaisesMessage(CommandError, "Cobol"):
+            call_command('import_content', str(path), stdout=io.StringIO())
+        self.assertFalse(Project.objects.filter(pk=900).exists())
+        self.assertFalse(Diplome.objects.filter(pk=500).exists())
+
+    def test_import_refreshes_validators_of_updated_rows(self):
+        diplome = Diplome.objects.create(titre="Licence", institution="Université")
+        url = reverse('diplome-list')
+        etag = self.client.get(url)['ETag']
+        path = self.tmp / 'diplome.jsonl'
+        path.write_text(json.dumps({'model': 'api.diplome', 'pk': diplome.pk, 'fields': {
+            'titre': "Master", 'institution': "Université",
+        }}) + '\n', encoding='utf-8')
+        call_command('import_content', str(path), stdout=io.StringIO())
+        self.assertGreater(Diplome.objects.get(pk=diplome.pk).updated_at, diplome.updated_at)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "Master")
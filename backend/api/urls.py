@@ -1,4 +1,5 @@
 # backend/api/urls.py
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
@@ -8,7 +9,10 @@ from .views import (
     DiplomeViewSet, 
     CompetenceTechnologiqueViewSet, 
     ParcoursViewSet,
+    BootstrapView,
+    MetricsView,
 )
+from . import async_views
 
 # Génération des URLs  pour chaque ViewSet.
 router = DefaultRouter()
@@ -21,5 +25,14 @@ router.register(r'parcours', ParcoursViewSet, basename='parcours')
 
 # URL principale de l'API 
 urlpatterns = [
+    path('bootstrap/', BootstrapView.as_view(), name='bootstrap'),
+    path('_metrics', MetricsView.as_view(), name='metrics'),
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
+
+# Sous ASGI, les actions de code source passent par leur version asynchrone (déclarée avant le routeur).
+if settings.SOURCE_ASYNC_VIEWS:
+    urlpatterns[:0] = [
+        path('projects/<int:pk>/source-code-tree/', async_views.source_code_tree, name='project-source-code-tree'),
+        path('projects/<int:pk>/source-code-file/', async_views.source_code_file, name='project-source-code-file'),
+    ]
\ No newline at end of file
@@ -1,12 +1,20 @@
 # backend/api/views.py
 
-import zipfile
-import io
-from pathlib import Path
+import hashlib
+import hmac
+import itertools
+import mimetypes
 from django.conf import settings
+from django.db.models import Count, IntegerField, Max, Value
+from django.db.models.functions import Substr
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.text import compress_string
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import (
     Project,
     Presentation,
@@ -14,84 +22,277 @@ from .models import (
     Diplome,
     CompetenceTechnologique,
     Parcours,
+    WorkDone,
 )
 from .serializers import (
+    PROJECT_SUMMARY_LENGTH,
+    ProjectListSerializer,
     ProjectSerializer,
     PresentationSerializer,
     PosteCibleSerializer,
     DiplomeSerializer,
     CompetenceTechnologiqueSerializer,
     ParcoursSerializer,
+    optimize_queryset,
 )
+from . import archive_cache
+from .cache import get_content_version, get_model_versions, get_response_cache, record_response_cache
+from .archive import get_archive_index
+from .ingest import request_ingest
+from .metrics import registry
+from .manifest import BINARY_SNIFF_SIZE, SourceNotReady, get_source_manifest, list_directory
+from .highlight import DEFAULT_STYLE, highlight_member, is_known_style, style_css
+from .renderers import ORJSONRenderer
+from .search import search_source
 
-class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
+# Délai (s) suggéré au client pendant l'ingestion d'une archive.
+SOURCE_NOT_READY_RETRY_AFTER = 10
+
+
+def source_file_etag(sha256, path, variant):
+    """ETag fort d'un fichier source : empreinte de l'archive, chemin et représentation servie."""
+    digest = hashlib.sha256(f"{sha256}\0{path}\0{variant}".encode()).hexdigest()
+    return f'"{digest[:40]}"'
+
+
+def with_revalidation(response, etag):
+    """Ajoute l'ETag et impose une revalidation (le contenu d'une URL change avec l'archive)."""
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def source_not_ready_response(project, error):
+    """
+    Réponse 503 pour une archive pas encore ingérée : le client est invité à réessayer. Un index de
+    recherche évincé est redemandé à la file d'ingestion (jamais construit dans la requête).
+    """
+    request_ingest(project, error.kinds)
+    response = Response({"error": str(error)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Retry-After'] = SOURCE_NOT_READY_RETRY_AFTER
+    return response
+
+
+def raw_member_response(index, path):
+    """Diffuse un membre de l'archive par blocs, sans le charger entièrement en mémoire."""
+    chunks = index.iter_member(path)
+    # Le premier bloc est lu tout de suite : une archive illisible donne une erreur 500, pas une réponse tronquée.
+    first = next(chunks, b'')
+    content_type, _ = mimetypes.guess_type(path)
+    if b'\x00' in first[:BINARY_SNIFF_SIZE]:
+        # Les images sont affichables telles quelles ; tout autre binaire est servi comme flux d'octets.
+        if not content_type or not content_type.startswith('image/') or content_type == 'image/svg+xml':
+            content_type = 'application/octet-stream'
+    else:
+        # Le texte (y compris HTML/SVG) est servi en texte brut pour ne jamais être interprété par le navigateur.
+        content_type = 'text/plain; charset=utf-8'
+    response = StreamingHttpResponse(itertools.chain([first], chunks), content_type=content_type)
+    response['Content-Length'] = index.entries[path].file_size
+    return response
+
+
+class SparseFieldsetMixin:
+    """
+    Ajoute `?fields=a,b` et `?expand=relation` aux actions `list` et `retrieve` d'un ViewSet.
+
+    Les options sont transmises au sérialiseur (sortie JSON) et au queryset : seules les colonnes
+    et les relations effectivement sérialisées sont chargées et préchargées (nombre de requêtes constant).
+    """
+    sparse_actions = ('list', 'retrieve')
+
+    def get_sparse_fieldset(self):
+        params = self.request.query_params
+        fields = {name for name in params.get('fields', '').split(',') if name} or None
+        expand = {name for name in params.get('expand', '').split(',') if name}
+        return fields, expand
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in self.sparse_actions:
+            fields, expand = self.get_sparse_fieldset()
+            kwargs.setdefault('fields', fields)
+            kwargs.setdefault('expand', expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.sparse_actions:
+            fields, expand = self.get_sparse_fieldset()
+            serializer = self.get_serializer_class()(fields=fields, expand=expand, context=self.get_serializer_context())
+            queryset = optimize_queryset(queryset, serializer)
+        return queryset
+
+
+class CachedResponseMixin:
+    """
+    Met en cache les réponses des actions `list` et `retrieve` (cache `API_RESPONSE_CACHE`) et
+    répond aux requêtes conditionnelles.
+
+    La clé contient l'URL complète (hôte et paramètres), le format négocié et la version de chacun
+    des `cache_models` dont dépend la représentation : les signaux incrémentent la version d'un
+    modèle à chaque modification, ce qui invalide exactement les réponses concernées. L'en-tête
+    `X-Cache` indique si la réponse vient du cache (HIT) ou a été calculée (MISS).
+
+    Chaque réponse porte un ETag dérivé de l'état des `cache_models` en base (nombre de lignes et
+    date de dernière modification) et un Last-Modified dérivé de leurs versions, horodatées et
+    incrémentées aussi par les suppressions (la date maximale en base ne recule pas quand la ligne la
+    plus récente est supprimée) ; ils sont mémorisés avec la réponse. Un client à jour reçoit un 304
+    sans que le sérialiseur ne soit exécuté.
+    """
+    cached_actions = ('list', 'retrieve')
+    cache_models = ()
+
+    def get_cache_models(self):
+        return self.cache_models or (self.queryset.model,)
+
+    def get_response_cache_key(self, request, versions):
+        digest = hashlib.sha256(
+            f"{request.build_absolute_uri()}\0{request.accepted_renderer.format}".encode()
+        ).hexdigest()
+        return f"api:response:{self.basename}:{self.action}:{digest}:{'.'.join(map(str, versions))}"
+
+    def get_validators(self, request, versions):
+        """ETag et date de dernière modification (timestamp) de la représentation demandée."""
+        models = self.get_cache_models()
+        # Un agrégat par modèle, réunis en une seule requête (UNION ALL) ; une table vide ne renvoie aucune ligne.
+        aggregates = [
+            model._default_manager.order_by()
+            .annotate(model=Value(i, output_field=IntegerField())).values('model')
+            .annotate(count=Count('pk'), last_modified=Max('updated_at'))
+            .values_list('model', 'count', 'last_modified')
+            for i, model in enumerate(models)
+        ]
+        rows = {i: (count, last) for i, count, last in aggregates[0].union(*aggregates[1:], all=True)}
+        state = [
+            {'count': rows.get(i, (0, None))[0], 'last_modified': rows.get(i, (0, None))[1]}
+            for i in range(len(models))
+        ]
+        # Le nombre de lignes rend compte des suppressions, que la date maximale ne voit pas.
+        digest = hashlib.sha256(
+            "\0".join([
+                request.build_absolute_uri(),
+                request.accepted_renderer.format,
+                *(f"{row['count']}:{row['last_modified'] and row['last_modified'].isoformat()}" for row in state),
+            ]).encode()
+        ).hexdigest()
+        # Versions en nanosecondes (cf. `cache._bump_version`) : la plus récente donne la date en secondes.
+        return f'"{digest[:40]}"', max(versions) // 10**9
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, '_cache_status', None):
+            response['X-Cache'] = self._cache_status
+        validators = getattr(self, '_validators', None)
+        if validators and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            etag, last_modified = validators
+            with_revalidation(response, etag)
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        response_cache = get_response_cache()
+        versions = get_model_versions(self.get_cache_models())
+        key = self.get_response_cache_key(request, versions)
+        entry = response_cache.get(key)
+        if entry is not None:
+            self._validators = entry['etag'], entry['last_modified']
+        else:
+            # Calculés avant la sérialisation : une modification concurrente produira un ETag différent.
+            self._validators = self.get_validators(request, versions)
+        self._cache_status = 'MISS' if entry is None else 'HIT'
+        record_response_cache(hit=entry is not None)
+
+        etag, last_modified = self._validators
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+        if entry is not None:
+            return Response(entry['data'])
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response_cache.set(
+                key, {'data': response.data, 'etag': etag, 'last_modified': last_modified},
+                timeout=settings.API_RESPONSE_CACHE_TIMEOUT,
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+
+class ProjectViewSet(CachedResponseMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet pour les projets, avec des actions personnalisées pour le code source."""
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # Les tâches et les technologies sont imbriquées dans la représentation d'un projet.
+    cache_models = (Project, WorkDone, CompetenceTechnologique)
 
-    def get_cache_dir(self, project_id):
-        """Crée et retourne le chemin du répertoire de cache pour un projet donné."""
-        cache_path = Path(settings.MEDIA_ROOT) / 'zip_cache' / str(project_id)
-        cache_path.mkdir(parents=True, exist_ok=True)
-        return cache_path
+    def get_serializer_class(self):
+        """Représentation compacte pour la liste, complète pour le détail."""
+        if self.action == 'list':
+            return ProjectListSerializer
+        return super().get_serializer_class()
 
-    def extract_zip_if_needed(self, project):
-        """Extrait le fichier ZIP du code source dans un répertoire de cache, si nécessaire."""
-        cache_dir = self.get_cache_dir(project.id)
-        if not any(cache_dir.iterdir()):
-            try:
-                with zipfile.ZipFile(project.source_code_zip.file, 'r') as zip_ref:
-                    zip_ref.extractall(cache_dir)
-            except Exception as e:
-                raise IOError(f"Échec de l'extraction du fichier zip : {str(e)}")
-        return cache_dir
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.annotate(summary=Substr('description', 1, PROJECT_SUMMARY_LENGTH))
+        return queryset
 
     @action(detail=True, methods=['get'], url_path='source-code-tree')
     def source_code_tree(self, request, pk=None):
-        """Action personnalisée pour lister l'arborescence des fichiers du code source."""
+        """
+        Action personnalisée pour lister l'arborescence des fichiers du code source.
+
+        Sans paramètre, l'arbre complet est renvoyé. Avec `?path=<dossier>&depth=N` (ou `?depth=N` pour
+        la racine), seuls N niveaux sous le dossier sont renvoyés ; les dossiers non développés portent
+        leur `child_count` et peuvent être chargés à leur tour.
+        """
         project = self.get_object()
         if not project.source_code_zip:
             return Response({"error": "Aucun fichier zip de code source disponible."}, status=status.HTTP_404_NOT_FOUND)
 
+        if 'path' in request.query_params or 'depth' in request.query_params:
+            try:
+                depth = int(request.query_params.get('depth', 1))
+            except ValueError:
+                depth = 0
+            if depth < 1:
+                return Response({"error": "Le paramètre 'depth' doit être un entier positif."}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                nodes = list_directory(project, request.query_params.get('path', ''), depth)
+            except SourceNotReady as e:
+                return source_not_ready_response(project, e)
+            except IOError as e:
+                return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            if nodes is None:
+                return Response({"error": "Dossier non trouvé."}, status=status.HTTP_404_NOT_FOUND)
+            archive_cache.touch(project.source_code_sha256)
+            return Response(nodes)
+
         try:
-            cache_dir = self.extract_zip_if_needed(project)
-        except IOError as e:
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
-        # --- Construction d'une arborescence (dictionnaire imbriqué) à partir des chemins ---
-        root = {}
-        for path in sorted(cache_dir.rglob('*')):
-            if '.DS_Store' in str(path) :
-                continue
-            
-            parts = path.relative_to(cache_dir).parts
-            current_level = root
-            for part in parts[:-1]:
-                current_level = current_level.setdefault(part, {})
-            if path.is_file():
-                current_level[parts[-1]] = parts[-1]
-        
-        def build_tree(d, path_prefix=''):
-            """Fonction  pour convertir le dictionnaire en une liste ."""
-            result = []
-            for k, v in d.items():
-                current_path = f"{path_prefix}{k}"
-                node = {'name': k, 'path': current_path}
-                if isinstance(v, dict):
-                    node['type'] = 'directory'
-                    node['children'] = build_tree(v, f"{current_path}/")
-                else:
-                    node['type'] = 'file'
-                result.append(node)
-            return sorted(result, key=lambda x: (x['type'] == 'file', x['name']))
-
-        tree = build_tree(root)
-        return Response(tree)
+            # L'index des fichiers (`files`) n'est pas utile ici : seule l'arborescence est chargée.
+            manifest = get_source_manifest(project, fields=('tree',))
+        except SourceNotReady as e:
+            return source_not_ready_response(project, e)
+
+        # Le manifeste est construit une fois par version d'archive : aucun parcours de l'archive ici.
+        archive_cache.touch(project.source_code_sha256)
+        return Response(manifest.tree)
 
     @action(detail=True, methods=['get'], url_path='source-code-file')
     def source_code_file(self, request, pk=None):
-        """Récupérer le contenu d'un fichier source spécifique."""
+        """
+        Récupérer le contenu d'un fichier source spécifique.
+
+        `?raw=1` diffuse les octets du fichier ; `?highlight=1[&style=<thème Pygments>]` renvoie son
+        rendu HTML coloré (mémorisé par version d'archive) et la feuille de style du thème.
+        """
         project = self.get_object()
         file_path_str = request.query_params.get('path')
 
@@ -101,50 +302,268 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
         if not project.source_code_zip:
             return Response({"error": "Aucun fichier zip de code source disponible."}, status=status.HTTP_404_NOT_FOUND)
 
+        if not project.source_code_sha256:
+            return source_not_ready_response(project, SourceNotReady())
+
+        raw = request.query_params.get('raw') in ('1', 'true')
+        style = None
+        if request.query_params.get('highlight') in ('1', 'true'):
+            style = request.query_params.get('style', DEFAULT_STYLE)
+            if not is_known_style(style):
+                return Response({"error": f"Style de coloration inconnu : {style}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # ETag fort dérivé de la version de l'archive et du chemin : un 304 ne touche jamais l'archive.
+        variant = 'raw' if raw else f'highlight:{style}' if style else 'json'
+        etag = source_file_etag(project.source_code_sha256, file_path_str, variant)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return with_revalidation(not_modified, etag)
+
         try:
-            cache_dir = self.extract_zip_if_needed(project)
+            index = get_archive_index(project.source_code_zip, project.source_code_sha256)
+            archive_cache.touch(project.source_code_sha256)
         except IOError as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        target_file = cache_dir.joinpath(file_path_str).resolve()
-        # Mesure de sécurité pour empêcher l'accès à des fichiers hors du répertoire de cache (Path Traversal).
-        if not target_file.is_file() or not str(target_file).startswith(str(cache_dir.resolve())):
+        # Seuls les membres présents dans l'index sont lisibles : aucun accès au système de fichiers.
+        if file_path_str not in index:
             return Response({"error": "Fichier non trouvé ou accès refusé."}, status=status.HTTP_404_NOT_FOUND)
-        
+
+        if style and index.entries[file_path_str].file_size > settings.SOURCE_HIGHLIGHT_MAX_FILE_SIZE:
+            return Response({"error": "Fichier trop volumineux pour la coloration syntaxique."}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
-            content = target_file.read_text(encoding='utf-8', errors='ignore')
-            return Response({'path': file_path_str, 'content': content})
+            if raw:
+                response = raw_member_response(index, file_path_str)
+            elif style:
+                rendered = highlight_member(
+                    project.source_code_sha256, file_path_str, style, lambda: index.read(file_path_str),
+                )
+                response = Response({'path': file_path_str, 'style': style, 'css': style_css(style), **rendered})
+            else:
+                content = index.read(file_path_str).decode('utf-8', errors='ignore')
+                response = Response({'path': file_path_str, 'content': content})
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({"error": f"Échec de la lecture du fichier : {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return with_revalidation(response, etag)
+
+    @action(detail=True, methods=['get'], url_path='source-code-files')
+    def source_code_files(self, request, pk=None):
+        """
+        Récupère plusieurs fichiers source en une seule requête.
+
+        - `?path=a&path=b` : les fichiers demandés (au plus `SOURCE_BATCH_MAX_FILES`).
+        - `?bundle=1[&prefix=dossier/][&max_size=octets]` : tous les fichiers texte du projet (ou d'un
+          dossier) sous le seuil de taille, pour un préchargement complet par le visualiseur.
+
+        La réponse est compressée en gzip lorsque le client l'accepte.
+        """
+        project = self.get_object()
+        if not project.source_code_zip:
+            return Response({"error": "Aucun fichier zip de code source disponible."}, status=status.HTTP_404_NOT_FOUND)
+
+        bundle = request.query_params.get('bundle') in ('1', 'true')
+        paths = request.query_params.getlist('path')
+        if not bundle and not paths:
+            return Response({"error": "Le paramètre 'path' ou 'bundle' est requis."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(paths) > settings.SOURCE_BATCH_MAX_FILES:
+            return Response(
+                {"error": f"Au plus {settings.SOURCE_BATCH_MAX_FILES} fichiers par requête."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            max_size = int(request.query_params.get('max_size', settings.SOURCE_BUNDLE_MAX_FILE_SIZE))
+        except ValueError:
+            return Response({"error": "Le paramètre 'max_size' doit être un entier."}, status=status.HTTP_400_BAD_REQUEST)
+        max_size = min(max_size, settings.SOURCE_BUNDLE_MAX_FILE_SIZE)
+        prefix = request.query_params.get('prefix', '')
+
+        try:
+            manifest = get_source_manifest(project)
+        except SourceNotReady as e:
+            return source_not_ready_response(project, e)
+
+        variant = f"bundle\0{prefix}\0{max_size}" if bundle else "batch\0" + "\0".join(paths)
+        etag = source_file_etag(project.source_code_sha256, '', variant)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return with_revalidation(not_modified, etag)
+
+        if bundle:
+            # Sélection faite sur le manifeste : ni parcours ni décompression des fichiers écartés.
+            selected = [
+                path for path, meta in sorted(manifest.files.items())
+                if path.startswith(prefix) and not meta['binary'] and meta['size'] <= max_size
+            ]
+        else:
+            selected = [path for path in dict.fromkeys(paths) if path in manifest.files]
+        missing = [path for path in paths if path not in manifest.files]
+
+        # Le volume total est plafonné ; les fichiers au-delà sont signalés par `truncated`.
+        budget = settings.SOURCE_BUNDLE_MAX_BYTES
+        kept = []
+        for path in selected:
+            budget -= manifest.files[path]['size']
+            if budget < 0:
+                break
+            kept.append(path)
+
+        try:
+            index = get_archive_index(project.source_code_zip, project.source_code_sha256)
+            archive_cache.touch(project.source_code_sha256)
+            files = {path: content.decode('utf-8', errors='ignore') for path, content in index.read_many(kept)}
+        except Exception as e:
+            return Response({"error": f"Échec de la lecture des fichiers : {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        payload = {'files': files, 'missing': missing, 'truncated': len(kept) < len(selected)}
+        response = HttpResponse(ORJSONRenderer().render(payload), content_type='application/json')
+        if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response.content = compress_string(response.content)
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return with_revalidation(response, etag)
+
+    @action(detail=True, methods=['get'], url_path='source-code-search')
+    def source_code_search(self, request, pk=None):
+        """
+        Recherche plein texte (`?q=`) ou par expression régulière (`&regex=1`) dans le code source.
+
+        Options : `case=1` pour respecter la casse, `limit=N` (au plus `SOURCE_SEARCH_MAX_RESULTS`).
+        Chaque résultat donne le chemin, le numéro de ligne et un extrait de la ligne.
+        """
+        project = self.get_object()
+        query = request.query_params.get('q', '')
+        if not query:
+            return Response({"error": "Le paramètre 'q' est requis."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not project.source_code_zip:
+            return Response({"error": "Aucun fichier zip de code source disponible."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            limit = min(int(request.query_params.get('limit', 100)), settings.SOURCE_SEARCH_MAX_RESULTS)
+        except ValueError:
+            return Response({"error": "Le paramètre 'limit' doit être un entier."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results, truncated = search_source(
+                project,
+                query,
+                regex=request.query_params.get('regex') in ('1', 'true'),
+                case_sensitive=request.query_params.get('case') in ('1', 'true'),
+                limit=max(limit, 1),
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except SourceNotReady as e:
+            return source_not_ready_response(project, e)
+        except IOError as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        return Response({'results': results, 'truncated': truncated})
 
 # --- ViewSets standards en lecture seule ---
 
-class PresentationViewSet(viewsets.ReadOnlyModelViewSet):
+class PresentationViewSet(CachedResponseMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet pour l'accès en lecture seule aux objets Presentation."""
     queryset = Presentation.objects.all()
     serializer_class = PresentationSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
-class PosteCibleViewSet(viewsets.ReadOnlyModelViewSet):
+class PosteCibleViewSet(CachedResponseMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet pour l'accès en lecture seule aux objets PosteCible."""
     queryset = PosteCible.objects.all()
     serializer_class = PosteCibleSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
-class DiplomeViewSet(viewsets.ReadOnlyModelViewSet):
+class DiplomeViewSet(CachedResponseMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet pour l'accès en lecture seule aux objets Diplome."""
     queryset = Diplome.objects.all()
     serializer_class = DiplomeSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
-class CompetenceTechnologiqueViewSet(viewsets.ReadOnlyModelViewSet):
+class CompetenceTechnologiqueViewSet(CachedResponseMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet pour l'accès en lecture seule aux objets CompetenceTechnologique."""
     queryset = CompetenceTechnologique.objects.all()
     serializer_class = CompetenceTechnologiqueSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
-class ParcoursViewSet(viewsets.ReadOnlyModelViewSet):
+class ParcoursViewSet(CachedResponseMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet pour l'accès en lecture seule aux objets Parcours."""
     queryset = Parcours.objects.all()
     serializer_class = ParcoursSerializer
-    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # Même ordre que le modèle pour les pages ; la clé primaire départage les périodes identiques.
+    cursor_ordering = ('-periode', '-id')
+
+
+# --- Point d'entrée agrégé pour le chargement initial du frontend ---
+
+class BootstrapView(APIView):
+    """
+    Renvoie en une seule réponse toutes les données affichées au démarrage du frontend.
+
+    Remplace six requêtes (`projects`, `parcours`, `presentations`, `postes`, `diplomes`,
+    `competences`). Le résultat est construit en un nombre fixe de requêtes SQL et mis en cache
+    (`API_RESPONSE_CACHE`, partagé par les workers) comme un tout jusqu'à la prochaine modification
+    du contenu.
+    """
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    def get(self, request):
+        # Les URL des médias sont absolues : le cache est donc distinct par hôte.
+        cache_key = f"api:bootstrap:{get_content_version()}:{request.build_absolute_uri('/')}"
+        response_cache = get_response_cache()
+        data = response_cache.get(cache_key)
+        if data is None:
+            context = {'request': request}
+            data = {
+                # Mêmes données que `/projects/` : représentation compacte des cartes de projet.
+                'projects': ProjectListSerializer(
+                    optimize_queryset(
+                        Project.objects.annotate(summary=Substr('description', 1, PROJECT_SUMMARY_LENGTH)),
+                        ProjectListSerializer(),
+                    ),
+                    many=True,
+                    context=context,
+                ).data,
+                'parcours': ParcoursSerializer(Parcours.objects.all(), many=True, context=context).data,
+                # Le frontend n'affiche qu'un seul texte de présentation.
+                'presentation': (
+                    PresentationSerializer(presentation, context=context).data
+                    if (presentation := Presentation.objects.first()) else None
+                ),
+                'postes': PosteCibleSerializer(PosteCible.objects.all(), many=True, context=context).data,
+                'diplomes': DiplomeSerializer(Diplome.objects.all(), many=True, context=context).data,
+                'competences': CompetenceTechnologiqueSerializer(
+                    CompetenceTechnologique.objects.all(), many=True, context=context,
+                ).data,
+            }
+            response_cache.set(cache_key, data, timeout=settings.API_BOOTSTRAP_CACHE_TIMEOUT)
+
+        response = Response(data)
+        patch_cache_control(response, public=True, max_age=settings.API_BOOTSTRAP_MAX_AGE)
+        return response
+
+
+class HasMetricsAccess(permissions.BasePermission):
+    """Accès aux métriques : jeton `API_METRICS_TOKEN` (`Authorization: Bearer …`) ou utilisateur staff."""
+
+    def has_permission(self, request, view):
+        token = settings.API_METRICS_TOKEN
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        if token and header.startswith('Bearer ') and hmac.compare_digest(header[len('Bearer '):], token):
+            return True
+        return bool(request.user and request.user.is_staff)
+
+
+class MetricsView(APIView):
+    """
+    Expose au format texte de Prometheus les histogrammes de latence et les compteurs SQL par point
+    d'accès (cf. `PerformanceMiddleware`). Les valeurs sont propres à chaque processus serveur.
+    """
+    permission_classes = [HasMetricsAccess]
+
+    def get(self, request):
+        return HttpResponse(registry.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
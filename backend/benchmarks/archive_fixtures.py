@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Générateur d'archives ZIP synthétiques pour les benchmarks du code source.
+
+La forme de l'archive est paramétrable : nombre de fichiers (de 10 à 100 000), arborescence large
+(beaucoup de fichiers par dossier) ou profonde (longues chaînes de dossiers), contenu texte, binaire
+ou mixte, et taille moyenne des fichiers. Une même graine produit toujours la même archive. Usage,
+depuis `backend/` :
+
+    python benchmarks/archive_fixtures.py sortie.zip --files 10000 --shape deep --content mixed
+"""
+import argparse
+import random
+import zipfile
+
+SHAPES = ('wide', 'deep')
+CONTENTS = ('text', 'binary', 'mixed')
+# Nombre maximal de fichiers par dossier (forme large) et profondeur maximale (forme profonde).
+WIDE_FANOUT = 100
+DEEP_MAX_DEPTH = 40
+TEXT_EXTENSIONS = ('py', 'js', 'jsx', 'css', 'md', 'json', 'html', 'txt')
+
+
+def member_path(i, shape):
+    """Chemin du i-ème fichier : `d0001/d0012/f1234.ext` (large) ou `n0/n1/…/nK/f1234.ext` (profond)."""
+    if shape == 'wide':
+        group = i // WIDE_FANOUT
+        return f"d{group // WIDE_FANOUT:04d}/d{group % WIDE_FANOUT:04d}/f{i}"
+    depth = i % DEEP_MAX_DEPTH + 1
+    return '/'.join(f"n{level}" for level in range(depth)) + f"/f{i}"
+
+
+def text_content(rng, size, line_pool):
+    lines = []
+    length = 0
+    while length < size:
+        line = rng.choice(line_pool)
+        lines.append(line)
+        length += len(line)
+    return ''.join(lines).encode()
+
+
+def generate_archive(fp, files=100, shape='wide', content='text', file_size=2048, seed=42):
+    """
+    Écrit une archive synthétique dans `fp` (chemin ou fichier) ; retourne la liste des membres.
+
+    Les tailles varient autour de `file_size` (de la moitié au double). En contenu `mixed`, un fichier
+    sur cinq est binaire.
+    """
+    if shape not in SHAPES or content not in CONTENTS:
+        raise ValueError(f"Forme ({shape}) ou contenu ({content}) inconnu.")
+    rng = random.Random(seed)
+    line_pool = [
+        f"    valeur_{i} = traiter(entree_{i % 97}, seuil={rng.randint(0, 999)})  # étape {i}\n" for i in range(512)
+    ]
+    members = []
+    with zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for i in range(files):
+            size = rng.randint(file_size // 2, file_size * 2)
+            binary = content == 'binary' or (content == 'mixed' and i % 5 == 0)
+            if binary:
+                path = member_path(i, shape) + '.bin'
+                # Octets nuls en tête : le fichier est détecté comme binaire.
+                data = b'\x00\x01' + rng.randbytes(size)
+            else:
+                path = f"{member_path(i, shape)}.{TEXT_EXTENSIONS[i % len(TEXT_EXTENSIONS)]}"
+                data = text_content(rng, size, line_pool)
+            archive.writestr(path, data)
+            members.append({'path': path, 'size': len(data), 'binary': binary})
+    return members
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('output', help="Chemin de l'archive à écrire.")
+    parser.add_argument('--files', type=int, default=1000, help="Nombre de fichiers.")
+    parser.add_argument('--shape', choices=SHAPES, default='wide', help="Arborescence large ou profonde.")
+    parser.add_argument('--content', choices=CONTENTS, default='text', help="Contenu des fichiers.")
+    parser.add_argument('--file-size', type=int, default=2048, help="Taille moyenne d'un fichier (octets).")
+    parser.add_argument('--seed', type=int, default=42, help="Graine du générateur.")
+    args = parser.parse_args()
+
+    members = generate_archive(args.output, args.files, args.shape, args.content, args.file_size, args.seed)
+    print(f"{len(members)} fichiers, {sum(m['size'] for m in members)} octets décompressés → {args.output}")
+
+
+if __name__ == '__main__':
+    main()
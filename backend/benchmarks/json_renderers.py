@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Compare le rendu JSON standard de DRF et le rendu orjson (`api.renderers.ORJSONRenderer`).
+
+Trois charges représentatives de l'API sont mesurées (temps d'encodage et octets produits) :
+une liste de projets imbriqués, l'arborescence d'une archive de code source et le contenu d'un
+fichier. Usage, depuis `backend/` :
+
+    python benchmarks/json_renderers.py [--repeat 20] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils.translation import gettext_lazy  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList  # noqa: E402
+from api.renderers import ORJSONRenderer  # noqa: E402
+
+
+def words(rng, count):
+    return ' '.join(''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(count))
+
+
+def project_list(rng, projects=200):
+    """Liste de projets telle que renvoyée par `/api/projects/?expand=work_done`."""
+    return ReturnList([
+        ReturnDict({
+            'id': i,
+            'title': f"Projet {i} — {words(rng, 3)}",
+            'video': f"https://res.cloudinary.com/demo/video/upload/project_videos/{i}.mp4",
+            'summary': words(rng, 25)[:160],
+            'technologies': [
+                {'id': t, 'nom': gettext_lazy("Python") if t % 2 else f"Tech {t}"} for t in range(8)
+            ],
+            'work_done': [
+                {'id': i * 10 + w, 'subtitle': words(rng, 4), 'description': words(rng, 60)} for w in range(5)
+            ],
+            'budget': Decimal('1234.50'),
+        }, serializer=None)
+        for i in range(projects)
+    ], serializer=None)
+
+
+def source_tree(rng, directories=400, files_per_directory=25):
+    """Arborescence de manifeste (dossiers imbriqués, métadonnées par fichier) de ~10 000 fichiers."""
+    extensions = ['py', 'js', 'jsx', 'css', 'md', 'json']
+    root = []
+    nodes_by_path = {'': root}
+    for d in range(directories):
+        parent = rng.choice(list(nodes_by_path))
+        name = f"dir_{d}"
+        path = f"{parent}/{name}" if parent else name
+        children = []
+        nodes_by_path[parent].append({'name': name, 'path': path, 'type': 'directory', 'children': children})
+        nodes_by_path[path] = children
+        for f in range(files_per_directory):
+            ext = rng.choice(extensions)
+            children.append({
+                'name': f"file_{f}.{ext}", 'path': f"{path}/file_{f}.{ext}", 'type': 'file',
+                'size': rng.randint(100, 50000), 'lines': rng.randint(5, 1500), 'language': ext, 'binary': False,
+            })
+    return root
+
+
+def source_file(rng, lines=20000):
+    """Réponse de `source-code-file` pour un gros fichier (~1 Mo de code, accents compris)."""
+    content = '\n'.join(f"    résultat_{i} = calculer({words(rng, 4)!r})  # étape {i}" for i in range(lines))
+    return {'content': content}
+
+
+def measure(renderer, payload, repeat):
+    rendered = renderer.render(payload)
+    timer = timeit.Timer(lambda: renderer.render(payload))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return best, len(rendered), rendered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=20, help="Nombre de séries chronométrées (meilleure retenue).")
+    parser.add_argument('--json', action='store_true', help="Affiche les résultats au format JSON.")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    payloads = {
+        'projects': project_list(rng),
+        'tree': source_tree(rng),
+        'file': source_file(rng),
+    }
+    renderers = {'drf-json': JSONRenderer(), 'orjson': ORJSONRenderer()}
+
+    results = []
+    for name, payload in payloads.items():
+        outputs = {}
+        for renderer_name, renderer in renderers.items():
+            seconds, size, outputs[renderer_name] = measure(renderer, payload, args.repeat)
+            results.append({'payload': name, 'renderer': renderer_name, 'ms': seconds * 1000, 'bytes': size})
+        # Les deux rendus doivent décrire exactement les mêmes données.
+        assert json.loads(outputs['drf-json']) == json.loads(outputs['orjson']), name
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    baseline = {r['payload']: r['ms'] for r in results if r['renderer'] == 'drf-json'}
+    print(f"{'charge':<10} {'rendu':<10} {'ms':>10} {'octets':>12} {'gain':>8}")
+    for r in results:
+        print(f"{r['payload']:<10} {r['renderer']:<10} {r['ms']:>10.3f} {r['bytes']:>12} {baseline[r['payload']] / r['ms']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
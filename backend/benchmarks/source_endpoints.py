@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+"""
+Benchmarks de `source-code-tree` et `source-code-file` sur des archives synthétiques.
+
+Pour chaque scénario (forme d'archive générée par `archive_fixtures.py`), l'archive est ingérée
+puis chaque requête est mesurée à froid (caches du processus vidés), à chaud (médiane et p95 de
+requêtes répétées), en pic de mémoire Python (tracemalloc, requête à froid) et en taille de
+réponse. Les requêtes traversent toute la pile Django (middlewares compris), sur une base SQLite
+et un MEDIA_ROOT temporaires. Usage, depuis `backend/` :
+
+    python benchmarks/source_endpoints.py [--scenario wide-text-1k ...] [--full] [--output resultats.json]
+    python benchmarks/source_endpoints.py --compare avant.json apres.json [--threshold 0.2]
+
+Les résultats JSON (avec le commit courant) se comparent entre deux commits avec `--compare`, qui
+échoue (code 1) si une mesure se dégrade au-delà du seuil.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCHMARKS_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from archive_fixtures import generate_archive  # noqa: E402
+
+# Scénarios : (fichiers, forme, contenu, taille moyenne d'un fichier).
+SCENARIOS = {
+    'tiny-text-10': (10, 'wide', 'text', 4096),
+    'wide-text-1k': (1000, 'wide', 'text', 2048),
+    'deep-text-1k': (1000, 'deep', 'text', 2048),
+    'wide-binary-1k': (1000, 'wide', 'binary', 4096),
+    'wide-mixed-10k': (10000, 'wide', 'mixed', 1024),
+    'deep-text-10k': (10000, 'deep', 'text', 1024),
+}
+# Scénarios lourds, exécutés avec --full.
+FULL_SCENARIOS = {
+    'wide-text-100k': (100000, 'wide', 'text', 512),
+    'deep-mixed-100k': (100000, 'deep', 'mixed', 512),
+}
+# Mesures comparées par --compare (plus petit = meilleur).
+COMPARED_METRICS = ('cold_ms', 'warm_p50_ms', 'peak_kib', 'bytes')
+
+
+def setup_django(workdir):
+    os.environ.update({
+        'DJANGO_SETTINGS_MODULE': 'core.settings',
+        'SECRET_KEY': os.environ.get('SECRET_KEY', 'benchmark'),
+        'APP_HOSTNAME': 'testserver',
+        'DATABASE_URL': f'sqlite:///{workdir / "db.sqlite3"}',
+        'HIGHLIGHT_CACHE_LOCATION': str(workdir / 'highlight'),
+        'API_RESPONSE_CACHE_LOCATION': str(workdir / 'responses'),
+        'SOURCE_INGEST_EAGER': 'True',
+        'API_SNAPSHOT_ON_SAVE': 'False',
+    })
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.MEDIA_ROOT = str(workdir / 'media')
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+
+
+def clear_process_caches():
+    """État « à froid » : index d'archives, rendus colorés et réponses mis en cache sont oubliés."""
+    from django.core.cache import caches
+    from api.archive import clear_archive_index_cache
+
+    clear_archive_index_cache()
+    for alias in caches:
+        caches[alias].clear()
+    gc.collect()
+
+
+def fetch(client, url, params):
+    """Exécute une requête complète (contenu en flux compris) ; retourne (statut, octets)."""
+    response = client.get(url, params)
+    content = b''.join(response.streaming_content) if response.streaming else response.content
+    return response.status_code, len(content)
+
+
+def measure(client, url, params, repeat):
+    clear_process_caches()
+    start = time.perf_counter()
+    status, size = fetch(client, url, params)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    warm = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fetch(client, url, params)
+        warm.append((time.perf_counter() - start) * 1000)
+    warm.sort()
+
+    # Le pic de mémoire est mesuré sur une seconde requête à froid (tracemalloc ralentit l'exécution).
+    clear_process_caches()
+    tracemalloc.start()
+    fetch(client, url, params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'status': status,
+        'cold_ms': round(cold_ms, 3),
+        'warm_p50_ms': round(statistics.median(warm), 3),
+        'warm_p95_ms': round(warm[max(0, round(len(warm) * 0.95) - 1)], 3),
+        'peak_kib': round(peak / 1024, 1),
+        'bytes': size,
+    }
+
+
+def run_scenario(name, spec, workdir, repeat):
+    from django.core.files import File
+    from django.test import Client
+    from django.urls import reverse
+    from api.models import Project
+
+    files, shape, content, file_size = spec
+    archive_path = workdir / f'{name}.zip'
+    members = generate_archive(archive_path, files, shape, content, file_size)
+
+    start = time.perf_counter()
+    project = Project.objects.create(title=name, description="Benchmark.")
+    with open(archive_path, 'rb') as fp:
+        project.source_code_zip.save(f'{name}.zip', File(fp))
+    ingest_s = time.perf_counter() - start
+
+    text = [m for m in members if not m['binary']]
+    binary = [m for m in members if m['binary']]
+    largest_text = max(text, key=lambda m: m['size'])['path'] if text else None
+    tree_url = reverse('project-source-code-tree', args=[project.pk])
+    file_url = reverse('project-source-code-file', args=[project.pk])
+    requests = [
+        ('source-code-tree', 'full', tree_url, {}),
+        ('source-code-tree', 'depth=1', tree_url, {'depth': 1}),
+    ]
+    if largest_text:
+        requests += [
+            ('source-code-file', 'json', file_url, {'path': largest_text}),
+            ('source-code-file', 'raw', file_url, {'path': largest_text, 'raw': 1}),
+            ('source-code-file', 'highlight', file_url, {'path': largest_text, 'highlight': 1}),
+        ]
+    if binary:
+        requests.append(('source-code-file', 'raw-binary', file_url, {'path': binary[-1]['path'], 'raw': 1}))
+
+    client = Client()
+    results = []
+    for endpoint, variant, url, params in requests:
+        result = measure(client, url, params, repeat)
+        results.append({
+            'scenario': name, 'files': files, 'shape': shape, 'content': content,
+            'archive_bytes': archive_path.stat().st_size, 'ingest_s': round(ingest_s, 3),
+            'endpoint': endpoint, 'variant': variant, **result,
+        })
+    archive_path.unlink()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_key(result):
+    return result['scenario'], result['endpoint'], result['variant']
+
+
+def compare(before_path, after_path, threshold):
+    """Affiche l'évolution de chaque mesure ; retourne le nombre de régressions au-delà du seuil."""
+    before = {result_key(r): r for r in json.loads(Path(before_path).read_text())['results']}
+    after = json.loads(Path(after_path).read_text())['results']
+    regressions = 0
+    print(f"{'scénario':<18} {'action':<17} {'variante':<11} {'mesure':<12} {'avant':>10} {'après':>10} {'écart':>8}")
+    for result in after:
+        previous = before.get(result_key(result))
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = previous[metric], result[metric]
+            change = (new - old) / old if old else 0.0
+            flag = ''
+            if change > threshold:
+                regressions += 1
+                flag = '  ← régression'
+            print(
+                f"{result['scenario']:<18} {result['endpoint']:<17} {result['variant']:<11} {metric:<12} "
+                f"{old:>10} {new:>10} {change:>+7.0%}{flag}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--scenario', action='append', choices=[*SCENARIOS, *FULL_SCENARIOS],
+        help="Scénario à exécuter (répétable ; par défaut tous sauf ceux de --full).",
+    )
+    parser.add_argument('--full', action='store_true', help="Ajoute les scénarios à 100 000 fichiers.")
+    parser.add_argument('--repeat', type=int, default=20, help="Requêtes à chaud mesurées par action.")
+    parser.add_argument('--output', help="Fichier JSON des résultats (par défaut : sortie standard).")
+    parser.add_argument('--compare', nargs=2, metavar=('AVANT', 'APRES'), help="Compare deux fichiers de résultats.")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Dégradation relative tolérée par --compare.")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    scenarios = {**SCENARIOS, **FULL_SCENARIOS}
+    names = args.scenario or [*SCENARIOS, *(FULL_SCENARIOS if args.full else ())]
+
+    with tempfile.TemporaryDirectory(prefix='source-bench-') as tmp:
+        workdir = Path(tmp)
+        setup_django(workdir)
+        results = []
+        for name in names:
+            print(f"… {name}", file=sys.stderr)
+            results.extend(run_scenario(name, scenarios[name], workdir, args.repeat))
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+Mesure la latence de `/api/projects/` pendant que des requêtes lourdes de code source sont en cours.
+
+L'application ASGI (`core.asgi`) est appelée en processus, sans serveur HTTP : des « clients lourds »
+téléchargent en boucle un gros fichier brut d'une archive (`source-code-file?raw=1`) pendant qu'un
+client léger interroge la liste des projets. Chaque mode s'exécute dans un processus séparé, sur une
+base SQLite et un MEDIA_ROOT temporaires :
+
+- `sync` : actions synchrones (toutes les vues synchrones partagent un thread sous ASGI) ;
+- `async` : actions asynchrones de `api.async_views` (pool dédié et borné).
+
+Usage, depuis `backend/` :
+
+    python benchmarks/source_load.py [--heavy 8] [--requests 50] [--archive-mb 16] [--json]
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+HOST = 'benchmark.local'
+
+
+def make_archive(size_mb, rng):
+    """Archive d'un gros fichier texte (décompressé à chaque requête brute) et de quelques petits fichiers."""
+    buffer = io.BytesIO()
+    line_pool = [f"valeur_{i} = calculer({rng.random()!r})  # ligne générée\n".encode() for i in range(4096)]
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with archive.open('data/gros_fichier.py', 'w') as member:
+            written = 0
+            while written < size_mb * 1024 * 1024:
+                chunk = b''.join(rng.choices(line_pool, k=1024))
+                member.write(chunk)
+                written += len(chunk)
+        for i in range(50):
+            archive.writestr(f'src/module_{i}.py', f"def f_{i}():\n    return {i}\n")
+    return buffer.getvalue()
+
+
+async def call(application, path, query=''):
+    """Exécute une requête GET complète contre l'application ASGI ; retourne (statut, octets reçus)."""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', HOST.encode()), (b'accept', b'application/json')],
+        'client': ('127.0.0.1', 50000), 'server': (HOST, 80),
+    }
+    received = {'status': None, 'bytes': 0}
+    requested, done = asyncio.Event(), asyncio.Event()
+
+    async def receive():
+        if not requested.is_set():
+            requested.set()
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Le client reste connecté jusqu'à la fin de la réponse.
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            received['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            received['bytes'] += len(message.get('body', b''))
+            if not message.get('more_body'):
+                done.set()
+
+    await application(scope, receive, send)
+    return received['status'], received['bytes']
+
+
+async def measure_light(application, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        status, _ = await call(application, '/api/projects/')
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert status == 200, status
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def heavy_client(application, project_id, stop):
+    completed = 0
+    while not stop.is_set():
+        status, size = await call(
+            application, f'/api/projects/{project_id}/source-code-file/', 'path=data/gros_fichier.py&raw=1',
+        )
+        assert status == 200 and size > 0, status
+        completed += 1
+    return completed
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+    return {
+        'p50_ms': statistics.median(ordered),
+        'p95_ms': ordered[max(0, round(len(ordered) * 0.95) - 1)],
+        'max_ms': ordered[-1],
+    }
+
+
+def run_mode(args):
+    """Processus enfant : prépare la base et l'archive, puis mesure la latence sans et avec charge."""
+    workdir = Path(tempfile.mkdtemp(prefix='source-load-'))
+    os.environ.update({
+        'DJANGO_SETTINGS_MODULE': 'core.settings',
+        'SECRET_KEY': os.environ.get('SECRET_KEY', 'benchmark'),
+        'APP_HOSTNAME': HOST,
+        'DATABASE_URL': f'sqlite:///{workdir / "db.sqlite3"}',
+        'HIGHLIGHT_CACHE_LOCATION': str(workdir / 'highlight'),
+        'API_RESPONSE_CACHE_LOCATION': str(workdir / 'responses'),
+        'SOURCE_INGEST_EAGER': 'True',
+        'SOURCE_ASYNC_VIEWS': 'True' if args.mode == 'async' else 'False',
+    })
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.MEDIA_ROOT = str(workdir / 'media')
+
+    from django.core.files.base import ContentFile
+    from django.core.management import call_command
+    from api.models import Project
+    from core.asgi import application
+
+    call_command('migrate', verbosity=0)
+    project = Project.objects.create(title="Charge", description="Archive volumineuse.")
+    project.source_code_zip.save('charge.zip', ContentFile(make_archive(args.archive_mb, random.Random(42))))
+
+    async def scenario():
+        # Préchauffage : manifeste, index de l'archive et cache des réponses.
+        await call(application, f'/api/projects/{project.pk}/source-code-file/', 'path=src/module_0.py')
+        idle = await measure_light(application, args.requests)
+        stop = asyncio.Event()
+        heavy = [asyncio.create_task(heavy_client(application, project.pk, stop)) for _ in range(args.heavy)]
+        await asyncio.sleep(0.2)
+        loaded = await measure_light(application, args.requests)
+        stop.set()
+        completed = sum(await asyncio.gather(*heavy))
+        return idle, loaded, completed
+
+    try:
+        idle, loaded, completed = asyncio.run(scenario())
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps({
+        'mode': args.mode, 'heavy_clients': args.heavy, 'heavy_requests_completed': completed,
+        'idle': summarize(idle), 'loaded': summarize(loaded),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--heavy', type=int, default=8, help="Nombre de clients lourds simultanés.")
+    parser.add_argument('--requests', type=int, default=50, help="Requêtes légères mesurées par phase.")
+    parser.add_argument('--archive-mb', type=int, default=16, help="Taille décompressée du gros fichier (Mo).")
+    parser.add_argument('--mode', choices=['sync', 'async'], help=argparse.SUPPRESS)
+    parser.add_argument('--json', action='store_true', help="Affiche les résultats au format JSON.")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args)
+        return
+
+    results = []
+    for mode in ('sync', 'async'):
+        command = [
+            sys.executable, __file__, '--mode', mode, '--heavy', str(args.heavy),
+            '--requests', str(args.requests), '--archive-mb', str(args.archive_mb),
+        ]
+        output = subprocess.run(command, check=True, capture_output=True, text=True, cwd=BACKEND_DIR).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'mode':<6} {'phase':<7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}   requêtes lourdes")
+    for r in results:
+        for phase in ('idle', 'loaded'):
+            stats = r[phase]
+            extra = r['heavy_requests_completed'] if phase == 'loaded' else ''
+            print(f"{r['mode']:<6} {phase:<7} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['max_ms']:>9.1f}   {extra}")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+# Les actions de code source ont une version asynchrone qui ne bloque pas le thread des vues synchrones.
+os.environ.setdefault("SOURCE_ASYNC_VIEWS", "True")
 
 application = get_asgi_application()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
@@ -37,7 +38,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'api.middleware.SnapshotWhiteNoiseMiddleware',
+    # Après WhiteNoise : seules les requêtes traitées par Django sont mesurées.
+    'api.middleware.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -73,6 +76,10 @@ DATABASES = {
         conn_max_age=600
     )
 }
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # Plusieurs processus écrivent (worker d'ingestion) : une transaction réserve l'écriture dès son début et
+    # attend le verrou, au lieu d'échouer (« database is locked ») en passant de la lecture à l'écriture.
+    DATABASES['default'].setdefault('OPTIONS', {}).update({'transaction_mode': 'IMMEDIATE', 'timeout': 20})
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",},
@@ -105,4 +112,123 @@ CLOUDINARY_STORAGE = {
     'CLOUDINARY_URL': os.environ.get('CLOUDINARY_URL'),
 }
 MEDIA_URL = '/media/'
-DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
\ No newline at end of file
+# Répertoire des fichiers envoyés quand ils sont stockés localement (jamais le répertoire courant).
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', str(BASE_DIR / 'media'))
+# Sert MEDIA_ROOT depuis Django (développement, ou déploiement sans Cloudinary).
+SERVE_MEDIA = os.getenv('SERVE_MEDIA', str(DEBUG)) == 'True'
+# Largeurs (px) des variantes AVIF/WebP générées à l'envoi d'un logo ou de la photo de présentation
+# (affichés en ~48 px et 100 px ; les largeurs doubles et triples servent les écrans haute densité).
+IMAGE_VARIANT_WIDTHS = {
+    'logo': (48, 96, 192),
+    'photo': (100, 200, 400),
+}
+DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+
+# Code source des projets (archives ZIP)
+# Nombre d'index d'archives (répertoire central) conservés en mémoire par processus.
+SOURCE_ARCHIVE_INDEX_CACHE_SIZE = int(os.environ.get('SOURCE_ARCHIVE_INDEX_CACHE_SIZE', 32))
+# Répertoire des copies locales d'archives (stockage distant) ; par défaut MEDIA_ROOT/zip_cache.
+SOURCE_CACHE_ROOT = os.environ.get('SOURCE_CACHE_ROOT')
+# Quota (en octets) du cache d'archives, au-delà duquel les moins récemment utilisées sont évincées.
+SOURCE_CACHE_MAX_BYTES = int(os.environ.get('SOURCE_CACHE_MAX_BYTES', 1024 ** 3))
+# Limites de l'action `source-code-files` (lot de fichiers et bundle complet).
+SOURCE_BATCH_MAX_FILES = int(os.environ.get('SOURCE_BATCH_MAX_FILES', 200))
+SOURCE_BUNDLE_MAX_FILE_SIZE = int(os.environ.get('SOURCE_BUNDLE_MAX_FILE_SIZE', 256 * 1024))
+SOURCE_BUNDLE_MAX_BYTES = int(os.environ.get('SOURCE_BUNDLE_MAX_BYTES', 8 * 1024 * 1024))
+# Recherche dans le code source : fichiers indexés (taille maximale) et nombre maximal de résultats.
+SOURCE_SEARCH_MAX_FILE_SIZE = int(os.environ.get('SOURCE_SEARCH_MAX_FILE_SIZE', 1024 * 1024))
+SOURCE_SEARCH_MAX_RESULTS = int(os.environ.get('SOURCE_SEARCH_MAX_RESULTS', 200))
+# Travail maximal d'une recherche (octets des fichiers candidats vérifiés, durée en secondes) ;
+# au-delà, les résultats déjà trouvés sont renvoyés comme tronqués.
+SOURCE_SEARCH_MAX_SCAN_BYTES = int(os.environ.get('SOURCE_SEARCH_MAX_SCAN_BYTES', 16 * 1024 * 1024))
+SOURCE_SEARCH_TIMEOUT = float(os.environ.get('SOURCE_SEARCH_TIMEOUT', 2.0))
+# Versions asynchrones des actions `source-code-tree` et `source-code-file` (activées par core/asgi.py) :
+# lectures d'archives dans un pool de SOURCE_IO_MAX_WORKERS threads, au plus SOURCE_IO_MAX_PER_ARCHIVE par archive.
+SOURCE_ASYNC_VIEWS = os.getenv('SOURCE_ASYNC_VIEWS', 'False') == 'True'
+SOURCE_IO_MAX_WORKERS = int(os.environ.get('SOURCE_IO_MAX_WORKERS', 4))
+SOURCE_IO_MAX_PER_ARCHIVE = int(os.environ.get('SOURCE_IO_MAX_PER_ARCHIVE', 2))
+# File d'ingestion des archives (empreinte, manifeste, copie locale, index de recherche), traitée par
+# `python manage.py ingest_worker` avec un pool de SOURCE_INGEST_PROCESSES processus. Un travail « en cours »
+# depuis plus de SOURCE_INGEST_JOB_TIMEOUT secondes est repris. SOURCE_INGEST_EAGER=True exécute les
+# travaux dès l'enregistrement du projet, sans worker (développement).
+SOURCE_INGEST_PROCESSES = int(os.environ.get('SOURCE_INGEST_PROCESSES', 2))
+SOURCE_INGEST_JOB_TIMEOUT = int(os.environ.get('SOURCE_INGEST_JOB_TIMEOUT', 3600))
+SOURCE_INGEST_EAGER = os.getenv('SOURCE_INGEST_EAGER', 'False') == 'True'
+
+# Cache
+# `default` reste en mémoire locale ; les rendus colorés des fichiers source sont partagés entre
+# workers via le système de fichiers (le backend évince les entrées au-delà de MAX_ENTRIES).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'source_highlight': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('HIGHLIGHT_CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'portfolio_highlight_cache')),
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('HIGHLIGHT_CACHE_MAX_ENTRIES', 5000))},
+    },
+    # Réponses des ViewSets en lecture seule, réponse `bootstrap` et versions du contenu. Le cache doit
+    # être partagé par tous les workers et par les commandes (`api_cache`, `import_content`) pour que
+    # les invalidations les atteignent : système de fichiers par défaut, ou tout backend partagé
+    # (API_RESPONSE_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache, …).
+    'api_responses': {
+        'BACKEND': os.environ.get('API_RESPONSE_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('API_RESPONSE_CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'portfolio_api_responses')),
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('API_RESPONSE_CACHE_MAX_ENTRIES', 5000))},
+    },
+}
+SOURCE_HIGHLIGHT_CACHE = 'source_highlight'
+# Taille maximale (en octets) d'un fichier coloré côté serveur.
+SOURCE_HIGHLIGHT_MAX_FILE_SIZE = int(os.environ.get('SOURCE_HIGHLIGHT_MAX_FILE_SIZE', 1024 * 1024))
+API_RESPONSE_CACHE = 'api_responses'
+# Durée de vie (s) d'une réponse en cache ; les modifications l'invalident immédiatement (signaux).
+API_RESPONSE_CACHE_TIMEOUT = int(os.environ.get('API_RESPONSE_CACHE_TIMEOUT', 24 * 3600))
+
+# Mesures de performance (api.middleware.PerformanceMiddleware)
+# En-tête Server-Timing sur chaque réponse (détaille le temps serveur : à réserver au développement par défaut).
+PERF_SERVER_TIMING = os.getenv('PERF_SERVER_TIMING', str(DEBUG)) == 'True'
+# Seuil (ms) au-delà duquel une requête est journalisée comme lente.
+PERF_SLOW_REQUEST_MS = int(os.environ.get('PERF_SLOW_REQUEST_MS', 500))
+# Bornes (s) des histogrammes de latence exposés sur /api/_metrics (par processus).
+PERF_HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Jeton d'accès à /api/_metrics (en-tête `Authorization: Bearer <jeton>`) ; sans jeton, réservé aux
+# utilisateurs staff connectés.
+API_METRICS_TOKEN = os.environ.get('API_METRICS_TOKEN')
+
+# API
+# Durée de vie (s) du cache serveur de `/api/bootstrap/` (invalidé à chaque modification du contenu)
+# et durée pendant laquelle navigateurs et CDN peuvent réutiliser la réponse.
+API_BOOTSTRAP_CACHE_TIMEOUT = int(os.environ.get('API_BOOTSTRAP_CACHE_TIMEOUT', 3600))
+API_BOOTSTRAP_MAX_AGE = int(os.environ.get('API_BOOTSTRAP_MAX_AGE', 60))
+
+# Le JSON est encodé et décodé par orjson (repli automatique sur le module json s'il est absent).
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Pagination par curseur des listes (`?cursor=` / `?page_size=`) : taille de page par défaut,
+    # plafonnée par API_MAX_PAGE_SIZE.
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.IdCursorPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 50)),
+}
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 100))
+# Compatibilité : sans paramètre de pagination, les listes restent renvoyées en entier (tableau JSON),
+# comme l'attend le frontend actuel. À False, toute liste est paginée.
+API_PAGINATION_COMPAT = os.getenv('API_PAGINATION_COMPAT', 'True') == 'True'
+
+# Export statique de l'API (`manage.py export_api_snapshot`) : fichiers JSON précompressés servis
+# par WhiteNoise sous API_SNAPSHOT_URL (ex. /api-snapshot/projects.json), sans passer par Django.
+API_SNAPSHOT_ROOT = os.environ.get('API_SNAPSHOT_ROOT', BASE_DIR / 'api_snapshot')
+API_SNAPSHOT_URL = os.environ.get('API_SNAPSHOT_URL', '/api-snapshot/')
+# Hôte utilisé pour les URL absolues des médias dans l'export.
+API_SNAPSHOT_BASE_URL = os.environ.get(
+    'API_SNAPSHOT_BASE_URL', f'https://{APP_HOSTNAME}' if APP_HOSTNAME else 'http://localhost',
+)
+# Régénère l'export après chaque modification du contenu (à la validation de la transaction).
+API_SNAPSHOT_ON_SAVE = os.getenv('API_SNAPSHOT_ON_SAVE', 'False') == 'True'
@@ -1,6 +1,6 @@
 // frontend/src/components/CodeBrowser.jsx
 
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { Box, List, ListItem, ListItemIcon, ListItemText, Collapse, Typography, CircularProgress, Alert, IconButton } from '@mui/material';
 import { Prism as SyntaxHighlighter } from 'react-syntax-highlighter';
 import { vscDarkPlus } from 'react-syntax-highlighter/dist/esm/styles/prism';
@@ -22,18 +22,28 @@ const getFileExtension = (filename) => {
   return filename.slice(((filename.lastIndexOf(".") - 1) >>> 0) + 2);
 };
 
+// Au-delà de ce nombre de lignes, la coloration est faite (et mise en cache) par le serveur.
+const SERVER_HIGHLIGHT_MIN_LINES = 2000;
+// Taille maximale colorée par le serveur (SOURCE_HIGHLIGHT_MAX_FILE_SIZE) : au-delà, contenu brut.
+const SERVER_HIGHLIGHT_MAX_SIZE = 1024 * 1024;
+
 /**
  * Composant récursif pour afficher un élément de l'arborescence (fichier ou dossier).
- * @param {{ item: object, onFileSelect: function, level: number }} props
+ * Le contenu d'un dossier est chargé à sa première ouverture s'il n'a pas été fourni avec l'arbre.
+ * @param {{ item: object, onFileSelect: function, loadChildren: function, level: number }} props
  */
-function FileTreeItem({ item, onFileSelect, level = 0 }) {
+function FileTreeItem({ item, onFileSelect, loadChildren, level = 0 }) {
   const [open, setOpen] = useState(false);
+  const [children, setChildren] = useState(item.children);
 
-  const handleClick = () => {
+  const handleClick = async () => {
     if (item.type === 'directory') {
+      if (!open && children === undefined) {
+        setChildren(await loadChildren(item.path));
+      }
       setOpen(!open);
     } else {
-      onFileSelect(item.path);
+      onFileSelect(item.path, item);
     }
   };
 
@@ -49,8 +59,8 @@ function FileTreeItem({ item, onFileSelect, level = 0 }) {
       {item.type === 'directory' && (
         <Collapse in={open} timeout="auto" unmountOnExit>
           <List component="div" disablePadding>
-            {item.children.map(child => (
-              <FileTreeItem key={child.path} item={child} onFileSelect={onFileSelect} level={level + 1} />
+            {(children || []).map(child => (
+              <FileTreeItem key={child.path} item={child} onFileSelect={onFileSelect} loadChildren={loadChildren} level={level + 1} />
             ))}
           </List>
         </Collapse>
@@ -68,9 +78,13 @@ function CodeBrowser({ projectId }) {
   const [tree, setTree] = useState([]);
   const [selectedFile, setSelectedFile] = useState(null);
   const [fileContent, setFileContent] = useState('');
+  // Rendu HTML coloré par le serveur ({ html, css }) pour les fichiers volumineux.
+  const [highlighted, setHighlighted] = useState(null);
   const [loadingTree, setLoadingTree] = useState(true);
   const [loadingFile, setLoadingFile] = useState(false);
   const [error, setError] = useState(null);
+  // Contenus préchargés (bundle des petits fichiers texte), indexés par chemin.
+  const prefetched = useRef({});
 
   // Effet pour charger l'arborescence des fichiers du projet.
   useEffect(() => {
@@ -78,7 +92,8 @@ function CodeBrowser({ projectId }) {
       if (!projectId) return;
       setLoadingTree(true);
       try {
-        const response = await apiClient.get(`/projects/${projectId}/source-code-tree/`);
+        // Seul le premier niveau est chargé ; les dossiers sont développés à la demande.
+        const response = await apiClient.get(`/projects/${projectId}/source-code-tree/`, { params: { depth: 1 } });
         setTree(response.data);
         setError(null);
       } catch (err) {
@@ -90,13 +105,57 @@ function CodeBrowser({ projectId }) {
     fetchTree();
   }, [projectId]);
 
+  // Effet pour précharger en une seule requête compressée les petits fichiers texte du projet.
+  useEffect(() => {
+    prefetched.current = {};
+    if (!projectId) return;
+    apiClient.get(`/projects/${projectId}/source-code-files/`, { params: { bundle: 1 } })
+      .then((response) => { prefetched.current = response.data.files; })
+      .catch(() => { /* Le chargement fichier par fichier reste disponible. */ });
+  }, [projectId]);
+
+  // Fonction pour charger le contenu d'un dossier lors de sa première ouverture.
+  const loadChildren = useCallback(async (path) => {
+    try {
+      const response = await apiClient.get(`/projects/${projectId}/source-code-tree/`, { params: { path, depth: 1 } });
+      return response.data;
+    } catch (err) {
+      setError(`Impossible de charger le dossier : ${path}`);
+      return [];
+    }
+  }, [projectId]);
+
   // Fonction pour charger le contenu d'un fichier sélectionné.
-  const handleFileSelect = useCallback(async (path) => {
-    setLoadingFile(true);
+  const handleFileSelect = useCallback(async (path, item = {}) => {
     setSelectedFile(path);
+    setHighlighted(null);
+    if (item.lines > SERVER_HIGHLIGHT_MIN_LINES && (item.size ?? 0) <= SERVER_HIGHLIGHT_MAX_SIZE) {
+      setLoadingFile(true);
+      try {
+        const response = await apiClient.get(`/projects/${projectId}/source-code-file/`, {
+          params: { path, highlight: 1, style: 'monokai' },
+        });
+        setHighlighted(response.data);
+        setError(null);
+        setLoadingFile(false);
+        return;
+      } catch (err) {
+        // Coloration refusée par le serveur (fichier trop gros…) : le contenu brut est affiché à la place.
+      }
+    }
+    if (path in prefetched.current) {
+      setFileContent(prefetched.current[path]);
+      setError(null);
+      return;
+    }
+    setLoadingFile(true);
     try {
-      const response = await apiClient.get(`/projects/${projectId}/source-code-file/?path=${path}`);
-      setFileContent(response.data.content);
+      // Mode brut : octets diffusés tels quels, revalidés par ETag (304) lors des consultations suivantes.
+      const response = await apiClient.get(`/projects/${projectId}/source-code-file/`, {
+        params: { path, raw: 1 },
+        responseType: 'text',
+      });
+      setFileContent(response.data);
       setError(null);
     } catch (err) {
       setError(`Impossible de charger le contenu du fichier : ${path}`);
@@ -110,6 +169,7 @@ function CodeBrowser({ projectId }) {
   const handleCloseFile = () => {
     setSelectedFile(null);
     setFileContent('');
+    setHighlighted(null);
   };
 
   if (loadingTree) return <Box sx={{ display: 'flex', justifyContent: 'center', p: 2 }}><CircularProgress size={24} /></Box>;
@@ -120,7 +180,7 @@ function CodeBrowser({ projectId }) {
       {/* Panneau de l'arborescence des fichiers */}
       <Box sx={{ width: '40%', borderRight: '1px solid rgba(0,0,0,0.12)', overflowY: 'auto' }}>
         <List dense>
-          {tree.map(item => <FileTreeItem key={item.path} item={item} onFileSelect={handleFileSelect} />)}
+          {tree.map(item => <FileTreeItem key={item.path} item={item} onFileSelect={handleFileSelect} loadChildren={loadChildren} />)}
         </List>
       </Box>
 
@@ -137,15 +197,23 @@ function CodeBrowser({ projectId }) {
                 <Typography variant="caption" sx={{ fontFamily: 'monospace' }}>{selectedFile}</Typography>
                 <IconButton size="small" onClick={handleCloseFile} sx={{ color: 'white' }}><CloseIcon fontSize="small" /></IconButton>
               </Box>
-              <SyntaxHighlighter
-                language={getFileExtension(selectedFile)}
-                style={vscDarkPlus}
-                showLineNumbers
-                customStyle={{ margin: 0, height: 'calc(100% - 36px)', width: '100%' }}
-                codeTagProps={{ style: { fontFamily: '"Fira Code", monospace' } }}
-              >
-                {fileContent}
-              </SyntaxHighlighter>
+              {highlighted ? (
+                <Box sx={{ height: 'calc(100% - 36px)', overflow: 'auto', '& pre': { margin: 0, fontFamily: '"Fira Code", monospace' } }}>
+                  <style>{highlighted.css}</style>
+                  {/* HTML produit par Pygments : le code source y est échappé. */}
+                  <div dangerouslySetInnerHTML={{ __html: highlighted.html }} />
+                </Box>
+              ) : (
+                <SyntaxHighlighter
+                  language={getFileExtension(selectedFile)}
+                  style={vscDarkPlus}
+                  showLineNumbers
+                  customStyle={{ margin: 0, height: 'calc(100% - 36px)', width: '100%' }}
+                  codeTagProps={{ style: { fontFamily: '"Fira Code", monospace' } }}
+                >
+                  {fileContent}
+                </SyntaxHighlighter>
+              )}
             </>
           )
         ) : (
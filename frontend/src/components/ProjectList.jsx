@@ -87,7 +87,7 @@ function ProjectCard({ project, onSelectProject }) {
             {project.title}
           </Typography>
           <Typography variant="body2" color="text.secondary" sx={{ mb: 2, minHeight: '60px' }}>
-            {project.description.substring(0, 100)}...
+            {project.summary.substring(0, 100)}...
           </Typography>
           <Box sx={{ display: 'flex', flexWrap: 'wrap', gap: 0.5 }}>
             {project.technologies.slice(0, 3).map(tech => (
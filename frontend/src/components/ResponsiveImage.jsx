@@ -0,0 +1,19 @@
+// frontend/src/components/ResponsiveImage.jsx
+
+import { Box } from '@mui/material';
+
+/**
+ * Image servie dans la variante la plus légère que le navigateur sait afficher.
+ * `srcset` est la correspondance renvoyée par l'API (`logo_srcset`, `photo_srcset`) :
+ * { avif: "url 48w, url 96w", webp: "..." }. Sans variantes (SVG), l'original est utilisé.
+ * @param {{ src: string, srcset?: object, sizes: string, alt: string, sx?: object }} props
+ */
+const ResponsiveImage = ({ src, srcset = {}, sizes, alt, sx, ...props }) => (
+  <Box component="picture" sx={{ display: 'contents' }}>
+    {srcset.avif && <source type="image/avif" srcSet={srcset.avif} sizes={sizes} />}
+    {srcset.webp && <source type="image/webp" srcSet={srcset.webp} sizes={sizes} />}
+    <Box component="img" src={src} alt={alt} loading="lazy" sx={sx} {...props} />
+  </Box>
+);
+
+export default ResponsiveImage;
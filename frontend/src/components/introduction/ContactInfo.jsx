@@ -5,7 +5,7 @@ import { Box, Typography, Avatar, Link, Grid, List, ListItem, ListItemText } fro
 /**
  * Affiche les informations de contact (photo, nom, email) et les postes ciblés.
  * @param {{
- * presentation: { photo: string, prenom: string, nom: string, email: string },
+ * presentation: { photo: string, photo_srcset: object, prenom: string, nom: string, email: string },
  * postes: Array<{id: number, nom: string}>
  * }} props
  */
@@ -19,6 +19,9 @@ const ContactInfo = ({ presentation, postes }) => (
         {presentation?.photo && (
           <Avatar
             src={presentation.photo}
+            // Avatar n'accepte qu'un srcset : WebP, pris en charge par tous les navigateurs actuels.
+            srcSet={presentation.photo_srcset?.webp}
+            sizes="100px"
             alt={`${presentation?.prenom} ${presentation?.nom}`}
             variant="rounded"
             sx={{ width: 100, height: 100, mr: 2.5 }}
@@ -2,12 +2,13 @@
 
 import { Box, Typography, List, ListItem, ListItemText, Tooltip } from '@mui/material';
 import { motion } from 'framer-motion';
+import ResponsiveImage from '../ResponsiveImage';
 
 /**
  * Affiche la liste des diplômes et une grille des logos de compétences.
  * @param {{
  * diplomes: Array<{id: number, titre: string, institution: string}>,
- * competences: Array<{id: number, nom: string, logo: string}>
+ * competences: Array<{id: number, nom: string, logo: string, logo_srcset: object}>
  * }} props
  */
 const SkillsDisplay = ({ diplomes, competences }) => (
@@ -32,11 +33,11 @@ const SkillsDisplay = ({ diplomes, competences }) => (
       {competences.map((competence) => (
         <Tooltip title={competence.nom} key={competence.id} arrow>
           <motion.div whileHover={{ scale: 1.15, rotate: 5, transition: { type: 'spring', stiffness: 400 } }}>
-            <Box
-              component="img"
+            <ResponsiveImage
               src={competence.logo}
+              srcset={competence.logo_srcset}
+              sizes="5vh"
               alt={competence.nom}
-              loading="lazy"
               sx={{
                 height: '5vh',
                 width: '5vh',
@@ -7,6 +7,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 import ArrowBackIcon from '@mui/icons-material/ArrowBack';
 import CloseIcon from '@mui/icons-material/Close';
 import CodeBrowser from '../components/CodeBrowser';
+import ResponsiveImage from '../components/ResponsiveImage';
 import { apiClient } from '../store/appStore'; // Assumant que apiClient est exporté depuis le store
 
 // --- Variantes d'animation Framer Motion ---
@@ -115,7 +116,7 @@ function ProjectPage() {
                   {project.technologies.map(tech => (
                     <Tooltip title={tech.nom} key={tech.id} arrow>
                       <motion.div whileHover={{ y: -4, transition: { type: 'spring', stiffness: 300 } }}>
-                        <img src={tech.logo} alt={tech.nom} style={{ height: '75px', width: '75px', objectFit: 'contain' }} loading="lazy" />
+                        <ResponsiveImage src={tech.logo} srcset={tech.logo_srcset} sizes="75px" alt={tech.nom} sx={{ height: '75px', width: '75px', objectFit: 'contain' }} />
                       </motion.div>
                     </Tooltip>
                   ))}
@@ -26,36 +26,20 @@ export const useAppStore = create((set) => ({
 
   /**
    * Action pour récupérer toutes les données initiales de l'application.
-   * Les requêtes sont lancées en parallèle pour optimiser le temps de chargement.
+   * Une seule requête agrégée (`/bootstrap/`) remplace les six appels individuels.
    */
   fetchAllData: async () => {
     set({ loading: true, error: null });
     try {
-      // Lance toutes les requêtes en parallèle pour un chargement plus rapide.
-      const [
-        projectsRes,
-        parcoursRes,
-        presentationRes,
-        postesRes,
-        diplomesRes,
-        competencesRes,
-      ] = await Promise.all([
-        apiClient.get('/projects/'),
-        apiClient.get('/parcours/'),
-        apiClient.get('/presentations/'),
-        apiClient.get('/postes/'),
-        apiClient.get('/diplomes/'),
-        apiClient.get('/competences/'),
-      ]);
+      const { data } = await apiClient.get('/bootstrap/');
 
       set({
-        projects: projectsRes.data,
-        parcoursData: parcoursRes.data,
-        // L'API retourne un tableau, mais on n'utilise que le premier objet de présentation.
-        presentation: presentationRes.data[0] || null,
-        postes: postesRes.data,
-        diplomes: diplomesRes.data,
-        competences: competencesRes.data,
+        projects: data.projects,
+        parcoursData: data.parcours,
+        presentation: data.presentation,
+        postes: data.postes,
+        diplomes: data.diplomes,
+        competences: data.competences,
         loading: false,
       });
     } catch (error) {